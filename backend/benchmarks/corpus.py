@@ -0,0 +1,100 @@
+"""Synthetic resume PDFs for benchmarks, so nobody has to commit real resumes"""
+import os
+import random
+
+import fitz
+
+SKILLS = [
+    "Python", "JavaScript", "TypeScript", "React", "Node.js", "Django", "Flask", "FastAPI",
+    "SQL", "PostgreSQL", "MongoDB", "Redis", "Docker", "Kubernetes", "AWS", "GCP", "Azure",
+    "Terraform", "Git", "CI/CD", "Pandas", "NumPy", "scikit-learn", "TensorFlow", "PyTorch",
+    "Spark", "Airflow", "Kafka", "GraphQL", "REST APIs", "Linux", "Java", "Spring Boot",
+    "Go", "Rust", "C++", "Tableau", "Power BI", "Figma", "Agile", "Scrum", "Jira"
+]
+
+VERBS = [
+    "Designed", "Built", "Led", "Migrated", "Optimized", "Automated", "Maintained",
+    "Launched", "Refactored", "Scaled", "Mentored", "Shipped"
+]
+
+OBJECTS = [
+    "a customer-facing analytics dashboard", "the payments service", "an internal ETL pipeline",
+    "a recommendation engine", "the mobile onboarding flow", "a real-time alerting system",
+    "the data warehouse", "a multi-tenant REST API", "the search indexing service"
+]
+
+
+def _bullet(rng: random.Random) -> str:
+    skills = ", ".join(rng.sample(SKILLS, 3))
+    return f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {skills}, improving throughput by {rng.randint(5, 80)}%."
+
+
+def _resume_text(rng: random.Random, bullets: int) -> str:
+    lines = [
+        f"Candidate {rng.randint(1000, 9999)}",
+        "Email: candidate@example.com | Phone: +1 555 0100 | github.com/candidate",
+        "",
+        "SUMMARY",
+        "Engineer with experience delivering production systems across web, data and cloud.",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, 12)),
+        "",
+        "EXPERIENCE"
+    ]
+    lines += [_bullet(rng) for _ in range(bullets)]
+    return "\n".join(lines)
+
+
+def _add_text_page(doc, text: str):
+    page = doc.new_page()
+    rect = fitz.Rect(48, 48, page.rect.width - 48, page.rect.height - 48)
+    # insert_textbox writes nothing when the text overflows, so shrink the font until it fits
+    for fontsize in (9, 7, 5.5, 4.5):
+        if page.insert_textbox(rect, text, fontsize=fontsize) >= 0:
+            break
+
+
+def _add_scanned_page(doc, rng: random.Random):
+    page = doc.new_page()
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 850, 1100), False)
+    pix.clear_with(rng.randint(200, 255))
+    page.insert_image(page.rect, pixmap=pix)
+
+
+def make_resume_pdf(rng: random.Random, kind: str) -> bytes:
+    """Build one resume PDF of the given kind: short, dense, long or scanned"""
+    doc = fitz.open()
+    if kind == "short":
+        _add_text_page(doc, _resume_text(rng, 6))
+    elif kind == "dense":
+        for _ in range(2):
+            _add_text_page(doc, _resume_text(rng, 60))
+    elif kind == "long":
+        for _ in range(6):
+            _add_text_page(doc, _resume_text(rng, 45))
+    elif kind == "scanned":
+        _add_scanned_page(doc, rng)
+        _add_text_page(doc, _resume_text(rng, 30))
+        _add_text_page(doc, _resume_text(rng, 30))
+    else:
+        raise ValueError(f"Unknown resume kind: {kind}")
+    data = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    return data
+
+
+def build_corpus(directory: str, count: int = 40, seed: int = 7) -> list:
+    """Write ``count`` synthetic resumes into ``directory`` and return their paths"""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    kinds = ["short", "dense", "long", "scanned"]
+    paths = []
+    for i in range(count):
+        kind = kinds[i % len(kinds)]
+        path = os.path.join(directory, f"resume_{i:03d}_{kind}.pdf")
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(make_resume_pdf(rng, kind))
+        paths.append(path)
+    return paths
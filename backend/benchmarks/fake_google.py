@@ -0,0 +1,182 @@
+"""Local stand-in for the Google APIs the backend calls, with injectable latency and failures.
+
+Run from backend/:  python -m benchmarks.fake_google [--port 8790] [--gemini-latency-ms 800] [--error-rate 0.01]
+                    [--burst-every 60 --burst-length 5]
+
+Point the backend at it with GEMINI_API_BASE=http://127.0.0.1:8790/v1beta and
+GOOGLE_API_BASE=http://127.0.0.1:8790. Gemini answers follow the request: JSON built
+from the responseSchema when one is sent, otherwise text in the prompts' formats.
+During a 429 burst every call gets Google's RESOURCE_EXHAUSTED body with a retryDelay.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from benchmarks.corpus import OBJECTS, SKILLS, VERBS
+from benchmarks.text_normalization import job_matching_answer, project_ideas_answer, skill_gap_answer
+
+
+class FaultInjector:
+    """Latency with jitter, random 503s and periodic windows where every call gets a 429"""
+
+    def __init__(self, latency_ms: float, jitter: float, error_rate: float, burst_every: float, burst_length: float):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.started = time.monotonic()
+        self.calls = 0
+        self.throttled = 0
+        self.failed = 0
+
+    def delay(self) -> float:
+        return max(0.0, random.gauss(self.latency, self.latency * self.jitter))
+
+    def in_burst(self) -> bool:
+        if self.burst_every <= 0:
+            return False
+        return (time.monotonic() - self.started) % self.burst_every >= self.burst_every - self.burst_length
+
+    async def fault(self) -> Optional[JSONResponse]:
+        """Wait out the call's latency, then return an error response or None to answer normally"""
+        self.calls += 1
+        if self.in_burst():
+            self.throttled += 1
+            await asyncio.sleep(self.delay() / 10)
+            return JSONResponse(status_code=429, content={"error": {
+                "code": 429, "status": "RESOURCE_EXHAUSTED", "message": "Quota exceeded (fake)",
+                "details": [{"@type": "type.googleapis.com/google.rpc.RetryInfo",
+                             "retryDelay": f"{int(self.burst_length)}s"}]
+            }})
+        await asyncio.sleep(self.delay())
+        if random.random() < self.error_rate:
+            self.failed += 1
+            return JSONResponse(status_code=503, content={"error": {
+                "code": 503, "status": "UNAVAILABLE", "message": "The model is overloaded (fake)"
+            }})
+        return None
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "throttled": self.throttled, "failed": self.failed}
+
+
+def fill_schema(schema: dict, rng: random.Random):
+    """A value matching a Gemini responseSchema (OBJECT/ARRAY/STRING/enum subset)"""
+    kind = schema.get("type")
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if kind == "OBJECT":
+        return {name: fill_schema(prop, rng) for name, prop in schema.get("properties", {}).items()}
+    if kind == "ARRAY":
+        return [fill_schema(schema.get("items", {}), rng) for _ in range(rng.randint(4, 6))]
+    if kind in ("INTEGER", "NUMBER"):
+        return rng.randint(1, 10)
+    if kind == "BOOLEAN":
+        return rng.random() < 0.5
+    return f"{rng.choice(SKILLS)}: {rng.choice(VERBS).lower()} {rng.choice(OBJECTS)}"
+
+
+def text_answer(prompt: str, rng: random.Random) -> str:
+    lowered = prompt.lower()
+    if "project" in lowered:
+        return project_ideas_answer(rng)
+    if "identify missing skills" in lowered:
+        return skill_gap_answer(rng)
+    return job_matching_answer(rng)
+
+
+def gemini_body(text: str) -> dict:
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP"}]}
+
+
+def create_app(gemini: FaultInjector, search: FaultInjector) -> FastAPI:
+    app = FastAPI(title="Fake Google APIs")
+    rng = random.Random()
+
+    @app.post("/v1beta/models/{model_call}")
+    async def generate(model_call: str, request: Request):
+        error = await gemini.fault()
+        if error is not None:
+            return error
+        body = await request.json()
+        prompt = "".join(part.get("text", "") for part in body["contents"][0]["parts"])
+        schema = body.get("generationConfig", {}).get("responseSchema")
+        text = json.dumps(fill_schema(schema, rng)) if schema else text_answer(prompt, rng)
+        if not model_call.endswith(":streamGenerateContent"):
+            return gemini_body(text)
+
+        async def events():
+            # Gemini streams a few hundred characters per event
+            for start in range(0, len(text), 200):
+                yield f"data: {json.dumps(gemini_body(text[start:start + 200]))}\r\n\r\n"
+                await asyncio.sleep(0.02)
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/customsearch/v1")
+    async def custom_search(q: str, num: int = 3):
+        error = await search.fault()
+        if error is not None:
+            return error
+        platforms = ["coursera.org", "udemy.com", "edx.org", "freecodecamp.org", "example.com"]
+        return {"items": [{
+            "title": f"{q.title()} - Part {i + 1}",
+            "link": f"https://www.{rng.choice(platforms)}/learn/{i}",
+            "snippet": f"Learn {q} with hands-on projects."
+        } for i in range(num)]}
+
+    @app.get("/youtube/v3/search")
+    async def youtube_search(q: str, maxResults: int = 12):
+        error = await search.fault()
+        if error is not None:
+            return error
+        return {"items": [{
+            "id": {"kind": "youtube#video", "videoId": f"vid{rng.randrange(10 ** 8):08d}"},
+            "snippet": {
+                "title": f"{q.title()} tutorial #{i + 1}",
+                "description": f"A walkthrough of {q}.",
+                "channelTitle": "Fake Channel",
+                "publishedAt": "2024-01-01T00:00:00Z",
+                "thumbnails": {"high": {"url": "https://i.ytimg.com/vi/fake/hqdefault.jpg"}}
+            }
+        } for i in range(maxResults)]}
+
+    @app.get("/stats")
+    def stats():
+        return {"gemini": gemini.stats(), "search": search.stats()}
+
+    return app
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--gemini-latency-ms", type=float, default=800)
+    parser.add_argument("--search-latency-ms", type=float, default=150)
+    parser.add_argument("--jitter", type=float, default=0.25, help="latency standard deviation as a share of the mean")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls answered with a 503")
+    parser.add_argument("--burst-every", type=float, default=0, help="seconds between 429 bursts; 0 disables them")
+    parser.add_argument("--burst-length", type=float, default=5, help="seconds each 429 burst lasts")
+
+
+def app_from_args(args) -> FastAPI:
+    common = dict(jitter=args.jitter, error_rate=args.error_rate,
+                  burst_every=args.burst_every, burst_length=args.burst_length)
+    return create_app(FaultInjector(args.gemini_latency_ms, **common), FaultInjector(args.search_latency_ms, **common))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8790)
+    add_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(app_from_args(args), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Cold-start cost: time to import the app, the slowest imports, and time until /health and /ready answer.
+
+Run from backend/:  python -m benchmarks.import_time [--runs 5] [--budget-ms 500] [--serve]
+                    [--compare benchmarks/results/import-OLD.json]
+
+Each run imports ``main`` in fresh interpreters, timed plainly and broken down with
+``python -X importtime``, and the medians are reported. The run fails (exit 1) if the import takes longer than
+``--budget-ms`` or pulls in a module from ``--deferred`` that should only load on
+first use or during warm-up. With ``--serve`` it also starts uvicorn and times the
+first 200 from /health and from /ready; upstream APIs point at a closed local port,
+so the connection warm-up fails fast instead of reaching Google.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.load_test import BACKEND_DIR, RESULTS_DIR, git_revision
+
+IMPORT_SCRIPT = "import time; start = time.perf_counter(); import main; print(time.perf_counter() - start)"
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """module -> (self us, cumulative us) from ``-X importtime`` output; nesting depth is kept as leading spaces"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.rstrip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure_import(env: dict) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """Wall milliseconds to import main, then the per-module breakdown from a second interpreter.
+
+    The wall time comes from a run without ``-X importtime``, whose own bookkeeping slows imports down.
+    """
+    def run(*flags) -> subprocess.CompletedProcess:
+        return subprocess.run([sys.executable, *flags, "-c", IMPORT_SCRIPT], cwd=BACKEND_DIR,
+                              env=env, capture_output=True, text=True, check=True)
+    wall = float(run().stdout.strip().splitlines()[-1]) * 1000
+    return wall, parse_importtime(run("-X", "importtime").stderr)
+
+
+def time_until_ok(url: str, started: float, process: subprocess.Popen, timeout: float = 60) -> float:
+    """Milliseconds from ``started`` until ``url`` first answers 200"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return (time.perf_counter() - started) * 1000
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"{url} did not answer 200 within {timeout:.0f}s")
+
+
+def measure_serve(env: dict, port: int) -> Tuple[float, float]:
+    """(ms to the first /health 200, ms to the first /ready 200) from process start"""
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+                                "--log-level", "warning"], cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        health = time_until_ok(f"http://127.0.0.1:{port}/health", started, process)
+        ready = time_until_ok(f"http://127.0.0.1:{port}/ready", started, process)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return health, ready
+
+
+def app_env() -> dict:
+    env = dict(os.environ)
+    env.update({
+        "GEMINI_API_KEY": "fake", "GOOGLE_API_KEY": "fake", "YOUTUBE_API_KEY": "fake", "SEARCH_ENGINE_ID": "fake",
+        # Nothing listens on the discard port, so warm-up connections are refused at once
+        "GEMINI_API_BASE": "http://127.0.0.1:9/v1beta",
+        "GOOGLE_API_BASE": "http://127.0.0.1:9",
+        "SEMANTIC_CACHE_PATH": "",
+        "JOB_QUEUE_BACKEND": "memory"
+    })
+    return env
+
+
+def median_ms(values: List[float]) -> float:
+    return round(statistics.median(values), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest imports listed")
+    parser.add_argument("--budget-ms", type=float, default=500,
+                        help="median import time allowed for main; machine dependent, so set it for yours")
+    parser.add_argument("--deferred", nargs="*", default=["fitz", "pymupdf", "numpy", "httpx"],
+                        help="modules importing main must not load")
+    parser.add_argument("--serve", action="store_true", help="also time /health and /ready after a cold start")
+    parser.add_argument("--port", type=int, default=8792)
+    parser.add_argument("--output", help="results file (default benchmarks/results/import-<commit>-<time>.json)")
+    parser.add_argument("--compare", help="earlier results file to print deltas against")
+    args = parser.parse_args()
+
+    env = app_env()
+    walls, runs = [], []
+    for _ in range(args.runs):
+        wall, modules = measure_import(env)
+        walls.append(wall)
+        runs.append(modules)
+
+    # Only what the script and main import directly (importtime indents two spaces per level),
+    # so a package and its submodules are not counted twice
+    names = [name for name in runs[0] if not name.startswith("     ")]
+    cumulative = {name.strip(): median_ms([run[name][1] / 1000 for run in runs if name in run]) for name in names}
+    slowest = sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:args.top]
+    eager = sorted({name.strip() for name in runs[0]} & set(args.deferred))
+
+    results = {
+        **git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "import_main_ms": median_ms(walls),
+        "slowest_imports_ms": dict(slowest),
+        "eager_deferred_modules": eager
+    }
+    if args.serve:
+        serves = [measure_serve(env, args.port) for _ in range(args.runs)]
+        results["first_health_ms"] = median_ms([health for health, _ in serves])
+        results["first_ready_ms"] = median_ms([ready for _, ready in serves])
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+
+    def show(label: str, key: str):
+        if key not in results:
+            return
+        old = previous.get(key)
+        delta = f"  ({results[key] - old:+.1f} ms vs {previous['commit']})" if old else ""
+        print(f"{label:<28}{results[key]:>9.1f} ms{delta}")
+
+    print(f"median of {args.runs} runs, python {results['python']}\n")
+    show("import main", "import_main_ms")
+    show("first /health 200", "first_health_ms")
+    show("first /ready 200", "first_ready_ms")
+    print(f"\n{'slowest imports (cumulative)':<40}{'ms':>9}")
+    for name, ms in slowest:
+        print(f"{name:<40}{ms:>9.1f}")
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"import-{results['commit']}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nresults written to {output}")
+
+    failures = []
+    if results["import_main_ms"] > args.budget_ms:
+        failures.append(f"import main took {results['import_main_ms']} ms, budget is {args.budget_ms:.0f} ms")
+    if eager:
+        failures.append(f"imported at startup instead of on first use: {', '.join(eager)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
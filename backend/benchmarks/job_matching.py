@@ -0,0 +1,74 @@
+"""Local job-matching latency on the shipped role catalog and on synthetic catalogs of thousands of roles.
+
+Run from backend/:  python -m benchmarks.job_matching [--roles N] [--candidates N] [--repeat N]
+
+Synthetic roles are built from the real ones: each copies a real role's requirements,
+drops a few and borrows some from another role, so skill frequencies stay realistic.
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from config.settings import ROLE_DATASET_PATH
+from utils.job_matcher import RoleMatcher
+from utils.skill_gap_engine import get_role_index, RoleIndex
+from utils.skill_extractor import get_extractor
+
+
+def synthetic_catalog(dataset: dict, count: int, rng: random.Random) -> dict:
+    roles = []
+    for i in range(count):
+        base, donor = rng.sample(dataset["roles"], 2)
+        skills = rng.sample(base["skills"], max(1, len(base["skills"]) - rng.randint(0, 4)))
+        skills += rng.sample(donor["skills"], min(len(donor["skills"]), rng.randint(0, 4)))
+        roles.append({"title": f"{base['title']} {i}", "skills": skills})
+    return {"implies": dataset.get("implies", {}), "roles": roles}
+
+
+def candidates(index: RoleIndex, count: int, rng: random.Random) -> list:
+    return [rng.sample(index.skills, rng.randint(5, 25)) for _ in range(count)]
+
+
+def timed(fn, repeat: int) -> list:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def report(label: str, matcher: RoleMatcher, people: list, repeat: int):
+    single = timed(lambda: matcher.top_matches(people[0], "Data Engineer"), repeat)
+    batch = timed(lambda: matcher.rank(people, "Data Engineer"), max(1, repeat // 10))
+    print(f"{label:<28}{len(matcher.index.roles):>7}{len(matcher.entry_skills):>9}"
+          f"{statistics.median(single):>12.2f}{statistics.median(batch):>14.2f}{statistics.median(batch) / len(people):>13.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--roles", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--candidates", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with open(ROLE_DATASET_PATH, encoding="utf-8") as f:
+        dataset = json.load(f)
+    index = get_role_index()
+    known = set(get_extractor().categories)
+    people = candidates(index, args.candidates, rng)
+
+    print(f"{'catalog':<28}{'roles':>7}{'entries':>9}{'top-5 ms':>12}{'batch ms':>14}{'per cand ms':>13}")
+    report("shipped", RoleMatcher(index), people, args.repeat)
+    for count in args.roles:
+        start = time.perf_counter()
+        matcher = RoleMatcher(RoleIndex.build(synthetic_catalog(dataset, count, rng), known))
+        build_ms = (time.perf_counter() - start) * 1000
+        report(f"synthetic (built {build_ms:.0f}ms)", matcher, people, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""Load test of the analysis routes against a local fake of the Google APIs.
+
+Run from backend/:  python -m benchmarks.load_test [--scenarios analyze_full job_matching ...]
+                    [--concurrency 16] [--duration 30] [--workers 1] [--compare results/OLD.json]
+
+Starts benchmarks.fake_google and the app (uvicorn, ``--workers`` processes) with
+quotas, rate limiting and the semantic cache off, then drives each scenario with
+``--concurrency`` clients for ``--duration`` seconds. Pass ``--target URL`` to load an
+app you started yourself instead; RSS/CPU are then only sampled with ``--pid``.
+
+Reports requests/s, p50/p95/p99 latency and errors per scenario, plus CPU and peak
+RSS of every app process. Results are written to benchmarks/results/<commit>-<time>.json
+so runs can be compared across commits with ``--compare``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.corpus import SKILLS, _resume_text, build_corpus
+from benchmarks.fake_google import add_arguments as add_fake_arguments
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+JOB_TITLES = [
+    "Data Scientist", "Backend Engineer", "Frontend Developer", "DevOps Engineer",
+    "Machine Learning Engineer", "Product Analyst", "Cloud Architect", "Mobile Developer"
+]
+
+
+class Workload:
+    """Request inputs shared by the scenarios, varied per call so caches see distinct keys"""
+
+    def __init__(self, pdfs: List[bytes], seed: int = 7):
+        self.pdfs = pdfs
+        self.rng = random.Random(seed)
+
+    def job_title(self) -> str:
+        return f"{self.rng.choice(JOB_TITLES)} {self.rng.randint(1, 10 ** 6)}"
+
+    def upload(self) -> dict:
+        return {
+            "files": {"file": ("resume.pdf", self.rng.choice(self.pdfs), "application/pdf")},
+            "data": {"job_title": self.job_title()}
+        }
+
+    def skills(self) -> List[str]:
+        return self.rng.sample(SKILLS, self.rng.randint(3, 8))
+
+
+# Scenario name -> coroutine making one request; each route in routes/analysis.py has one
+async def health(client: httpx.AsyncClient, work: Workload) -> httpx.Response:
+    return await client.get("/health")
+
+
+async def analyze_resume(client: httpx.AsyncClient, work: Workload) -> httpx.Response:
+    return await client.post("/analyze_resume/", **work.upload())
+
+
+async def analyze_full(client: httpx.AsyncClient, work: Workload) -> httpx.Response:
+    return await client.post("/analyze/full", **work.upload())
+
+
+async def fetch_courses(client: httpx.AsyncClient, work: Workload) -> httpx.Response:
+    return await client.get(f"/fetch_courses/{work.job_title()}")
+
+
+async def youtube_courses(client: httpx.AsyncClient, work: Workload) -> httpx.Response:
+    return await client.get(f"/youtube-courses/{work.job_title()}")
+
+
+async def job_matching(client: httpx.AsyncClient, work: Workload) -> httpx.Response:
+    return await client.post("/job_matching/", json={
+        "skills": work.skills(),
+        "job_title": work.job_title(),
+        "extracted_text": _resume_text(work.rng, 12)
+    })
+
+
+async def project_generator(client: httpx.AsyncClient, work: Workload) -> httpx.Response:
+    return await client.post("/project_generator/", json={"skills": work.skills()})
+
+
+SCENARIOS = {
+    "health": health,
+    "analyze_resume": analyze_resume,
+    "analyze_full": analyze_full,
+    "fetch_courses": fetch_courses,
+    "youtube_courses": youtube_courses,
+    "job_matching": job_matching,
+    "project_generator": project_generator
+}
+
+
+def percentile(values: List[float], share: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+async def run_scenario(base_url: str, name: str, work: Workload, concurrency: int, duration: float,
+                       timeout: float) -> dict:
+    """``concurrency`` clients calling one scenario back to back until ``duration`` runs out"""
+    call = SCENARIOS[name]
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(client: httpx.AsyncClient):
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await call(client, work)
+                status = str(response.status_code)
+                # Some routes report failures in a 200 body; count those as errors too
+                if response.status_code == 200 and "json" in response.headers.get("content-type", ""):
+                    body = response.json()
+                    if isinstance(body, dict) and (body.get("error") or body.get("error_code")):
+                        status = "200-error"
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ok = statuses.get("200", 0)
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 2),
+        "ok_rps": round(ok / elapsed, 2),
+        "error_rate": round(1 - ok / len(latencies), 4) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 1) if latencies else 0.0,
+        "statuses": statuses
+    }
+
+
+def process_tree(root: int) -> List[int]:
+    """``root`` and all its descendants, from /proc"""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    pids, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+def read_process(pid: int) -> Optional[tuple]:
+    """(command, CPU seconds, RSS bytes) of one process, or None if it has exited"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            command = f.read().replace(b"\0", b" ").decode(errors="replace").strip()
+    except OSError:
+        return None
+    cpu = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS  # utime + stime
+    return command, cpu, int(fields[21]) * PAGE_SIZE
+
+
+class ResourceSampler:
+    """Polls CPU time and RSS of a process tree while a scenario runs"""
+
+    def __init__(self, root: Optional[int], interval: float = 0.25):
+        self.root = root
+        self.interval = interval
+        self.processes: Dict[int, dict] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def sample(self):
+        for pid in process_tree(self.root):
+            info = read_process(pid)
+            if info is None:
+                continue
+            command, cpu, rss = info
+            entry = self.processes.setdefault(pid, {"command": command[:80], "cpu_start": cpu, "peak_rss": 0})
+            entry["cpu_end"] = cpu
+            entry["peak_rss"] = max(entry["peak_rss"], rss)
+
+    async def _run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.root is not None:
+            self.processes = {}
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, elapsed: float) -> List[dict]:
+        if self._task is None:
+            return []
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self.sample()
+        return [{
+            "pid": pid,
+            "command": entry["command"],
+            "cpu_percent": round((entry["cpu_end"] - entry["cpu_start"]) / elapsed * 100, 1),
+            "peak_rss_mb": round(entry["peak_rss"] / 2 ** 20, 1)
+        } for pid, entry in sorted(self.processes.items())]
+
+
+def backend_env(fake_url: str, warm_caches: bool) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "GEMINI_API_KEY": "fake", "GOOGLE_API_KEY": "fake", "YOUTUBE_API_KEY": "fake", "SEARCH_ENGINE_ID": "fake",
+        "GEMINI_API_BASE": f"{fake_url}/v1beta",
+        "GOOGLE_API_BASE": fake_url,
+        # Measure the app, not its protections against the real quotas
+        "GEMINI_DAILY_QUOTA": "0", "GEMINI_MINUTE_QUOTA": "0",
+        "CUSTOM_SEARCH_DAILY_QUOTA": "0", "CUSTOM_SEARCH_MINUTE_QUOTA": "0",
+        "YOUTUBE_DAILY_QUOTA": "0", "YOUTUBE_MINUTE_QUOTA": "0",
+        "RATE_LIMIT_ENABLED": "false",
+        "SEMANTIC_CACHE_ENABLED": "false",
+        "JOB_QUEUE_BACKEND": "memory"
+    })
+    if not warm_caches:
+        env.update({"RESUME_CACHE_SIZE": "0", "SEARCH_CACHE_SIZE": "0"})
+    return env
+
+
+def wait_until_up(url: str, process: subprocess.Popen, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{' '.join(process.args)} exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+def start_process(args: List[str], env: Optional[dict] = None) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, *args], cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def stop_process(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def git_revision() -> dict:
+    def git(*args) -> str:
+        return subprocess.run(["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True).stdout.strip()
+    return {"commit": git("rev-parse", "--short", "HEAD") or "unknown",
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def print_results(results: dict, previous: Optional[dict]):
+    print(f"\n{'scenario':<20}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}")
+    for name, stats in results["scenarios"].items():
+        print(f"{name:<20}{stats['rps']:>9.1f}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+              f"{stats['p99_ms']:>10.1f}{stats['error_rate']:>9.1%}")
+        old = (previous or {}).get("scenarios", {}).get(name)
+        if old:
+            def delta(key: str) -> str:
+                return f"{(stats[key] / old[key] - 1) * 100:+.0f}%" if old[key] else "n/a"
+            print(f"{'  vs ' + previous['commit']:<20}{delta('rps'):>9}{delta('p50_ms'):>10}"
+                  f"{delta('p95_ms'):>10}{delta('p99_ms'):>10}")
+        for process in stats.get("processes", []):
+            print(f"    pid {process['pid']:<8}cpu {process['cpu_percent']:>6.1f}%  "
+                  f"peak rss {process['peak_rss_mb']:>7.1f} MB  {process['command']}")
+
+
+async def run_all(args, base_url: str, root_pid: Optional[int], work: Workload) -> Dict[str, dict]:
+    results = {}
+    sampler = ResourceSampler(root_pid)
+    for name in args.scenarios:
+        # A short warm-up so connection setup and first-call imports are not measured
+        await run_scenario(base_url, name, work, min(args.concurrency, 2), args.warmup, args.timeout)
+        sampler.start()
+        started = time.perf_counter()
+        stats = await run_scenario(base_url, name, work, args.concurrency, args.duration, args.timeout)
+        stats["processes"] = await sampler.stop(time.perf_counter() - started)
+        results[name] = stats
+        print(f"{name}: {stats['requests']} requests, {stats['rps']} rps, p95 {stats['p95_ms']} ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2, help="seconds of warm-up before each scenario")
+    parser.add_argument("--timeout", type=float, default=60, help="per-request timeout in seconds")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes for the app")
+    parser.add_argument("--warm-caches", action="store_true", help="keep the resume and search caches on")
+    parser.add_argument("--corpus", default=os.path.join(tempfile.gettempdir(), "skillup-resume-corpus"))
+    parser.add_argument("--count", type=int, default=40, help="resumes in the corpus")
+    parser.add_argument("--app-port", type=int, default=8791)
+    parser.add_argument("--fake-port", type=int, default=8790)
+    parser.add_argument("--target", help="URL of an already running app; nothing is started")
+    parser.add_argument("--pid", type=int, help="with --target, the app's master pid to sample")
+    parser.add_argument("--output", help="results file (default benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", help="earlier results file to print deltas against")
+    add_fake_arguments(parser)
+    args = parser.parse_args()
+
+    pdfs = []
+    for path in build_corpus(args.corpus, args.count):
+        with open(path, "rb") as f:
+            pdfs.append(f.read())
+    work = Workload(pdfs)
+
+    processes = []
+    try:
+        if args.target:
+            base_url, root_pid = args.target.rstrip("/"), args.pid
+        else:
+            fake_url = f"http://127.0.0.1:{args.fake_port}"
+            fake_args = [f"--port={args.fake_port}", f"--gemini-latency-ms={args.gemini_latency_ms}",
+                         f"--search-latency-ms={args.search_latency_ms}", f"--jitter={args.jitter}",
+                         f"--error-rate={args.error_rate}", f"--burst-every={args.burst_every}",
+                         f"--burst-length={args.burst_length}"]
+            processes.append(start_process(["-m", "benchmarks.fake_google", *fake_args]))
+            wait_until_up(f"{fake_url}/stats", processes[-1])
+
+            base_url = f"http://127.0.0.1:{args.app_port}"
+            processes.append(start_process(
+                ["-m", "uvicorn", "main:app", "--port", str(args.app_port), "--workers", str(args.workers),
+                 "--log-level", "warning"],
+                backend_env(fake_url, args.warm_caches)))
+            wait_until_up(f"{base_url}/health", processes[-1])
+            root_pid = processes[-1].pid
+
+        scenarios = asyncio.run(run_all(args, base_url, root_pid, work))
+        fake_stats = None
+        if not args.target:
+            fake_stats = httpx.get(f"http://127.0.0.1:{args.fake_port}/stats").json()
+    finally:
+        for process in reversed(processes):
+            stop_process(process)
+
+    results = {
+        **git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "cpu_count": os.cpu_count(),
+        "scenarios": scenarios,
+        "fake_google": fake_stats
+    }
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    print_results(results, previous)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{results['commit']}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nresults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""CPU cost of resume text extraction: the original extractor vs the incremental one.
+
+Run from backend/:  python -m benchmarks.pdf_extraction [--corpus DIR] [--count N] [--rounds R]
+"""
+import argparse
+import os
+import re
+import statistics
+import tempfile
+import time
+
+import fitz
+
+from benchmarks.corpus import build_corpus
+from utils.helpers import extract_pdf_text
+
+
+def legacy_extract(file_content) -> str:
+    """The extractor as it was before incremental extraction, kept for comparison"""
+    with fitz.open(stream=file_content, filetype="pdf") as pdf:
+        text_parts = []
+        for page_num, page in enumerate(pdf):
+            if page_num >= 3:
+                break
+            page_text = page.get_text("text")
+            if page_text.strip():
+                text_parts.append(page_text)
+        full_text = "\n".join(text_parts)
+        full_text = re.sub(r'\n+', '\n', full_text)
+        full_text = re.sub(r'\s+', ' ', full_text)
+        return full_text[:4000]
+
+
+def measure(extract, documents: list, rounds: int) -> list:
+    """Per-resume CPU milliseconds, best of ``rounds``"""
+    results = []
+    for data in documents:
+        best = float("inf")
+        for _ in range(rounds):
+            start = time.process_time()
+            extract(data)
+            best = min(best, time.process_time() - start)
+        results.append(best * 1000)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=os.path.join(tempfile.gettempdir(), "skillup-resume-corpus"))
+    parser.add_argument("--count", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    paths = build_corpus(args.corpus, args.count)
+    documents = []
+    for path in paths:
+        with open(path, "rb") as f:
+            documents.append(f.read())
+
+    mismatches = sum(1 for data in documents if legacy_extract(data).strip() != extract_pdf_text(data))
+    legacy = measure(legacy_extract, documents, args.rounds)
+    current = measure(extract_pdf_text, documents, args.rounds)
+
+    print(f"{len(documents)} resumes from {args.corpus}, best of {args.rounds} rounds")
+    print(f"{'extractor':<12}{'mean ms':>10}{'median ms':>12}{'p95 ms':>10}{'total ms':>11}")
+    for name, samples in (("legacy", legacy), ("incremental", current)):
+        p95 = sorted(samples)[int(len(samples) * 0.95) - 1]
+        print(f"{name:<12}{statistics.mean(samples):>10.2f}{statistics.median(samples):>12.2f}{p95:>10.2f}{sum(samples):>11.1f}")
+    print(f"CPU saved per resume: {100 * (1 - sum(current) / sum(legacy)):.1f}%")
+    print(f"Outputs differing from legacy (after strip): {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Prompt size with full resume text vs locally extracted skills, and the extractor's CPU cost.
+
+Run from backend/:  python -m benchmarks.prompt_size [--corpus DIR] [--count N] [--job-title TITLE]
+
+Token counts are estimated at 4 chars per token; Gemini latency needs the live API and is not measured here.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.corpus import build_corpus
+from config.settings import PROMPT_EXCERPT_CHARS
+from prompts.prompts import (
+    RESUME_ANALYSIS_PROMPT,
+    RESUME_ANALYSIS_COMPACT_PROMPT,
+    JOB_MATCHING_PROMPT,
+    JOB_MATCHING_COMPACT_PROMPT
+)
+from utils.helpers import extract_pdf_file, text_excerpt
+from utils.skill_extractor import get_extractor
+
+
+def prompts_for(text: str, skills: list, job_title: str) -> dict:
+    compact = {"resume_skills": ", ".join(skills), "resume_excerpt": text_excerpt(text, PROMPT_EXCERPT_CHARS)}
+    # Job matching sends a skill list of its own; a typical client passes the skill gap's output
+    requested = ", ".join(skills[:8])
+    return {
+        "skill_gap": (
+            RESUME_ANALYSIS_PROMPT.format(job_title=job_title, extracted_text=text),
+            RESUME_ANALYSIS_COMPACT_PROMPT.format(job_title=job_title, **compact)
+        ),
+        "job_matching": (
+            JOB_MATCHING_PROMPT.format(job_title=job_title, extracted_text=text, skills_str=requested),
+            JOB_MATCHING_COMPACT_PROMPT.format(job_title=job_title, skills_str=requested, **compact)
+        )
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=os.path.join(tempfile.gettempdir(), "skillup-resume-corpus"))
+    parser.add_argument("--count", type=int, default=40)
+    parser.add_argument("--job-title", default="Backend Developer")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    extractor = get_extractor()
+    load_ms = (time.perf_counter() - start) * 1000
+
+    texts = [extract_pdf_file(path) for path in build_corpus(args.corpus, args.count)]
+    texts = [text for text in texts if text.strip()]
+
+    extract_ms = []
+    sizes = {"skill_gap": ([], []), "job_matching": ([], [])}
+    skill_counts = []
+    for text in texts:
+        start = time.perf_counter()
+        skills = extractor.extract(text)
+        extract_ms.append((time.perf_counter() - start) * 1000)
+        skill_counts.append(len(skills))
+        for kind, (full, compact) in prompts_for(text, skills, args.job_title).items():
+            sizes[kind][0].append(len(full))
+            sizes[kind][1].append(len(compact))
+
+    print(f"{len(texts)} resumes from {args.corpus}")
+    print(f"Taxonomy: {len(extractor.categories)} skills, {extractor.terms} terms, loaded in {load_ms:.1f}ms")
+    print(f"Extraction: mean {statistics.mean(extract_ms):.3f}ms, max {max(extract_ms):.3f}ms, "
+          f"{statistics.mean(skill_counts):.1f} skills per resume")
+    print(f"{'prompt':<14}{'full chars':>12}{'compact chars':>15}{'full tok':>10}{'compact tok':>13}{'saved':>8}")
+    for kind, (full, compact) in sizes.items():
+        full_mean, compact_mean = statistics.mean(full), statistics.mean(compact)
+        print(f"{kind:<14}{full_mean:>12.0f}{compact_mean:>15.0f}{full_mean / 4:>10.0f}{compact_mean / 4:>13.0f}"
+              f"{100 * (1 - compact_mean / full_mean):>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Gemini answer and resume text normalization: utils.text_normalizer vs the regex chains it replaced.
+
+Run from backend/:  python -m benchmarks.text_normalization [--samples N] [--repeat N]
+
+Answers are synthetic but follow the prompts' output formats, including the markdown
+Gemini adds on its own (bold labels, '*' bullets). Streams are cut at random points
+into chunks the size Gemini's SSE stream sends; every output is checked against the
+old functions before anything is timed.
+"""
+import argparse
+import random
+import re
+import statistics
+import time
+
+from benchmarks.corpus import OBJECTS, SKILLS, VERBS, _resume_text
+from utils.text_normalizer import StreamNormalizer, collapse_whitespace, normalize_response
+
+
+def legacy_clean(text):
+    """clean_gemini_response as it was"""
+    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
+    text = re.sub(r'\*([^*]+)\*', r'\1', text)
+    text = re.sub(r'\n+', '\n', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def legacy_stream(chunks):
+    """The old IncrementalCleaner: re-clean the whole buffer on every chunk"""
+    raw, emitted, deltas = [], "", []
+    for chunk in chunks:
+        raw.append(chunk)
+        cleaned = legacy_clean("".join(raw)).split("*", 1)[0].rstrip()
+        if cleaned.startswith(emitted):
+            deltas.append(cleaned[len(emitted):])
+            emitted = cleaned
+    cleaned = legacy_clean("".join(raw))
+    if cleaned.startswith(emitted):
+        deltas.append(cleaned[len(emitted):])
+    return deltas
+
+
+def legacy_pdf_whitespace(text):
+    """The whitespace cleanup extract_text_from_pdf used to run"""
+    text = re.sub(r'\n+', '\n', text)
+    return re.sub(r'\s+', ' ', text)
+
+
+def new_stream(chunks):
+    normalizer = StreamNormalizer()
+    deltas = [normalizer.feed(chunk) for chunk in chunks]
+    deltas.append(normalizer.finish())
+    return deltas
+
+
+def skill_gap_answer(rng: random.Random) -> str:
+    bullet = rng.choice(["- {}: {}", "* **{}:** {}", "- **{}**: {}"])
+    lines = [bullet.format(skill, f"Needed to {rng.choice(VERBS).lower()} {rng.choice(OBJECTS)} at scale.")
+             for skill in rng.sample(SKILLS, rng.randint(5, 10))]
+    return "\n".join(lines) + "\n"
+
+
+def job_matching_answer(rng: random.Random) -> str:
+    jobs = []
+    for i in range(1, 6):
+        skills = ", ".join(rng.sample(SKILLS, 7))
+        jobs.append(
+            f"{i}. **{rng.choice(['Senior', 'Junior', 'Lead', ''])} {rng.choice(SKILLS)} Engineer**\n"
+            f"   * **Description:** {rng.choice(VERBS)} {rng.choice(OBJECTS)} and own its roadmap. "
+            f"Works with product and data teams on *high-impact* releases.\n"
+            f"   * **Key Required Skills:** {skills}\n"
+            f"   * **Potential Career Path:** Engineer -> Senior Engineer -> Staff Engineer\n")
+    return "\n".join(jobs)
+
+
+def project_ideas_answer(rng: random.Random) -> str:
+    projects = []
+    for i in range(1, 6):
+        label = rng.choice(["{}", "**{}**"])
+        projects.append(
+            f"{i}. {label.format('Project Title:')} {rng.choice(SKILLS)}Pilot - {rng.choice(OBJECTS).title()}\n"
+            f"   Description: A tool that {rng.choice(VERBS).lower()} {rng.choice(OBJECTS)} with live dashboards.\n"
+            f"   Key Skills Demonstrated: {', '.join(rng.sample(SKILLS, 5))}\n"
+            f"   Potential Real-World Impact: Cuts manual reporting time by {rng.randint(20, 80)}%.\n"
+            f"   Difficulty Level: {rng.choice(['Beginner', 'Intermediate', 'Advanced'])}\n")
+    return "\n".join(projects)
+
+
+def chunked(text: str, rng: random.Random) -> list:
+    chunks, pos = [], 0
+    while pos < len(text):
+        size = rng.randint(20, 200)
+        chunks.append(text[pos:pos + size])
+        pos += size
+    return chunks
+
+
+def timed_us(fn, inputs: list, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in inputs:
+            fn(item)
+        times.append((time.perf_counter() - start) / len(inputs) * 1e6)
+    return min(times)
+
+
+def row(label: str, chars: float, old: float, new: float):
+    print(f"{label:<24}{chars:>8.0f}{old:>12.1f}{new:>12.1f}{old / new:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    answers = {
+        "skill_gap": [skill_gap_answer(rng) for _ in range(args.samples)],
+        "job_matching": [job_matching_answer(rng) for _ in range(args.samples)],
+        "project_ideas": [project_ideas_answer(rng) for _ in range(args.samples)],
+    }
+    resumes = [_resume_text(rng, rng.randint(8, 40)) for _ in range(args.samples)]
+
+    for kind, texts in answers.items():
+        for text in texts:
+            assert normalize_response(text) == legacy_clean(text), kind
+            chunks = chunked(text, rng)
+            assert "".join(new_stream(chunks)) == legacy_clean(text), kind
+    for text in resumes:
+        assert collapse_whitespace(text) == legacy_pdf_whitespace(text).strip()
+    print(f"outputs identical to the old functions on {args.samples * 4} samples\n")
+
+    print(f"{'input':<24}{'chars':>8}{'old us':>12}{'new us':>12}{'speedup':>10}")
+    for kind, texts in answers.items():
+        chars = statistics.mean(len(text) for text in texts)
+        row(kind, chars, timed_us(legacy_clean, texts, args.repeat), timed_us(normalize_response, texts, args.repeat))
+    for kind, texts in answers.items():
+        streams = [chunked(text, rng) for text in texts]
+        chars = statistics.mean(len(text) for text in texts)
+        row(f"{kind} stream", chars, timed_us(legacy_stream, streams, args.repeat),
+            timed_us(new_stream, streams, args.repeat))
+    chars = statistics.mean(len(text) for text in resumes)
+    row("resume whitespace", chars, timed_us(legacy_pdf_whitespace, resumes, args.repeat),
+        timed_us(collapse_whitespace, resumes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,3 +8,133 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 SEARCH_ENGINE_ID = os.getenv("SEARCH_ENGINE_ID")
 PORT = int(os.getenv("PORT", 8000))
+
+# Gemini client tuning
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta")
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", 30))
+GEMINI_CONNECT_TIMEOUT = float(os.getenv("GEMINI_CONNECT_TIMEOUT", 5))
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", 256))
+GEMINI_MAX_CONNECTIONS = int(os.getenv("GEMINI_MAX_CONNECTIONS", 100))
+GEMINI_MAX_KEEPALIVE = int(os.getenv("GEMINI_MAX_KEEPALIVE", 20))
+GEMINI_OUTPUT_MODE = os.getenv("GEMINI_OUTPUT_MODE", "json")  # "json" asks for schema-checked JSON, "text" for the prompts' bullet format
+
+# Google Custom Search / YouTube client tuning
+GOOGLE_API_BASE = os.getenv("GOOGLE_API_BASE", "https://www.googleapis.com")
+SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", 10))
+SEARCH_MAX_CONNECTIONS = int(os.getenv("SEARCH_MAX_CONNECTIONS", 50))
+COURSE_SEARCH_DEADLINE = float(os.getenv("COURSE_SEARCH_DEADLINE", 6))
+
+# Resume analysis result cache
+RESUME_CACHE_SIZE = int(os.getenv("RESUME_CACHE_SIZE", 512))
+RESUME_CACHE_TTL = float(os.getenv("RESUME_CACHE_TTL", 7 * 24 * 3600))
+RESUME_CACHE_DB = os.getenv("RESUME_CACHE_DB", "")  # e.g. "cache.db"; empty keeps the cache in memory only
+
+# Course / YouTube response cache (stale-while-revalidate)
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", 1000))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", 6 * 3600))
+SEARCH_CACHE_STALE_TTL = float(os.getenv("SEARCH_CACHE_STALE_TTL", 24 * 3600))
+
+# PDF extraction process pool
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", os.cpu_count() or 1))  # 0 extracts in a thread instead
+PDF_QUEUE_SIZE = int(os.getenv("PDF_QUEUE_SIZE", 32))
+PDF_JOB_TIMEOUT = float(os.getenv("PDF_JOB_TIMEOUT", 15))
+PDF_CPU_LIMIT = int(os.getenv("PDF_CPU_LIMIT", 10))  # CPU seconds per extraction
+PDF_MAX_TASKS_PER_CHILD = int(os.getenv("PDF_MAX_TASKS_PER_CHILD", 200))
+PDF_RETRY_AFTER = int(os.getenv("PDF_RETRY_AFTER", 5))
+
+# Streaming uploads
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", 10 * 1024 * 1024))
+MAX_CONCURRENT_UPLOADS = int(os.getenv("MAX_CONCURRENT_UPLOADS", 64))
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR", "")  # empty uses the system temp dir
+PDF_WORKER_MEMORY_MB = int(os.getenv("PDF_WORKER_MEMORY_MB", 1024))  # address-space cap per PDF worker
+
+# Per-client rate limiting (token buckets per IP and route class)
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # "memory" or "redis" to share buckets across workers
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+RATE_LIMIT_LLM_PER_MINUTE = int(os.getenv("RATE_LIMIT_LLM_PER_MINUTE", 10))
+RATE_LIMIT_SEARCH_PER_MINUTE = int(os.getenv("RATE_LIMIT_SEARCH_PER_MINUTE", 60))
+RATE_LIMIT_DEFAULT_PER_MINUTE = int(os.getenv("RATE_LIMIT_DEFAULT_PER_MINUTE", 120))
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"  # key on X-Forwarded-For
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))  # in-memory buckets kept before evicting idle ones
+
+# Upstream quota budgets and circuit breakers (0 disables a budget)
+GEMINI_DAILY_QUOTA = int(os.getenv("GEMINI_DAILY_QUOTA", 1500))
+GEMINI_MINUTE_QUOTA = int(os.getenv("GEMINI_MINUTE_QUOTA", 0))  # off by default; match the key's RPM tier if set
+CUSTOM_SEARCH_DAILY_QUOTA = int(os.getenv("CUSTOM_SEARCH_DAILY_QUOTA", 100))
+CUSTOM_SEARCH_MINUTE_QUOTA = int(os.getenv("CUSTOM_SEARCH_MINUTE_QUOTA", 100))
+YOUTUBE_DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", 10000))  # API units; a search costs 100
+YOUTUBE_MINUTE_QUOTA = int(os.getenv("YOUTUBE_MINUTE_QUOTA", 0))
+CIRCUIT_BASE_BACKOFF = float(os.getenv("CIRCUIT_BASE_BACKOFF", 5))
+CIRCUIT_MAX_BACKOFF = float(os.getenv("CIRCUIT_MAX_BACKOFF", 300))
+QUOTA_RESET_TIMEZONE = os.getenv("QUOTA_RESET_TIMEZONE", "America/Los_Angeles")  # Google resets daily quotas at Pacific midnight
+
+# Batch resume analysis
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", 200))
+BATCH_MAX_BYTES = int(os.getenv("BATCH_MAX_BYTES", 200 * 1024 * 1024))  # whole upload, zip or multipart set
+BATCH_EXTRACT_CONCURRENCY = int(os.getenv("BATCH_EXTRACT_CONCURRENCY", 4))  # per batch; keep below PDF pool capacity
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", 4))  # Gemini calls in flight per batch
+BATCH_MAX_JOBS = int(os.getenv("BATCH_MAX_JOBS", 100))  # finished jobs kept for polling
+BATCH_JOB_TTL = float(os.getenv("BATCH_JOB_TTL", 24 * 3600))
+BATCH_SAVE_INTERVAL = float(os.getenv("BATCH_SAVE_INTERVAL", 1))  # seconds between progress snapshots in the job store
+
+# Background job queue for /jobs/* (async analysis with polling)
+JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "sqlite")  # "sqlite" or "memory"
+JOB_QUEUE_DB = os.getenv("JOB_QUEUE_DB", "jobs.db")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 8))  # concurrent jobs per process
+JOB_MAX_QUEUED_PER_LANE = int(os.getenv("JOB_MAX_QUEUED_PER_LANE", 500))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 1))
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", 24 * 3600))
+JOB_STALE_AFTER = float(os.getenv("JOB_STALE_AFTER", 600))  # running jobs older than this are presumed orphaned
+
+# Local skill extraction and prompt size
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+SKILLS_TAXONOMY_PATH = os.getenv("SKILLS_TAXONOMY_PATH", os.path.join(DATA_DIR, "skills_taxonomy.json"))
+PROMPT_MODE = os.getenv("PROMPT_MODE", "compact")  # "compact" sends extracted skills plus an excerpt, "full" the whole resume text
+PROMPT_MIN_SKILLS = int(os.getenv("PROMPT_MIN_SKILLS", 3))  # fewer detected skills than this falls back to the full prompt
+PROMPT_EXCERPT_CHARS = int(os.getenv("PROMPT_EXCERPT_CHARS", 600))  # resume opening kept in compact prompts for seniority/context
+AUTO_SKILLS_LIMIT = int(os.getenv("AUTO_SKILLS_LIMIT", 20))  # skills filled in for /job_matching/ requests that send none
+
+# Offline skill-gap engine (role -> required skills index)
+ROLE_DATASET_PATH = os.getenv("ROLE_DATASET_PATH", os.path.join(DATA_DIR, "role_skills.json"))
+ROLE_INDEX_PATH = os.getenv("ROLE_INDEX_PATH", os.path.join(DATA_DIR, "role_skills.idx"))  # built by python -m utils.skill_gap_engine
+LOCAL_SKILL_GAP_MODE = os.getenv("LOCAL_SKILL_GAP_MODE", "fallback")  # "fallback" when Gemini fails, "first" to skip Gemini for known roles, "off"
+LOCAL_SKILL_GAP_MAX = int(os.getenv("LOCAL_SKILL_GAP_MAX", 10))  # missing skills listed in a local answer
+
+# Local job matching: rank the role catalog (ROLE_DATASET_PATH) against the candidate's skills
+JOB_MATCHING_MODE = os.getenv("JOB_MATCHING_MODE", "hybrid")  # "hybrid" has Gemini describe the local shortlist, "local" skips Gemini, "gemini" lets Gemini pick the roles
+JOB_MATCHING_TOP_K = int(os.getenv("JOB_MATCHING_TOP_K", 5))
+JOB_MATCHING_MIN_SCORE = float(os.getenv("JOB_MATCHING_MIN_SCORE", 0.2))  # a weaker best match leaves the request to Gemini alone
+
+# Semantic cache: near-duplicate requests reuse an earlier Gemini answer
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.95))  # cosine similarity needed to reuse an answer
+SEMANTIC_CACHE_PATH = os.getenv("SEMANTIC_CACHE_PATH", "semantic_cache")  # writes .npy/.db/.lock next to it; empty keeps it in memory
+SEMANTIC_CACHE_CAPACITY = int(os.getenv("SEMANTIC_CACHE_CAPACITY", 10000))  # entries before the oldest are overwritten
+SEMANTIC_CACHE_DIM = int(os.getenv("SEMANTIC_CACHE_DIM", 512))  # hashed features per request; changing it starts an empty index
+SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", 7 * 24 * 3600))
+SEMANTIC_CACHE_IVF_MIN_ROWS = int(os.getenv("SEMANTIC_CACHE_IVF_MIN_ROWS", 4096))  # below this every entry is compared
+SEMANTIC_CACHE_NPROBE = int(os.getenv("SEMANTIC_CACHE_NPROBE", 8))  # inverted lists scanned per lookup once clustered
+
+# Metrics: per-route and per-stage latency, upstream calls, cache and pool stats at /metrics (Prometheus text format)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Request profiling: stage spans for every request, stack samples for some, slow ones kept for /admin/profiles
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"  # off installs nothing on the request path
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", 0.01))  # share of requests whose stacks are sampled
+PROFILING_SLOW_MS = float(os.getenv("PROFILING_SLOW_MS", 2000))  # requests at least this slow are kept
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", 5))  # stack sampling period
+PROFILING_BUFFER_SIZE = int(os.getenv("PROFILING_BUFFER_SIZE", 200))  # kept requests before the oldest is dropped
+PROFILING_MAX_DEPTH = int(os.getenv("PROFILING_MAX_DEPTH", 64))  # frames kept per sample
+PROFILING_HEADER = os.getenv("PROFILING_HEADER", "X-Profile")  # forces profiling of one request from an allowed client
+PROFILING_ALLOWED_CLIENTS = [ip.strip() for ip in os.getenv("PROFILING_ALLOWED_CLIENTS", "127.0.0.1").split(",") if ip.strip()]  # may force profiling and download results
+
+# Production server (python serve.py): worker processes, connection warm-up and graceful shutdown
+HOST = os.getenv("HOST", "0.0.0.0")
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", 0))  # 0 runs one per CPU core
+WEB_BACKLOG = int(os.getenv("WEB_BACKLOG", 2048))
+WEB_KEEPALIVE_TIMEOUT = int(os.getenv("WEB_KEEPALIVE_TIMEOUT", 5))  # keep shorter than the load balancer's idle timeout
+WARM_UP_ENABLED = os.getenv("WARM_UP_ENABLED", "true").lower() == "true"  # load heavy modules, start PDF workers and open upstream connections in the background at startup
+SHUTDOWN_GRACE_PERIOD = int(os.getenv("SHUTDOWN_GRACE_PERIOD", 30))  # seconds open requests get to finish after SIGTERM
+SHUTDOWN_DRAIN_TIMEOUT = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", 20))  # then seconds background jobs and Gemini calls get
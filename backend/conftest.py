@@ -0,0 +1,8 @@
+"""Pytest setup: run from backend/ so ``utils``, ``config`` and ``routes`` import as they do for uvicorn."""
+import os
+
+# Keep tests off the on-disk caches, the job database and the PDF process pool
+os.environ.setdefault("SEMANTIC_CACHE_PATH", "")
+os.environ.setdefault("JOB_QUEUE_BACKEND", "memory")
+os.environ.setdefault("PDF_WORKERS", "0")
+os.environ.setdefault("RATE_LIMIT_BACKEND", "memory")
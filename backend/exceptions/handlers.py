@@ -2,6 +2,7 @@ import logging
 from datetime import datetime
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
+from utils.rate_limit import RateLimiter, rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +15,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             "message": exc.detail,
             "timestamp": datetime.now().isoformat(),
             "path": str(request.url)
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 async def general_exception_handler(request: Request, exc: Exception):
@@ -29,10 +31,25 @@ async def general_exception_handler(request: Request, exc: Exception):
         }
     )
 
-# Rate limiting middleware (basic implementation)
+# Per-client token bucket rate limiting, keyed by IP and route class
 async def rate_limit_middleware(request: Request, call_next):
-    # Basic rate limiting - in production, use Redis or similar
+    decision = await rate_limiter.check(request) if rate_limiter is not None else None
+    if decision is None:
+        return await call_next(request)
+
+    if not decision.allowed:
+        logger.warning(f"Rate limited {RateLimiter.client_id(request)} on {request.url.path}")
+        return JSONResponse(
+            status_code=429,
+            content={
+                "error": True,
+                "message": f"Too many requests, please retry in {decision.retry_after} seconds",
+                "timestamp": datetime.now().isoformat(),
+                "path": str(request.url)
+            },
+            headers=decision.headers()
+        )
+
     response = await call_next(request)
-    response.headers["X-RateLimit-Limit"] = "100"
-    response.headers["X-RateLimit-Remaining"] = "99"
+    response.headers.update(decision.headers())
     return response
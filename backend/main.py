@@ -1,9 +1,30 @@
 import logging
-import os
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from routes.analysis import router as analysis_router
-from config.settings import PORT
+from routes.streaming import router as streaming_router
+from routes.batch import router as batch_router
+from routes.jobs import router as jobs_router
+from routes.admin import router as admin_router
+from config.settings import (
+    PORT,
+    SEMANTIC_CACHE_ENABLED,
+    METRICS_ENABLED,
+    PROFILING_ENABLED,
+    WARM_UP_ENABLED,
+    SHUTDOWN_DRAIN_TIMEOUT
+)
+from utils import gemini_client, search_client
+from utils.pdf_pool import pdf_pool
+from utils.rate_limit import rate_limiter
+from utils.job_queue import job_queue
+from utils.semantic_cache import semantic_cache
+from utils.warmup import warmup
+from utils.responses import ORJSONResponse
+from utils.metrics import MetricsMiddleware
+from utils.profiling import ProfilingMiddleware
 from exceptions.handlers import (
     http_exception_handler, 
     general_exception_handler, 
@@ -14,12 +35,40 @@ from exceptions.handlers import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Semantic cache files, heavy imports, indexes, PDF workers and upstream connections load in the
+    # background, so /health answers as soon as the process is up; /ready turns 200 when they are done
+    warmup.start(SEMANTIC_CACHE_ENABLED, WARM_UP_ENABLED)
+    await job_queue.start()
+    yield
+    # By now the server has stopped accepting and open requests have finished (or hit the grace period);
+    # running jobs and background Gemini calls get SHUTDOWN_DRAIN_TIMEOUT before connections close
+    deadline = time.monotonic() + SHUTDOWN_DRAIN_TIMEOUT
+    await warmup.stop(SHUTDOWN_DRAIN_TIMEOUT)
+    await job_queue.stop(max(0.0, deadline - time.monotonic()))
+    left = await gemini_client.drain(max(0.0, deadline - time.monotonic()))
+    if left:
+        logger.warning(f"Shutting down with {left} Gemini calls still in flight")
+    semantic_cache.close()
+    # Release pooled upstream connections on shutdown
+    await gemini_client.close_client()
+    await search_client.close_client()
+    if rate_limiter is not None:
+        await rate_limiter.close()
+    pdf_pool.shutdown()
+
 app = FastAPI(
     title="Skill Gap Analyzer API",
     description="AI-powered resume analysis and career guidance platform",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Registered before CORS so CORS wraps it and 429 responses still carry CORS headers
+app.middleware("http")(rate_limit_middleware)
+
 # Enhanced CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -34,14 +83,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.middleware("http")(rate_limit_middleware)
+# Not installed at all unless enabled, so it costs nothing by default
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+# Added last so it is outermost: request timings include rate limiting, CORS and profiling, and every response is counted
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
 app.include_router(analysis_router)
+app.include_router(streaming_router)
+app.include_router(batch_router)
+app.include_router(jobs_router)
+app.include_router(admin_router)
 
 if __name__ == "__main__":
+    # Single process for development; serve.py is the production entry point
     import uvicorn
     uvicorn.run(
         app, 
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, validator
-from typing import List
+from pydantic import BaseModel, Field, validator
+from typing import List, Literal
 
 # Pydantic models for request validation
 class SkillsRequest(BaseModel):
@@ -47,3 +47,68 @@ class JobMatchingRequest(BaseModel):
         if not v or len(v.strip()) < 10:
             raise ValueError('Extracted text must be provided')
         return v.strip()
+
+# Structured Gemini output (JSON mode); field descriptions are sent along in the response schema
+class MissingSkill(BaseModel):
+    skill: str = Field(description="Skill, tool, framework or methodology name")
+    reason: str = Field(description="Why it matters for the target role, in one sentence")
+
+class SkillGapOutput(BaseModel):
+    missing_skills: List[MissingSkill] = Field(description="5-10 most important missing skills, most important first")
+
+class JobRecommendation(BaseModel):
+    title: str
+    description: str = Field(description="2-3 sentences about the role, tailored to the candidate")
+    key_skills: List[str] = Field(description="6-8 specific skills the role needs")
+    career_path: str = Field(description="Realistic career progression from this role")
+
+class JobMatchingOutput(BaseModel):
+    jobs: List[JobRecommendation]
+
+class ProjectIdea(BaseModel):
+    title: str
+    description: str = Field(description="2-3 sentences on what the project does")
+    skills: List[str] = Field(description="4-6 skills the project demonstrates")
+    impact: str = Field(description="Potential real-world impact")
+    difficulty: Literal["Beginner", "Intermediate", "Advanced"]
+
+class ProjectIdeasOutput(BaseModel):
+    projects: List[ProjectIdea]
+
+# OpenAPI description for the streamed resume upload (the route parses multipart itself)
+RESUME_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file", "job_title"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "job_title": {"type": "string"}
+                    }
+                }
+            }
+        }
+    }
+}
+
+# OpenAPI description for batch uploads: several PDFs, or one zip of PDFs, for a single role
+BATCH_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["files", "job_title"],
+                    "properties": {
+                        "files": {"type": "array", "items": {"type": "string", "format": "binary"}},
+                        "job_title": {"type": "string"}
+                    }
+                }
+            }
+        }
+    }
+}
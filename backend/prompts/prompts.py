@@ -1,3 +1,6 @@
+# Bump when RESUME_ANALYSIS_PROMPT or RESUME_ANALYSIS_COMPACT_PROMPT changes so cached analyses are not reused
+RESUME_ANALYSIS_PROMPT_VERSION = "2"
+
 RESUME_ANALYSIS_PROMPT = """
 Analyze this resume for a {job_title} position and identify missing skills.
 
@@ -25,6 +28,30 @@ Example:
 Provide ONLY the bullet-point list, no additional text or explanations.
 """
 
+# Compact variant: skills found locally in the resume plus its opening lines instead of the full text
+RESUME_ANALYSIS_COMPACT_PROMPT = """
+Analyze this candidate for a {job_title} position and identify missing skills.
+
+CANDIDATE SKILLS (extracted from the resume): {resume_skills}
+
+RESUME EXCERPT:
+{resume_excerpt}
+
+TARGET ROLE: {job_title}
+
+INSTRUCTIONS:
+1. Compare the candidate skills with typical requirements for {job_title}
+2. Identify 5-10 most important missing skills
+3. Focus on technical skills, tools, frameworks, and methodologies
+4. Exclude soft skills, basic requirements and skills already listed above
+5. Format as a clean bullet-point list
+
+OUTPUT FORMAT:
+- [Skill Name]: Brief reason why it's important for {job_title}
+
+Provide ONLY the bullet-point list, no additional text or explanations.
+"""
+
 JOB_MATCHING_PROMPT = """
 You are a career advisor AI. Based on the resume content and target job interest, recommend 5 unique job positions that specifically match this candidate's skills.
 
@@ -78,6 +105,61 @@ IMPORTANT:
 Generate 5 unique, personalized job recommendations now:
 """
 
+# Compact variant of JOB_MATCHING_PROMPT, same output format
+JOB_MATCHING_COMPACT_PROMPT = """
+You are a career advisor AI. Based on the candidate profile and target job interest, recommend 5 unique job positions that specifically match this candidate's skills.
+
+RESUME SKILLS (extracted from the resume): {resume_skills}
+
+RESUME EXCERPT:
+{resume_excerpt}
+
+CANDIDATE SKILLS: {skills_str}
+TARGET JOB INTEREST: {job_title}
+
+ANALYSIS INSTRUCTIONS:
+1. Infer the candidate's experience level and background from the excerpt and skills
+2. Recommend 5 different job titles that realistically match their profile, mixing current-level and growth positions
+3. Make job titles creative but professional, each unique and tailored to this candidate
+
+OUTPUT FORMAT (follow this exact structure for all 5):
+1. **[Unique Job Title Based on Candidate's Profile]**
+   * **Description:** [2-3 sentences about the role and key responsibilities tailored to their background]
+   * **Key Required Skills:** [List 6-8 specific skills needed, considering what they already have vs what they need]
+   * **Potential Career Path:** [Realistic career progression based on their current level]
+
+Provide ONLY the formatted job list, no additional text.
+"""
+
+# Hybrid job matching: the roles are picked locally, Gemini only describes them
+JOB_MATCHING_SHORTLIST_PROMPT = """
+You are a career advisor AI. These roles were shortlisted for a candidate by comparing their skills with role requirements. Describe each one for this candidate.
+
+CANDIDATE SKILLS: {skills_str}
+TARGET JOB INTEREST: {job_title}
+
+SHORTLISTED ROLES (with the candidate's matching and missing skills):
+{shortlist}
+
+INSTRUCTIONS:
+1. Keep the roles, their order and their titles exactly as listed
+2. Tailor each description to the candidate's matching skills
+3. List 6-8 key required skills per role, including the missing ones above
+
+OUTPUT FORMAT (follow this exact structure for every role):
+1. **[Role Title]**
+   * **Description:** [2-3 sentences about the role and why it fits this candidate]
+   * **Key Required Skills:** [List 6-8 specific skills]
+   * **Potential Career Path:** [Realistic career progression from this role]
+
+Provide ONLY the formatted job list, no additional text.
+"""
+
+# Appended in JSON mode: the response schema replaces the text layout each prompt describes
+JSON_OUTPUT_INSTRUCTION = """
+Answer in JSON that follows the response schema instead of the text OUTPUT FORMAT above, with the same content in its fields. Use plain text in fields, no markdown.
+"""
+
 PROJECT_GENERATOR_PROMPT = """
 Generate 5 creative and innovative portfolio project ideas based on these skills: {skills_str}
 
@@ -0,0 +1,52 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from config.settings import PROFILING_ENABLED
+from utils.profiling import profiler
+
+router = APIRouter(prefix="/admin/profiles", include_in_schema=False)
+
+
+def require_profiler_access(request: Request):
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not profiler.client_allowed(request.scope):
+        raise HTTPException(status_code=403, detail="Client is not allowed to read profiles")
+
+
+@router.get("")
+def list_profiles(request: Request):
+    """Kept requests, newest first, with their stage spans"""
+    require_profiler_access(request)
+    return {
+        "profiler": profiler.stats(),
+        "requests": [trace.summary() for trace in reversed(profiler.records)]
+    }
+
+
+@router.get("/collapsed")
+def download_collapsed(request: Request, trace_id: Optional[int] = None):
+    """Collapsed stacks of one kept request, or of all of them merged; feed to flamegraph.pl or speedscope"""
+    require_profiler_access(request)
+    if trace_id is None:
+        traces = list(profiler.records)
+    else:
+        trace = profiler.get(trace_id)
+        if trace is None:
+            raise HTTPException(status_code=404, detail="Profile not found or already evicted")
+        traces = [trace]
+    filename = f"profile-{trace_id}.collapsed" if trace_id is not None else "profiles.collapsed"
+    return Response(
+        profiler.collapsed(traces),
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/{trace_id}")
+def get_profile(request: Request, trace_id: int):
+    require_profiler_access(request)
+    trace = profiler.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Profile not found or already evicted")
+    return trace.summary()
@@ -1,32 +1,91 @@
+import asyncio
+import hashlib
 import logging
-import requests
-import time
+from contextlib import nullcontext
 from datetime import datetime
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Request
-from models.schemas import SkillsRequest
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Request, Response
+from models.schemas import (
+    SkillsRequest,
+    RESUME_UPLOAD_OPENAPI,
+    MissingSkill,
+    SkillGapOutput,
+    JobRecommendation,
+    JobMatchingOutput,
+    ProjectIdeasOutput
+)
 from utils.helpers import (
-    extract_text_from_pdf, 
-    clean_gemini_response, 
-    get_fallback_courses
+    get_fallback_courses,
+    normalize_job_title,
+    parse_skill_list,
+    canonical_skills,
+    text_excerpt,
+    parse_json_model
 )
+from utils import gemini_client, search_client
+from utils.text_normalizer import normalize_response
+from utils.gemini_client import GeminiResult
+from utils.cache import ResultCache, StaleWhileRevalidateCache
+from utils.pdf_pool import pdf_pool
+from utils.uploads import SpooledFile, stream_multipart, upload_stats
+from utils.rate_limit import rate_limiter
+from utils.job_queue import job_queue
+from utils.circuit_breaker import CircuitOpenError, upstream_stats
+from utils.skill_extractor import extract_skills, canonical_skill_names
+from utils.skill_gap_engine import SkillGap, local_skill_gap
+from utils.job_matcher import RoleMatch, get_role_matcher
+from utils.semantic_cache import semantic_cache
+from utils import metrics
+from utils.metrics import stage
+from utils.profiling import profiler
+from utils.warmup import warmup
 from config.settings import (
     GEMINI_API_KEY, 
+    GEMINI_OUTPUT_MODE,
     GOOGLE_API_KEY, 
     YOUTUBE_API_KEY, 
-    SEARCH_ENGINE_ID
+    COURSE_SEARCH_DEADLINE,
+    RESUME_CACHE_SIZE,
+    RESUME_CACHE_TTL,
+    RESUME_CACHE_DB,
+    SEARCH_CACHE_SIZE,
+    SEARCH_CACHE_TTL,
+    SEARCH_CACHE_STALE_TTL,
+    PROMPT_MODE,
+    PROMPT_MIN_SKILLS,
+    PROMPT_EXCERPT_CHARS,
+    AUTO_SKILLS_LIMIT,
+    LOCAL_SKILL_GAP_MODE,
+    LOCAL_SKILL_GAP_MAX,
+    JOB_MATCHING_MODE,
+    JOB_MATCHING_TOP_K,
+    JOB_MATCHING_MIN_SCORE,
+    METRICS_ENABLED,
+    PROFILING_ENABLED
 )
 from prompts.prompts import (
     RESUME_ANALYSIS_PROMPT, 
+    RESUME_ANALYSIS_PROMPT_VERSION,
+    RESUME_ANALYSIS_COMPACT_PROMPT,
     JOB_MATCHING_PROMPT, 
-    PROJECT_GENERATOR_PROMPT
+    JOB_MATCHING_COMPACT_PROMPT,
+    JOB_MATCHING_SHORTLIST_PROMPT,
+    PROJECT_GENERATOR_PROMPT,
+    JSON_OUTPUT_INSTRUCTION
 )
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+resume_cache = ResultCache(RESUME_CACHE_SIZE, RESUME_CACHE_TTL, RESUME_CACHE_DB or None)
+# Course and YouTube lookups share one bounded cache, keyed per normalized job title
+search_cache = StaleWhileRevalidateCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL, SEARCH_CACHE_STALE_TTL)
+
 # Health check endpoint
 @router.get("/health")
-def health_check():
+async def health_check():
+    # The job store counts are database queries, kept off the event loop
+    job_queue_stats = await asyncio.to_thread(job_queue.stats)
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
@@ -35,9 +94,52 @@ def health_check():
             "gemini_api": "configured" if GEMINI_API_KEY else "not_configured",
             "google_api": "configured" if GOOGLE_API_KEY else "not_configured",
             "youtube_api": "configured" if YOUTUBE_API_KEY else "not_configured"
-        }
+        },
+        "cache": {
+            "resume_analysis": resume_cache.stats(),
+            "search": search_cache.stats()
+        },
+        "pdf_pool": pdf_pool.stats(),
+        "uploads": upload_stats.stats(),
+        "rate_limit": rate_limiter.stats() if rate_limiter is not None else {"enabled": False},
+        "upstreams": upstream_stats(),
+        "llm_coalescing": gemini_client.coalescing_stats(),
+        "semantic_cache": semantic_cache.stats(),
+        "job_queue": job_queue_stats,
+        "profiling": profiler.stats() if PROFILING_ENABLED else {"enabled": False},
+        "warm_up": warmup.stats()
     }
 
+def refresh_metrics():
+    """Copy the counters /health reports into the metrics registry before a scrape"""
+    for name, cache in (("resume", resume_cache), ("search", search_cache)):
+        cache_stats = cache.stats()
+        metrics.record_cache(name, cache_stats["hits"] + cache_stats.get("stale_hits", 0), cache_stats["misses"])
+    metrics.record_cache("semantic", semantic_cache.hits, semantic_cache.misses)
+    coalescing = gemini_client.coalescing_stats()
+    metrics.record_cache("llm_coalescing", coalescing["deduplicated"], coalescing["upstream_calls"])
+
+    metrics.in_flight.set(pdf_pool.admitted, "pdf_extraction")
+    metrics.in_flight.set(upload_stats.in_flight, "uploads")
+    metrics.in_flight.set(coalescing["in_flight"], "gemini_calls")
+    metrics.in_flight.set(job_queue.running, "jobs")
+
+# Readiness probe: unlike /health, fails until the background warm-up is done
+@router.get("/ready")
+def readiness_check(http_response: Response):
+    """200 once startup warm-up has finished, 503 before, for load balancer readiness probes"""
+    if not warmup.ready:
+        http_response.status_code = 503
+    return {"ready": warmup.ready, "warm_up": warmup.stats()}
+
+# Prometheus scrape endpoint
+@router.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    refresh_metrics()
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 @router.get("/")
 def home():
     return {
@@ -46,114 +148,328 @@ def home():
         "status": "running",
         "endpoints": {
             "health": "/health",
+            "metrics": "/metrics",
             "analyze_resume": "/analyze_resume/",
+            "analyze_full": "/analyze/full",
+            "analyze_batch": "/analyze/batch",
+            "analyze_resume_stream": "/analyze_resume/stream",
             "fetch_courses": "/fetch_courses/{job_title}",
             "youtube_courses": "/youtube-courses/{job_title}",
             "job_matching": "/job_matching/",
-            "project_generator": "/project_generator/"
+            "project_generator": "/project_generator/",
+            "job_matching_stream": "/job_matching/stream",
+            "project_generator_stream": "/project_generator/stream",
+            "jobs": "/jobs/{analyze_resume|job_matching|project_generator}",
+            "job_status": "/jobs/{job_id}"
         }
     }
 
-@router.post("/analyze_resume/")
-async def analyze_resume(file: UploadFile = File(...), job_title: str = Form(...)):
-    try:
-        # Validate file type
-        if not file.filename.lower().endswith('.pdf'):
-            raise HTTPException(status_code=400, detail="Only PDF files are supported")
-        
-        # Validate file size (10MB limit)
-        file_content = await file.read()
-        if len(file_content) > 10 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File size too large (max 10MB)")
-        
-        # Validate job title
-        if not job_title or len(job_title.strip()) < 2:
-            raise HTTPException(status_code=400, detail="Valid job title is required")
-        
-        extracted_text = extract_text_from_pdf(file_content)
-        
-        if not extracted_text.strip():
-            raise HTTPException(status_code=400, detail="Could not extract text from PDF")
-
-        # Enhanced prompt for better skill gap analysis
-        prompt_text = RESUME_ANALYSIS_PROMPT.format(
-            job_title=job_title, 
-            extracted_text=extracted_text
+def llm_dedupe_key(kind: str, *parts: str) -> str:
+    """Key for merging concurrent Gemini calls whose canonicalized inputs are identical"""
+    digest = hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+    return f"{kind}:{digest}"
+
+def structured_output() -> bool:
+    return GEMINI_OUTPUT_MODE == "json"
+
+def structured_prompt(prompt: str, output_model=None) -> tuple:
+    """(prompt, response schema) for a Gemini call; with an ``output_model`` and JSON output mode on,
+    Gemini answers in JSON matching it, otherwise the schema is None and the answer is text"""
+    if output_model is None or not structured_output():
+        return prompt, None
+    return prompt + JSON_OUTPUT_INSTRUCTION, gemini_client.response_schema(output_model)
+
+async def generate_similar_cached(route: str, prompt: str, dedupe_key: str, vector, output_model=None) -> GeminiResult:
+    """Gemini call that first reuses the answer to a near-identical earlier request"""
+    prompt, schema = structured_prompt(prompt, output_model)
+    kind = semantic_kind(route, structured=schema is not None)
+    with stage("semantic_cache"):
+        cached = await semantic_cache.lookup(kind, vector)
+    if cached is not None:
+        return GeminiResult(status_code=200, text=cached)
+    with stage("llm"):
+        result = await gemini_client.generate_content(
+            prompt, dedupe_key=f"{dedupe_key}:json" if schema else dedupe_key, schema=schema
         )
-        
-        prompt = {
-            "contents": [{"parts": [{"text": prompt_text}]}]
-        }
-
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={GEMINI_API_KEY}"
-        headers = {"Content-Type": "application/json"}
-
-        response = requests.post(url, headers=headers, json=prompt, timeout=30)
-
-        if response.status_code == 200:
-            response_json = response.json()
-            
-            if "candidates" in response_json and response_json["candidates"]:
-                skill_gap = response_json["candidates"][0]["content"]["parts"][0]["text"]
-                skill_gap = clean_gemini_response(skill_gap)
-            else:
-                skill_gap = "- No specific missing skills identified\n- Consider reviewing job requirements for additional skills"
+    if result.ok and result.text:
+        await semantic_cache.store(kind, vector, result.text)
+    return result
+
+def semantic_kind(route: str, structured: bool = False) -> str:
+    # Answers to a different prompt or in another format are not interchangeable, whatever the inputs
+    return f"{route}:{RESUME_ANALYSIS_PROMPT_VERSION}:{PROMPT_MODE}:{'json' if structured else 'text'}"
+
+def compact_resume(extracted_text: str) -> Optional[dict]:
+    """Locally extracted skills plus the resume's opening, or None when the full text should be sent"""
+    if PROMPT_MODE != "compact":
+        return None
+    skills = extract_skills(extracted_text)
+    # Too few known skills usually means an unusual resume; let Gemini read all of it
+    if len(skills) < PROMPT_MIN_SKILLS:
+        return None
+    return {
+        "resume_skills": ", ".join(skills),
+        "resume_excerpt": text_excerpt(extracted_text, PROMPT_EXCERPT_CHARS)
+    }
 
+def build_skill_gap_prompt(extracted_text: str, job_title: str) -> str:
+    # Enhanced prompt for better skill gap analysis
+    compact = compact_resume(extracted_text)
+    if compact is not None:
+        return RESUME_ANALYSIS_COMPACT_PROMPT.format(job_title=job_title, **compact)
+    return RESUME_ANALYSIS_PROMPT.format(
+        job_title=job_title, 
+        extracted_text=extracted_text
+    )
+
+def format_skill_gap(skills: List[MissingSkill]) -> str:
+    """Bullet list in the text format clients parsed before structured output existed"""
+    return "\n".join(f"- {item.skill}: {item.reason}" for item in skills)
+
+def local_skill_gap_payload(gap: SkillGap, extracted_text: str, job_title: str, degraded: bool) -> dict:
+    """/analyze_resume/ payload from the role index, in the same bullet format Gemini answers with"""
+    skills = []
+    for alternatives, weight in gap.missing[:LOCAL_SKILL_GAP_MAX]:
+        if weight >= 8:
+            reason = f"Core requirement for {gap.role} roles"
+        elif weight >= 6:
+            reason = f"Frequently requested for {gap.role} roles"
         else:
-            error_text = response.text.lower()
-            logger.error(f"Gemini API error: {response.text}")
-            
-            if "quota" in error_text or "429" in error_text or "resourceexhausted" in error_text:
-                return {
-                    "success": False,
-                    "user_message": "Daily analysis limit reached. Free Gemini API has limited requests. Try tomorrow or new API key.",
-                    "missing_skills": "- Daily quota exceeded",
-                    "extracted_text": extracted_text,
-                    "job_title": job_title,
-                    "error_code": "QUOTA_EXCEEDED"
-                }
-            elif "timeout" in error_text or "deadline" in error_text or "unavailable" in error_text:
-                return {
-                    "success": False,
-                    "user_message": "AI service busy. Try again in 2-3 minutes.",
-                    "missing_skills": "- Service temporarily unavailable",
-                    "extracted_text": extracted_text,
-                    "job_title": job_title,
-                    "error_code": "SERVICE_BUSY"
-                }
-            else:
-                return {
-                    "success": False,
-                    "user_message": "Analysis service temporarily unavailable. Try again later.",
-                    "missing_skills": "- Unable to analyze resume at this time",
-                    "extracted_text": extracted_text,
-                    "job_title": job_title,
-                    "error_code": "SERVICE_ERROR"
-                }
-
+            reason = f"Useful addition for {gap.role} roles"
+        if len(alternatives) > 1:
+            reason += f" (alternatives: {', '.join(alternatives[1:4])})"
+        skills.append(MissingSkill(skill=alternatives[0], reason=reason))
+    payload = {
+        "missing_skills": format_skill_gap(skills) or "- No specific missing skills identified\n- Consider reviewing job requirements for additional skills",
+        "extracted_text": extracted_text,
+        "job_title": job_title,
+        "analysis_timestamp": datetime.now().isoformat(),
+        "resume_length": len(extracted_text),
+        "analysis_source": "local",
+        "matched_role": gap.role,
+        "role_coverage": round(gap.coverage, 2),
+        "structured": SkillGapOutput(missing_skills=skills).model_dump()
+    }
+    if degraded:
+        payload["degraded"] = True
+        payload["user_message"] = "AI analysis is unavailable right now, so these results come from built-in role profiles."
+    return payload
+
+def skill_gap_payload(result: GeminiResult, extracted_text: str, job_title: str) -> dict:
+    """Turn a Gemini result into the /analyze_resume/ payload"""
+    structured = None
+    if result.ok:
+        structured = parse_json_model(result.text, SkillGapOutput)
+        if structured is not None:
+            skill_gap = format_skill_gap(structured.missing_skills)
+        elif result.text is not None:
+            skill_gap = normalize_response(result.text)
+        else:
+            skill_gap = "- No specific missing skills identified\n- Consider reviewing job requirements for additional skills"
 
+    else:
+        error_text = result.error.lower()
+        logger.error(f"Gemini API error: {result.error}")
+        
+        # Open circuit, exhausted quota or any other failure: answer from the role index when the role is known
+        if LOCAL_SKILL_GAP_MODE != "off":
+            gap = local_skill_gap(extracted_text, job_title)
+            if gap is not None:
+                return local_skill_gap_payload(gap, extracted_text, job_title, degraded=True)
+        
+        if "quota" in error_text or "429" in error_text or "resourceexhausted" in error_text:
+            return {
+                "success": False,
+                "user_message": "Daily analysis limit reached. Free Gemini API has limited requests. Try tomorrow or new API key.",
+                "missing_skills": "- Daily quota exceeded",
+                "extracted_text": extracted_text,
+                "job_title": job_title,
+                "error_code": "QUOTA_EXCEEDED"
+            }
+        elif "timeout" in error_text or "deadline" in error_text or "unavailable" in error_text:
+            return {
+                "success": False,
+                "user_message": "AI service busy. Try again in 2-3 minutes.",
+                "missing_skills": "- Service temporarily unavailable",
+                "extracted_text": extracted_text,
+                "job_title": job_title,
+                "error_code": "SERVICE_BUSY"
+            }
+        else:
+            return {
+                "success": False,
+                "user_message": "Analysis service temporarily unavailable. Try again later.",
+                "missing_skills": "- Unable to analyze resume at this time",
+                "extracted_text": extracted_text,
+                "job_title": job_title,
+                "error_code": "SERVICE_ERROR"
+            }
 
-        # IMPORTANT: Return both missing skills AND extracted text
-        return {
-            "missing_skills": skill_gap,
-            "extracted_text": extracted_text,  # This is crucial for job matching
-            "job_title": job_title,
-            "analysis_timestamp": datetime.now().isoformat(),
-            "resume_length": len(extracted_text)
-        }
+    # IMPORTANT: Return both missing skills AND extracted text
+    payload = {
+        "missing_skills": skill_gap,
+        "extracted_text": extracted_text,  # This is crucial for job matching
+        "job_title": job_title,
+        "analysis_timestamp": datetime.now().isoformat(),
+        "resume_length": len(extracted_text)
+    }
+    if structured is not None:
+        payload["structured"] = structured.model_dump()
+    return payload
+
+def first_pass_skill_gap(extracted_text: str, job_title: str) -> Optional[dict]:
+    """Local answer that replaces the Gemini call when LOCAL_SKILL_GAP_MODE is "first" and the role is known"""
+    if LOCAL_SKILL_GAP_MODE != "first":
+        return None
+    gap = local_skill_gap(extracted_text, job_title)
+    if gap is None:
+        return None
+    return local_skill_gap_payload(gap, extracted_text, job_title, degraded=False)
+
+def missing_skill_names(analysis: dict) -> List[str]:
+    """Skill names from a skill-gap payload, read from its structured form when there is one"""
+    if "structured" in analysis:
+        return [item["skill"] for item in analysis["structured"]["missing_skills"]]
+    return parse_skill_list(analysis["missing_skills"])
+
+def cacheable_analysis(payload: dict) -> bool:
+    # Errors and stand-in answers given while Gemini was down should be retried, not cached
+    return "error_code" not in payload and not payload.get("degraded")
+
+async def run_skill_gap(extracted_text: str, job_title: str) -> dict:
+    """Ask Gemini which skills the resume is missing for the role; returns the /analyze_resume/ payload"""
+    local = first_pass_skill_gap(extracted_text, job_title)
+    if local is not None:
+        return local
+    with stage("prompt"):
+        prompt = build_skill_gap_prompt(extracted_text, job_title)
+        vector = skill_gap_vector(extracted_text, job_title)
+    result = await generate_similar_cached(
+        "skill_gap",
+        prompt,
+        llm_dedupe_key("skill_gap", normalize_job_title(job_title), extracted_text),
+        vector,
+        SkillGapOutput
+    )
+    with stage("parse"):
+        return skill_gap_payload(result, extracted_text, job_title)
+
+def skill_gap_vector(extracted_text: str, job_title: str):
+    return semantic_cache.vector(job_title, extract_skills(extracted_text), extracted_text)
+
+def validate_resume_upload(file: Optional[SpooledFile], job_title: str):
+    # Validate file type
+    if file is None or not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+    if file.size == 0:
+        raise HTTPException(status_code=400, detail="Uploaded file is empty")
+    
+    # Validate job title
+    if not job_title or len(job_title.strip()) < 2:
+        raise HTTPException(status_code=400, detail="Valid job title is required")
+
+def resume_cache_key(file: SpooledFile, job_title: str) -> str:
+    # Same bytes + same role + same prompt version -> same analysis, skip parsing and Gemini
+    return ":".join([
+        "resume",
+        RESUME_ANALYSIS_PROMPT_VERSION,
+        PROMPT_MODE,
+        LOCAL_SKILL_GAP_MODE,
+        GEMINI_OUTPUT_MODE,
+        file.sha256,
+        normalize_job_title(job_title)
+    ])
+
+async def analyze_spooled_resume(file: SpooledFile, job_title: str,
+                                 extract_slot=None, llm_slot=None) -> tuple:
+    """Extract and analyze one validated upload; returns (payload, "HIT" | "MISS").
+
+    Batches pass semaphores as ``extract_slot`` / ``llm_slot`` to bound each stage separately.
+    """
+    cache_key = resume_cache_key(file, job_title)
+    with stage("resume_cache"):
+        cached = await resume_cache.get(cache_key)
+    if cached is not None:
+        return {**cached, "job_title": job_title}, "HIT"
+    
+    async with extract_slot or nullcontext():
+        extracted_text = await pdf_pool.extract(file.path)
+    
+    if not extracted_text.strip():
+        raise HTTPException(status_code=400, detail="Could not extract text from PDF")
+    
+    async with llm_slot or nullcontext():
+        result = await run_skill_gap(extracted_text, job_title)
+    if cacheable_analysis(result):
+        await resume_cache.set(cache_key, result)
+    return result, "MISS"
+
+@router.post("/analyze_resume/", openapi_extra=RESUME_UPLOAD_OPENAPI)
+async def analyze_resume(request: Request, http_response: Response):
+    # Stream the upload to disk, enforcing the size limit as bytes arrive
+    upload = await stream_multipart(request)
+    try:
+        file = upload.files[0] if upload.files else None
+        job_title = upload.fields.get("job_title", "")
+        validate_resume_upload(file, job_title)
+        
+        result, cache_status = await analyze_spooled_resume(file, job_title)
+        http_response.headers["X-Cache"] = cache_status
+        return result
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Resume analysis error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to analyze resume")
-
-@router.get("/fetch_courses/{job_title}")
-def fetch_courses(job_title: str):
-    try:
-        if not job_title or len(job_title.strip()) < 2:
-            raise HTTPException(status_code=400, detail="Valid job title is required")
+    finally:
+        upload.cleanup()
+
+def _courses_from_search(data: dict, job_title: str) -> list:
+    """Turn a Custom Search response into course entries from known learning platforms"""
+    courses = []
+    for item in data.get("items", []):
+        link = item.get("link", "")
+        title = item.get("title", "")
         
+        # Filter for educational platforms
+        if any(platform in link.lower() for platform in [
+            "coursera.org", "udemy.com", "edx.org", "pluralsight.com",
+            "linkedin.com/learning", "skillshare.com", "udacity.com",
+            "codecademy.com", "freecodecamp.org"
+        ]):
+            platform = "Unknown"
+            if "coursera.org" in link:
+                platform = "Coursera"
+            elif "udemy.com" in link:
+                platform = "Udemy"
+            elif "edx.org" in link:
+                platform = "edX"
+            elif "pluralsight.com" in link:
+                platform = "Pluralsight"
+            elif "linkedin.com/learning" in link:
+                platform = "LinkedIn Learning"
+            elif "skillshare.com" in link:
+                platform = "Skillshare"
+            elif "udacity.com" in link:
+                platform = "Udacity"
+            elif "codecademy.com" in link:
+                platform = "Codecademy"
+            elif "freecodecamp.org" in link:
+                platform = "FreeCodeCamp"
+            
+            courses.append({
+                "title": title,
+                "link": link,
+                "snippet": item.get("snippet", f"Learn {job_title} skills with this comprehensive course"),
+                "platform": platform,
+                "isFree": platform in ["FreeCodeCamp", "edX"] or "free" in title.lower()
+            })
+    return courses
+
+async def search_courses(job_title: str) -> tuple:
+    """Search learning platforms for courses; returns (payload, cacheable)"""
+    try:
         # Enhanced search queries for better results
         search_queries = [
             f"{job_title} course certification",
@@ -161,74 +477,42 @@ def fetch_courses(job_title: str):
             f"learn {job_title} skills online"
         ]
         
+        # Fan the queries out over the shared pool; whatever is back by the deadline is used
+        tasks = [asyncio.create_task(search_client.custom_search(query)) for query in search_queries]
+        done, pending = await asyncio.wait(tasks, timeout=COURSE_SEARCH_DEADLINE)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"{len(pending)} course search queries missed the {COURSE_SEARCH_DEADLINE}s deadline")
+        
         all_courses = []
         
-        for query in search_queries:
+        # Walk results in query order so de-duplication stays deterministic
+        for query, task in zip(search_queries, tasks):
+            if task not in done:
+                continue
             try:
-                # Search for courses
-                search_url = "https://www.googleapis.com/customsearch/v1"
-                params = {
-                    "key": GOOGLE_API_KEY,
-                    "cx": SEARCH_ENGINE_ID,
-                    "q": query,
-                    "num": 3,
-                    "safe": "active"
-                }
-
-                response = requests.get(search_url, params=params, timeout=10)
+                response = task.result()
                 
                 if response.status_code == 200:
-                    data = response.json()
-                    
-                    if "items" in data:
-                        for item in data["items"]:
-                            link = item.get("link", "")
-                            title = item.get("title", "")
-                            
-                            # Filter for educational platforms
-                            if any(platform in link.lower() for platform in [
-                                "coursera.org", "udemy.com", "edx.org", "pluralsight.com",
-                                "linkedin.com/learning", "skillshare.com", "udacity.com",
-                                "codecademy.com", "freecodecamp.org"
-                            ]):
-                                platform = "Unknown"
-                                if "coursera.org" in link:
-                                    platform = "Coursera"
-                                elif "udemy.com" in link:
-                                    platform = "Udemy"
-                                elif "edx.org" in link:
-                                    platform = "edX"
-                                elif "pluralsight.com" in link:
-                                    platform = "Pluralsight"
-                                elif "linkedin.com/learning" in link:
-                                    platform = "LinkedIn Learning"
-                                elif "skillshare.com" in link:
-                                    platform = "Skillshare"
-                                elif "udacity.com" in link:
-                                    platform = "Udacity"
-                                elif "codecademy.com" in link:
-                                    platform = "Codecademy"
-                                elif "freecodecamp.org" in link:
-                                    platform = "FreeCodeCamp"
-                                
-                                course = {
-                                    "title": title,
-                                    "link": link,
-                                    "snippet": item.get("snippet", f"Learn {job_title} skills with this comprehensive course"),
-                                    "platform": platform,
-                                    "isFree": platform in ["FreeCodeCamp", "edX"] or "free" in title.lower()
-                                }
-                                
-                                # Avoid duplicates
-                                if not any(existing["link"] == course["link"] for existing in all_courses):
-                                    all_courses.append(course)
-                
-                time.sleep(0.1)  # Rate limiting
+                    for course in _courses_from_search(response.json(), job_title):
+                        # Avoid duplicates
+                        if not any(existing["link"] == course["link"] for existing in all_courses):
+                            all_courses.append(course)
+                else:
+                    logger.warning(f"Search query failed for '{query}': status {response.status_code}")
                 
+            except CircuitOpenError as e:
+                # Refused locally without a round trip; the curated fallback below covers it
+                logger.info(f"Search query skipped for '{query}': {str(e)}")
+                continue
             except Exception as e:
                 logger.warning(f"Search query failed for '{query}': {str(e)}")
                 continue
         
+        # Only real search results are worth caching; fallbacks should be retried next time
+        cacheable = bool(all_courses)
+        
         # If no results found, provide curated fallback courses
         if not all_courses:
             all_courses = get_fallback_courses(job_title)
@@ -241,10 +525,8 @@ def fetch_courses(job_title: str):
             "job_title": job_title,
             "total_found": len(all_courses),
             "search_timestamp": datetime.now().isoformat()
-        }
+        }, cacheable
 
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Course fetch error: {str(e)}")
         return {
@@ -252,30 +534,15 @@ def fetch_courses(job_title: str):
             "job_title": job_title,
             "total_found": 0,
             "error": "Using fallback courses due to API limitations"
-        }
+        }, False
 
-@router.get("/youtube-courses/{job_title}")
-def get_youtube_courses(job_title: str):
+async def search_youtube(job_title: str) -> tuple:
+    """Search YouTube for tutorial videos; returns (payload, cacheable)"""
     try:
-        if not job_title or len(job_title.strip()) < 2:
-            raise HTTPException(status_code=400, detail="Valid job title is required")
-        
         # Enhanced search query for better YouTube results
         search_query = f"{job_title} tutorial course 2024"
-        youtube_url = f"https://www.googleapis.com/youtube/v3/search"
-        
-        params = {
-            "part": "snippet",
-            "q": search_query,
-            "type": "video",
-            "key": YOUTUBE_API_KEY,
-            "maxResults": 12,
-            "order": "relevance",
-            "videoDuration": "medium",  # Filter for substantial content
-            "safeSearch": "strict"
-        }
 
-        response = requests.get(youtube_url, params=params, timeout=10)
+        response = await search_client.youtube_search(search_query, max_results=12)
         
         if response.status_code != 200:
             logger.error(f"YouTube API error: {response.text}")
@@ -283,7 +550,7 @@ def get_youtube_courses(job_title: str):
                 "videos": [],
                 "job_title": job_title,
                 "error": "YouTube API temporarily unavailable"
-            }
+            }, False
         
         data = response.json()
 
@@ -292,7 +559,7 @@ def get_youtube_courses(job_title: str):
                 "videos": [],
                 "job_title": job_title,
                 "message": f"No YouTube videos found for {job_title}"
-            }
+            }, True
 
         videos = []
         for item in data.get("items", []):
@@ -313,102 +580,285 @@ def get_youtube_courses(job_title: str):
             "job_title": job_title,
             "total_found": len(videos),
             "search_timestamp": datetime.now().isoformat()
-        }
+        }, True
 
-    except HTTPException:
-        raise
+    except CircuitOpenError as e:
+        logger.info(f"Skipping YouTube search: {str(e)}")
+        return {
+            "videos": [],
+            "job_title": job_title,
+            "error": "YouTube API temporarily unavailable"
+        }, False
     except Exception as e:
         logger.error(f"YouTube fetch error: {str(e)}")
         return {
             "videos": [],
             "job_title": job_title,
             "error": f"Failed to fetch YouTube videos: {str(e)}"
-        }
-
-# FIXED: Job Matching Endpoint - Only the job matching part
-@router.post("/job_matching/")
-async def job_matching(request: dict):
-    try:
-        # Extract data from request
-        skills = request.get("skills", [])
-        job_title = request.get("job_title", "")
-        extracted_text = request.get("extracted_text", "")
-        
-        # Validate inputs
-        if not skills or len(skills) == 0:
-            raise HTTPException(status_code=400, detail="Skills list cannot be empty")
-        if not job_title or len(job_title.strip()) < 2:
-            raise HTTPException(status_code=400, detail="Valid job title is required")
-        if not extracted_text or len(extracted_text.strip()) < 10:
-            raise HTTPException(status_code=400, detail="Extracted text is required")
-        
-        # FIXED: Remove hardcoded examples and let AI generate unique recommendations
-        prompt_text = JOB_MATCHING_PROMPT.format(
-            extracted_text=extracted_text,
-            skills_str=", ".join(skills),
-            job_title=job_title
-        )
-        
-        prompt = {
-            "contents": [{"parts": [{"text": prompt_text}]}]
-        }
-
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={GEMINI_API_KEY}"
-        headers = {"Content-Type": "application/json"}
-
-        # Log the request for debugging
-        logger.info(f"Sending job matching request for job title: {job_title}")
+        }, False
+
+async def cached_courses(job_title: str) -> tuple:
+    """Course search through the shared cache; returns (payload, cache_status, age_seconds)"""
+    (result, _), status, age = await search_cache.get_or_fetch(
+        f"courses:{normalize_job_title(job_title)}",
+        lambda: search_courses(job_title),
+        cacheable=lambda fetched: fetched[1]
+    )
+    return {**result, "job_title": job_title}, status, age
+
+async def cached_youtube(job_title: str) -> tuple:
+    """YouTube search through the shared cache; returns (payload, cache_status, age_seconds)"""
+    (result, _), status, age = await search_cache.get_or_fetch(
+        f"youtube:{normalize_job_title(job_title)}",
+        lambda: search_youtube(job_title),
+        cacheable=lambda fetched: fetched[1]
+    )
+    return {**result, "job_title": job_title}, status, age
 
-        response = requests.post(url, headers=headers, json=prompt, timeout=30)
+@router.get("/fetch_courses/{job_title}")
+async def fetch_courses(job_title: str, http_response: Response):
+    if not job_title or len(job_title.strip()) < 2:
+        raise HTTPException(status_code=400, detail="Valid job title is required")
+    
+    result, status, age = await cached_courses(job_title)
+    http_response.headers.update(search_cache.cache_headers(status, age))
+    return result
 
-        if response.status_code == 200:
-            response_json = response.json()
+@router.get("/youtube-courses/{job_title}")
+async def get_youtube_courses(job_title: str, http_response: Response):
+    if not job_title or len(job_title.strip()) < 2:
+        raise HTTPException(status_code=400, detail="Valid job title is required")
+    
+    result, status, age = await cached_youtube(job_title)
+    http_response.headers.update(search_cache.cache_headers(status, age))
+    return result
+
+def local_job_matches(skills: List[str], job_title: str, extracted_text: str) -> Optional[List[RoleMatch]]:
+    """Catalog roles ranked for the candidate, or None when Gemini should pick the roles itself"""
+    if JOB_MATCHING_MODE not in ("local", "hybrid"):
+        return None
+    resume_skills = extract_skills(extracted_text)
+    # Requested skills steer the ranking, but only the resume decides what counts as already held
+    matches = get_role_matcher().top_matches(
+        [*resume_skills, *canonical_skill_names(skills)], job_title, JOB_MATCHING_TOP_K, resume_skills=resume_skills
+    )
+    if not matches or matches[0].score < JOB_MATCHING_MIN_SCORE:
+        return None
+    return matches
+
+def role_matches_payload(matches: List[RoleMatch]) -> List[dict]:
+    return [
+        {
+            "title": match.role,
+            "score": match.score,
+            "coverage": round(match.coverage, 2),
+            "matched_skills": match.matched,
+            "missing_skills": [
+                {"skill": alternatives[0], "alternatives": alternatives[1:], "weight": weight}
+                for alternatives, weight in match.missing[:LOCAL_SKILL_GAP_MAX]
+            ],
+            "adjacent_roles": match.adjacent
+        }
+        for match in matches
+    ]
+
+def format_job_recommendations(jobs: List[JobRecommendation]) -> str:
+    """Numbered list in the cleaned text format clients parsed before structured output existed"""
+    return " ".join(
+        f"{number}. {job.title} * Description: {job.description} "
+        f"* Key Required Skills: {', '.join(job.key_skills)} "
+        f"* Potential Career Path: {job.career_path}"
+        for number, job in enumerate(jobs, 1)
+    )
+
+def local_job_recommendations(matches: List[RoleMatch]) -> List[JobRecommendation]:
+    """Shortlisted roles described from the catalog alone"""
+    jobs = []
+    for match in matches:
+        missing = [alternatives[0] for alternatives, _ in match.missing]
+        description = f"Covers {round(match.coverage * 100)}% of the role's weighted requirements"
+        if match.matched:
+            description += f", building on {', '.join(match.matched[:5])}"
+        if missing:
+            description += f". Closing the gap starts with {', '.join(missing[:3])}"
+        career_path = f"Senior {match.role}"
+        if match.adjacent:
+            career_path += f", or a move into {' or '.join(match.adjacent)}"
+        jobs.append(JobRecommendation(
+            title=match.role,
+            description=f"{description}.",
+            key_skills=(missing + match.matched)[:8],
+            career_path=career_path
+        ))
+    return jobs
+
+def local_job_matching_payload(matches: List[RoleMatch], skills: List[str], job_title: str, degraded: bool) -> dict:
+    """/job_matching/ payload straight from the role catalog"""
+    jobs = local_job_recommendations(matches)
+    payload = {
+        "job_recommendations": format_job_recommendations(jobs),
+        "skills_analyzed": skills,
+        "job_title": job_title,
+        "analysis_timestamp": datetime.now().isoformat(),
+        "total_skills": len(skills),
+        "analysis_source": "local",
+        "role_matches": role_matches_payload(matches),
+        "structured": JobMatchingOutput(jobs=jobs).model_dump()
+    }
+    if degraded:
+        payload["degraded"] = True
+        payload["user_message"] = "AI descriptions are unavailable right now, so these roles are summarized from built-in role profiles."
+    return payload
+
+def build_job_matching_prompt(skills: List[str], job_title: str, extracted_text: str,
+                              matches: Optional[List[RoleMatch]] = None) -> str:
+    if matches:
+        shortlist = "\n".join(
+            f"{number}. {match.role} (matching: {', '.join(match.matched[:6]) or 'none'}; "
+            f"missing: {', '.join(alternatives[0] for alternatives, _ in match.missing[:4]) or 'none'})"
+            for number, match in enumerate(matches, 1)
+        )
+        return JOB_MATCHING_SHORTLIST_PROMPT.format(
+            skills_str=", ".join(canonical_skills(skills)),
+            job_title=job_title,
+            shortlist=shortlist
+        )
+    # FIXED: Remove hardcoded examples and let AI generate unique recommendations
+    compact = compact_resume(extracted_text)
+    if compact is not None:
+        return JOB_MATCHING_COMPACT_PROMPT.format(
+            skills_str=", ".join(canonical_skills(skills)),
+            job_title=job_title,
+            **compact
+        )
+    return JOB_MATCHING_PROMPT.format(
+        extracted_text=extracted_text,
+        skills_str=", ".join(canonical_skills(skills)),
+        job_title=job_title
+    )
+
+def job_matching_payload(result: GeminiResult, skills: List[str], job_title: str,
+                         matches: Optional[List[RoleMatch]] = None) -> dict:
+    """Turn a Gemini result into the /job_matching/ payload; ``matches`` is the shortlist Gemini described"""
+    structured = None
+    if result.ok:
+        structured = parse_json_model(result.text, JobMatchingOutput)
+        if structured is not None:
+            job_recommendations = format_job_recommendations(structured.jobs)
+        elif result.text is not None:
+            job_recommendations = normalize_response(result.text)
             
-            if "candidates" in response_json and response_json["candidates"]:
-                job_recommendations = response_json["candidates"][0]["content"]["parts"][0]["text"]
-                job_recommendations = clean_gemini_response(job_recommendations)
-                
-                # Log the response for debugging
-                logger.info(f"Job recommendations generated successfully. Length: {len(job_recommendations)}")
-                
-            else:
-                logger.warning("No candidates in Gemini response")
-                job_recommendations = "Unable to generate job recommendations at this time. Please try again."
+            # Log the response for debugging
+            logger.info(f"Job recommendations generated successfully. Length: {len(job_recommendations)}")
+            
+        else:
+            logger.warning("No candidates in Gemini response")
+            job_recommendations = "Unable to generate job recommendations at this time. Please try again."
 
+    else:
+        error_text = result.error.lower()
+        logger.error(f"Gemini API error: Status {result.status_code}, Response: {result.error}")
+        
+        # The shortlist stands on its own; only the prose is lost
+        if matches:
+            return local_job_matching_payload(matches, skills, job_title, degraded=True)
+        
+        if "quota" in error_text or "429" in error_text or "resourceexhausted" in error_text:
+            return {
+                "job_recommendations": "Daily quota exceeded. Cannot generate job recommendations right now.",
+                "skills_analyzed": skills,
+                "job_title": job_title,
+                "error_code": "QUOTA_EXCEEDED",
+                "user_message": "Daily analysis limit reached. Free Gemini API has limited requests."
+            }
+        elif "timeout" in error_text or "deadline" in error_text:
+            return {
+                "job_recommendations": "AI service busy. Try again in few minutes.",
+                "skills_analyzed": skills,
+                "job_title": job_title,
+                "error_code": "SERVICE_BUSY"
+            }
         else:
-            error_text = response.text.lower()
-            logger.error(f"Gemini API error: Status {response.status_code}, Response: {response.text}")
-            
-            if "quota" in error_text or "429" in error_text or "resourceexhausted" in error_text:
-                return {
-                    "job_recommendations": "Daily quota exceeded. Cannot generate job recommendations right now.",
-                    "skills_analyzed": skills,
-                    "job_title": job_title,
-                    "error_code": "QUOTA_EXCEEDED",
-                    "user_message": "Daily analysis limit reached. Free Gemini API has limited requests."
-                }
-            elif "timeout" in error_text or "deadline" in error_text:
-                return {
-                    "job_recommendations": "AI service busy. Try again in few minutes.",
-                    "skills_analyzed": skills,
-                    "job_title": job_title,
-                    "error_code": "SERVICE_BUSY"
-                }
-            else:
-                return {
-                    "job_recommendations": "Unable to generate job recommendations due to API error. Please try again.",
-                    "skills_analyzed": skills,
-                    "job_title": job_title,
-                    "error_code": "SERVICE_ERROR"
-                }
+            return {
+                "job_recommendations": "Unable to generate job recommendations due to API error. Please try again.",
+                "skills_analyzed": skills,
+                "job_title": job_title,
+                "error_code": "SERVICE_ERROR"
+            }
 
-        return {
-            "job_recommendations": job_recommendations,
-            "skills_analyzed": skills,
-            "job_title": job_title,
-            "analysis_timestamp": datetime.now().isoformat(),
-            "total_skills": len(skills)
-        }
+    payload = {
+        "job_recommendations": job_recommendations,
+        "skills_analyzed": skills,
+        "job_title": job_title,
+        "analysis_timestamp": datetime.now().isoformat(),
+        "total_skills": len(skills)
+    }
+    if matches:
+        payload["analysis_source"] = "hybrid"
+        payload["role_matches"] = role_matches_payload(matches)
+    if structured is not None:
+        payload["structured"] = structured.model_dump()
+    return payload
+
+def job_matching_vector(skills: List[str], job_title: str, extracted_text: str):
+    return semantic_cache.vector(job_title, skills, extracted_text)
+
+def job_matching_kind(matches: Optional[List[RoleMatch]]) -> str:
+    return "job_shortlist" if matches else "job_matching"
+
+async def run_job_matching(skills: List[str], job_title: str, extracted_text: str) -> dict:
+    """Ask Gemini for roles that fit the candidate; returns the /job_matching/ payload"""
+    # Log the request for debugging
+    logger.info(f"Sending job matching request for job title: {job_title}")
+
+    with stage("job_ranking"):
+        matches = local_job_matches(skills, job_title, extracted_text)
+    if matches and JOB_MATCHING_MODE == "local":
+        return local_job_matching_payload(matches, skills, job_title, degraded=False)
+    kind = job_matching_kind(matches)
+    with stage("prompt"):
+        prompt = build_job_matching_prompt(skills, job_title, extracted_text, matches)
+        vector = job_matching_vector(skills, job_title, extracted_text)
+    result = await generate_similar_cached(
+        kind,
+        prompt,
+        llm_dedupe_key(
+            kind,
+            normalize_job_title(job_title),
+            extracted_text,
+            *(skill.casefold() for skill in canonical_skills(skills))
+        ),
+        vector,
+        JobMatchingOutput
+    )
+    with stage("parse"):
+        return job_matching_payload(result, skills, job_title, matches)
+
+def job_matching_inputs(request: dict) -> tuple:
+    """Pull and validate (skills, job_title, extracted_text) from a /job_matching/ body"""
+    # Extract data from request
+    skills = request.get("skills", [])
+    job_title = request.get("job_title", "")
+    extracted_text = request.get("extracted_text", "")
+    
+    # Validate inputs
+    if not job_title or len(job_title.strip()) < 2:
+        raise HTTPException(status_code=400, detail="Valid job title is required")
+    if not extracted_text or len(extracted_text.strip()) < 10:
+        raise HTTPException(status_code=400, detail="Extracted text is required")
+    # Clients that send no skills get the ones found in the resume text
+    if not skills:
+        skills = extract_skills(extracted_text, AUTO_SKILLS_LIMIT)
+    if not skills or len(skills) == 0:
+        raise HTTPException(status_code=400, detail="Skills list cannot be empty")
+    return skills, job_title, extracted_text
+
+# FIXED: Job Matching Endpoint - Only the job matching part
+@router.post("/job_matching/")
+async def job_matching(request: dict):
+    try:
+        skills, job_title, extracted_text = job_matching_inputs(request)
+        return await run_job_matching(skills, job_title, extracted_text)
 
     except HTTPException:
         raise
@@ -419,59 +869,81 @@ async def job_matching(request: dict):
             "error": str(e)
         }
 
-@router.post("/project_generator/")
-async def project_generator(request: SkillsRequest):
-    try:
-        skills = request.skills
-        
-        # Enhanced prompt for API to generate creative project ideas
-        prompt_text = PROJECT_GENERATOR_PROMPT.format(
-            skills_str=", ".join(skills)
-        )
-        
-        prompt = {
-            "contents": [{"parts": [{"text": prompt_text}]}]
-        }
-
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={GEMINI_API_KEY}"
-        headers = {"Content-Type": "application/json"}
-
-        response = requests.post(url, headers=headers, json=prompt, timeout=30)
-
-        if response.status_code == 200:
-            response_json = response.json()
-            
-            if "candidates" in response_json and response_json["candidates"]:
-                project_ideas = response_json["candidates"][0]["content"]["parts"][0]["text"]
-                project_ideas = clean_gemini_response(project_ideas)
-            else:
-                # Only use fallback if API response is empty
-                project_ideas = "Unable to generate project ideas at this time. Please try again."
+def build_project_prompt(skills: List[str]) -> str:
+    # Enhanced prompt for API to generate creative project ideas (canonical skill order, so reordered lists ask the same question)
+    return PROJECT_GENERATOR_PROMPT.format(
+        skills_str=", ".join(canonical_skills(skills))
+    )
+
+def format_project_ideas(output: ProjectIdeasOutput) -> str:
+    """Numbered list in the cleaned text format clients parsed before structured output existed"""
+    return " ".join(
+        f"{number}. Project Title: {project.title} Description: {project.description} "
+        f"Key Skills Demonstrated: {', '.join(project.skills)} "
+        f"Potential Real-World Impact: {project.impact} Difficulty Level: {project.difficulty}"
+        for number, project in enumerate(output.projects, 1)
+    )
+
+def project_payload(result: GeminiResult, skills: List[str]) -> dict:
+    """Turn a Gemini result into the /project_generator/ payload"""
+    structured = None
+    if result.ok:
+        structured = parse_json_model(result.text, ProjectIdeasOutput)
+        if structured is not None:
+            project_ideas = format_project_ideas(structured)
+        elif result.text is not None:
+            project_ideas = normalize_response(result.text)
+        else:
+            # Only use fallback if API response is empty
+            project_ideas = "Unable to generate project ideas at this time. Please try again."
 
+    else:
+        error_text = result.error.lower()
+        logger.error(f"Gemini API error: {result.error}")
+        
+        if "quota" in error_text or "429" in error_text:
+            return {
+                "project_ideas": "Daily quota exceeded. Cannot generate projects right now.",
+                "skills_analyzed": skills,
+                "error_code": "QUOTA_EXCEEDED",
+                "user_message": "Daily generation limit reached."
+            }
         else:
-            error_text = response.text.lower()
-            logger.error(f"Gemini API error: {response.text}")
-            
-            if "quota" in error_text or "429" in error_text:
-                return {
-                    "project_ideas": "Daily quota exceeded. Cannot generate projects right now.",
-                    "skills_analyzed": skills,
-                    "error_code": "QUOTA_EXCEEDED",
-                    "user_message": "Daily generation limit reached."
-                }
-            else:
-                return {
-                    "project_ideas": "Unable to generate project ideas due to service error. Try again later.",
-                    "skills_analyzed": skills,
-                    "error_code": "SERVICE_ERROR"
-                }
+            return {
+                "project_ideas": "Unable to generate project ideas due to service error. Try again later.",
+                "skills_analyzed": skills,
+                "error_code": "SERVICE_ERROR"
+            }
 
-        return {
-            "project_ideas": project_ideas,
-            "skills_analyzed": skills,
-            "analysis_timestamp": datetime.now().isoformat(),
-            "total_skills": len(skills)
-        }
+    payload = {
+        "project_ideas": project_ideas,
+        "skills_analyzed": skills,
+        "analysis_timestamp": datetime.now().isoformat(),
+        "total_skills": len(skills)
+    }
+    if structured is not None:
+        payload["structured"] = structured.model_dump()
+    return payload
+
+async def run_project_generation(skills: List[str]) -> dict:
+    """Ask Gemini for portfolio project ideas; returns the /project_generator/ payload"""
+    with stage("prompt"):
+        prompt = build_project_prompt(skills)
+        vector = semantic_cache.vector(skills=skills)
+    result = await generate_similar_cached(
+        "projects",
+        prompt,
+        llm_dedupe_key("projects", *(skill.casefold() for skill in canonical_skills(skills))),
+        vector,
+        ProjectIdeasOutput
+    )
+    with stage("parse"):
+        return project_payload(result, skills)
+
+@router.post("/project_generator/")
+async def project_generator(request: SkillsRequest):
+    try:
+        return await run_project_generation(request.skills)
 
     except Exception as e:
         logger.error(f"Project generation error: {str(e)}")
@@ -479,3 +951,66 @@ async def project_generator(request: SkillsRequest):
             "project_ideas": "Unable to generate project ideas due to system error. Please try again.",
             "error": str(e)
         }
+
+def _section(result) -> dict:
+    """Wrap one pipeline step's outcome so clients can tell partial failures apart"""
+    if result is None:
+        return {"status": "skipped", "data": None, "error": "No skills available to build on"}
+    if isinstance(result, BaseException):
+        return {"status": "error", "data": None, "error": str(getattr(result, "detail", result)) or "Unexpected error"}
+    error = result.get("error_code") or result.get("error")
+    return {"status": "error" if error else "ok", "data": result, "error": error}
+
+async def _run_llm_pipeline(file: SpooledFile, job_title: str) -> tuple:
+    """Skill gap first, then job matching and project ideas side by side on its missing skills"""
+    analysis, _ = await analyze_spooled_resume(file, job_title)
+    skills = [] if "error_code" in analysis else missing_skill_names(analysis)[:20]
+    if not skills:
+        return analysis, skills, None, None
+    jobs, projects = await asyncio.gather(
+        run_job_matching(skills, job_title, analysis["extracted_text"]),
+        run_project_generation(skills),
+        return_exceptions=True
+    )
+    return analysis, skills, jobs, projects
+
+@router.post("/analyze/full", openapi_extra=RESUME_UPLOAD_OPENAPI)
+async def analyze_full(request: Request):
+    """Everything the results page needs in one round trip, with per-section status"""
+    upload = await stream_multipart(request)
+    try:
+        file = upload.files[0] if upload.files else None
+        job_title = upload.fields.get("job_title", "")
+        validate_resume_upload(file, job_title)
+        
+        # Searches only need the job title, so they run while the PDF is parsed and analyzed
+        courses_task = asyncio.create_task(cached_courses(job_title))
+        videos_task = asyncio.create_task(cached_youtube(job_title))
+        try:
+            analysis, skills, jobs, projects = await _run_llm_pipeline(file, job_title)
+        except BaseException:
+            courses_task.cancel()
+            videos_task.cancel()
+            raise
+        courses, videos = await asyncio.gather(courses_task, videos_task, return_exceptions=True)
+        
+        return {
+            "job_title": job_title,
+            "missing_skills_list": skills,
+            "sections": {
+                "skill_gap": _section(analysis),
+                "job_matching": _section(jobs),
+                "projects": _section(projects),
+                "courses": _section(courses if isinstance(courses, BaseException) else courses[0]),
+                "videos": _section(videos if isinstance(videos, BaseException) else videos[0])
+            },
+            "analysis_timestamp": datetime.now().isoformat()
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Full analysis error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to analyze resume")
+    finally:
+        upload.cleanup()
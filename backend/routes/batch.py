@@ -0,0 +1,299 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+
+import orjson
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from models.schemas import BATCH_UPLOAD_OPENAPI
+from utils.cache import TTLCache
+from utils.job_queue import IN_PROGRESS, job_queue
+from utils.rate_limit import RateLimiter, rate_limiter
+from utils.uploads import MultipartUpload, SpooledFile, UploadTooLarge, stream_multipart, unpack_zip
+from routes.analysis import analyze_spooled_resume, validate_resume_upload, missing_skill_names
+from config.settings import (
+    MAX_UPLOAD_BYTES,
+    BATCH_MAX_FILES,
+    BATCH_MAX_BYTES,
+    BATCH_EXTRACT_CONCURRENCY,
+    BATCH_LLM_CONCURRENCY,
+    BATCH_MAX_JOBS,
+    BATCH_JOB_TTL,
+    BATCH_SAVE_INTERVAL,
+    JOB_POLL_INTERVAL
+)
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+class BatchJob:
+    """One batch of resumes scored against one role; results are kept in completion order.
+
+    The worker running a batch keeps it here and saves snapshots to the job store, so
+    any other worker can answer a poll or a resumed stream from the store.
+    """
+
+    def __init__(self, job_title: str, files: List[SpooledFile], client: str = ""):
+        self.job_id = uuid.uuid4().hex
+        self.job_title = job_title
+        self.client = client
+        self.files = files
+        self.total = len(files)
+        self.results: List[dict] = []
+        self.created_at = datetime.now().isoformat()
+        self.started = time.monotonic()
+        self.finished_at: Optional[str] = None
+        self.duration = 0.0
+        self.remote = False  # restored from the store; another worker is running it
+        self.saved_at = 0.0
+        self.prepaid = 1  # LLM token the rate-limit middleware took for the request itself
+        self.pacing = asyncio.Lock()
+        self._updated = asyncio.Event()
+
+    @classmethod
+    def restore(cls, job_id: str, snapshot: dict) -> "BatchJob":
+        job = cls(snapshot["job_title"], [])
+        job.job_id = job_id
+        job.remote = True
+        job.load(snapshot)
+        return job
+
+    def load(self, snapshot: dict):
+        self.total = snapshot["total"]
+        self.results = snapshot["results"]
+        self.created_at = snapshot["created_at"]
+        self.finished_at = snapshot["finished_at"]
+        self.duration = snapshot["duration_seconds"]
+
+    def snapshot(self) -> dict:
+        return {**self.summary(), "job_title": self.job_title, "results": self.results}
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def _notify(self):
+        # Wake every waiter, then arm a fresh event for the next update
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    def add_result(self, result: dict):
+        self.results.append(result)
+        self._notify()
+
+    def finish(self):
+        self.finished_at = datetime.now().isoformat()
+        self.duration = time.monotonic() - self.started
+        self._notify()
+
+    def header(self) -> dict:
+        return {"type": "job", "job_id": self.job_id, "job_title": self.job_title, "total": self.total}
+
+    def summary(self) -> dict:
+        failed = sum(1 for result in self.results if result["status"] == "error")
+        return {
+            "type": "done" if self.done else "progress",
+            "job_id": self.job_id,
+            "total": self.total,
+            "completed": len(self.results),
+            "failed": failed,
+            "duration_seconds": round(self.duration, 2),
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+    async def events(self, offset: int = 0) -> AsyncIterator[dict]:
+        """Header, item results from ``offset`` on (live as they finish), then the summary"""
+        yield self.header()
+        index = max(offset, 0)
+        while True:
+            while index < len(self.results):
+                yield self.results[index]
+                index += 1
+            if self.done:
+                break
+            if self.remote:
+                await asyncio.sleep(JOB_POLL_INTERVAL)
+                record = await job_queue.get(self.job_id)
+                if record is None:
+                    break
+                self.load(record["result"])
+            else:
+                await self._updated.wait()
+        yield self.summary()
+
+
+batch_jobs = TTLCache(BATCH_MAX_JOBS, BATCH_JOB_TTL)
+
+
+async def _save(job: BatchJob, force: bool = False):
+    """Snapshot the batch into the job store, at most every BATCH_SAVE_INTERVAL seconds until it finishes"""
+    if not force and time.monotonic() - job.saved_at < BATCH_SAVE_INTERVAL:
+        return
+    job.saved_at = time.monotonic()
+    try:
+        await job_queue.save(job.job_id, "batch", "succeeded" if job.done else IN_PROGRESS, job.snapshot())
+    except Exception as e:
+        # Only other workers read the store; this one still serves the batch from memory
+        logger.warning(f"Could not save batch {job.job_id}: {str(e)}")
+_running = set()  # strong references so running batches are not garbage collected
+
+
+async def _pace(job: BatchJob):
+    """One LLM rate-limit token per resume, waiting for the client's bucket to refill rather than
+    refusing a batch that is already accepted; resumes take their turn in order"""
+    if rate_limiter is None:
+        return
+    async with job.pacing:
+        if job.prepaid:
+            job.prepaid -= 1
+            return
+        await rate_limiter.wait(job.client, "llm")
+
+
+async def _analyze_item(job: BatchJob, index: int, file: SpooledFile,
+                        extract_slot: asyncio.Semaphore, llm_slot: asyncio.Semaphore):
+    item = {"type": "item", "index": index, "filename": file.filename}
+    try:
+        if file.size > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail=f"File size too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)}MB)")
+        validate_resume_upload(file, job.job_title)
+        await _pace(job)
+        result, cache_status = await analyze_spooled_resume(file, job.job_title, extract_slot, llm_slot)
+        error = result.get("error_code")
+        item.update({
+            "status": "error" if error else "ok",
+            "cache": cache_status,
+            "missing_skills_list": [] if error else missing_skill_names(result),
+            "result": result,
+            "error": error
+        })
+    except HTTPException as e:
+        item.update({"status": "error", "result": None, "error": e.detail})
+    except Exception as e:
+        logger.error(f"Batch item {file.filename} failed: {str(e)}")
+        item.update({"status": "error", "result": None, "error": "Failed to analyze resume"})
+    finally:
+        file.cleanup()
+    job.add_result(item)
+    await _save(job)
+
+
+async def _run_batch(job: BatchJob, upload: MultipartUpload):
+    # Per-stage limits: extraction stays under the PDF pool's admission cap, Gemini calls under our share of quota
+    extract_slot = asyncio.Semaphore(BATCH_EXTRACT_CONCURRENCY)
+    llm_slot = asyncio.Semaphore(BATCH_LLM_CONCURRENCY)
+    try:
+        await asyncio.gather(*(
+            _analyze_item(job, index, file, extract_slot, llm_slot)
+            for index, file in enumerate(job.files)
+        ))
+    finally:
+        upload.cleanup()
+        for file in job.files:
+            file.cleanup()
+        job.finish()
+        await _save(job, force=True)
+        logger.info(f"Batch {job.job_id} finished: {len(job.results)} resumes in {job.duration:.1f}s")
+
+
+async def _collect_files(upload: MultipartUpload) -> List[SpooledFile]:
+    """PDF parts as-is; zip parts expanded into their PDF members"""
+    files = []
+    try:
+        for spooled in upload.files:
+            if not spooled.filename.lower().endswith(".zip"):
+                files.append(spooled)
+                continue
+            try:
+                files += await asyncio.to_thread(unpack_zip, spooled, BATCH_MAX_FILES, BATCH_MAX_BYTES)
+            except UploadTooLarge as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            except Exception:
+                raise HTTPException(status_code=400, detail=f"Could not read zip archive {spooled.filename}")
+            finally:
+                spooled.cleanup()
+        return files
+    except BaseException:
+        for spooled in files:
+            spooled.cleanup()
+        raise
+
+
+def _ndjson(events: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    async def lines():
+        async for event in events:
+            yield orjson.dumps(event) + b"\n"
+    return lines()
+
+
+async def _get_job(job_id: str) -> BatchJob:
+    job = batch_jobs.get(job_id)
+    if job is not None:
+        return job
+    record = await job_queue.get(job_id)
+    if record is None or record["kind"] != "batch":
+        raise HTTPException(status_code=404, detail="Batch job not found or expired")
+    return BatchJob.restore(job_id, record["result"])
+
+
+@router.post("/analyze/batch", openapi_extra=BATCH_UPLOAD_OPENAPI)
+async def analyze_batch(request: Request):
+    """Score many resumes against one role, streaming one NDJSON line per resume as it finishes"""
+    upload = await stream_multipart(
+        request,
+        max_file_bytes=BATCH_MAX_BYTES,
+        max_files=BATCH_MAX_FILES,
+        max_total_bytes=BATCH_MAX_BYTES
+    )
+    files: List[SpooledFile] = []
+    try:
+        job_title = upload.fields.get("job_title", "")
+        if not job_title or len(job_title.strip()) < 2:
+            raise HTTPException(status_code=400, detail="Valid job title is required")
+        files = await _collect_files(upload)
+        if not files:
+            raise HTTPException(status_code=400, detail="No PDF files found in upload")
+        if len(files) > BATCH_MAX_FILES:
+            raise HTTPException(status_code=413, detail=f"Too many files (max {BATCH_MAX_FILES})")
+    except BaseException:
+        upload.cleanup()
+        for spooled in files:
+            spooled.cleanup()
+        raise
+
+    job = BatchJob(job_title, files, RateLimiter.client_id(request))
+    batch_jobs.set(job.job_id, job)
+    await _save(job, force=True)
+    # The batch runs independently of this response; a dropped client can resume from the job ID
+    task = asyncio.create_task(_run_batch(job, upload))
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+
+    return StreamingResponse(
+        _ndjson(job.events()),
+        media_type="application/x-ndjson",
+        headers={"X-Job-Id": job.job_id, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/analyze/batch/{job_id}")
+async def get_batch(job_id: str):
+    """Poll a batch: progress plus every result finished so far"""
+    job = await _get_job(job_id)
+    return job.snapshot()
+
+
+@router.get("/analyze/batch/{job_id}/stream")
+async def stream_batch(job_id: str, offset: int = 0):
+    """Resume a batch stream, skipping the first ``offset`` result lines already received"""
+    job = await _get_job(job_id)
+    return StreamingResponse(
+        _ndjson(job.events(offset)),
+        media_type="application/x-ndjson",
+        headers={"X-Job-Id": job.job_id, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
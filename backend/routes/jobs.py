@@ -0,0 +1,150 @@
+import json
+import logging
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from models.schemas import SkillsRequest, RESUME_UPLOAD_OPENAPI
+from utils.job_queue import FINISHED, LANES, job_queue
+from utils.uploads import SpooledFile, stream_multipart
+from routes.analysis import (
+    analyze_spooled_resume,
+    validate_resume_upload,
+    job_matching_inputs,
+    run_job_matching,
+    run_project_generation
+)
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/jobs")
+
+LANE_QUERY = Query("normal", pattern=f"^({'|'.join(LANES)})$", description="Priority lane")
+
+
+# Job handlers run on the queue's workers, outside any HTTP request
+
+async def _analyze_resume_job(payload: dict) -> dict:
+    file = SpooledFile(**payload["file"])
+    try:
+        result, _ = await analyze_spooled_resume(file, payload["job_title"])
+        return result
+    finally:
+        file.cleanup()
+
+
+async def _job_matching_job(payload: dict) -> dict:
+    return await run_job_matching(payload["skills"], payload["job_title"], payload["extracted_text"])
+
+
+async def _project_generator_job(payload: dict) -> dict:
+    return await run_project_generation(payload["skills"])
+
+
+job_queue.register("analyze_resume", _analyze_resume_job)
+job_queue.register("job_matching", _job_matching_job)
+job_queue.register("project_generator", _project_generator_job)
+
+
+def _accepted(job_id: str, kind: str, lane: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=202,
+        content={
+            "job_id": job_id,
+            "kind": kind,
+            "lane": lane,
+            "status": "queued",
+            "poll": f"/jobs/{job_id}",
+            "events": f"/jobs/{job_id}/events"
+        },
+        headers={"Location": f"/jobs/{job_id}"}
+    )
+
+
+def _public(job: dict) -> dict:
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"],
+        "status_code": job["status_code"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"]
+    }
+
+
+@router.post("/analyze_resume", openapi_extra=RESUME_UPLOAD_OPENAPI)
+async def submit_analyze_resume(request: Request, lane: str = LANE_QUERY):
+    upload = await stream_multipart(request)
+    try:
+        file = upload.files[0] if upload.files else None
+        job_title = upload.fields.get("job_title", "")
+        validate_resume_upload(file, job_title)
+        payload = {
+            "file": {"filename": file.filename, "path": file.path, "size": file.size, "sha256": file.sha256},
+            "job_title": job_title
+        }
+        job_id = await job_queue.submit("analyze_resume", payload, lane)
+        # The spooled PDF now belongs to the job, which deletes it when done
+        upload.files.remove(file)
+        return _accepted(job_id, "analyze_resume", lane)
+    finally:
+        upload.cleanup()
+
+
+@router.post("/job_matching")
+async def submit_job_matching(request: dict, lane: str = LANE_QUERY):
+    skills, job_title, extracted_text = job_matching_inputs(request)
+    payload = {"skills": skills, "job_title": job_title, "extracted_text": extracted_text}
+    job_id = await job_queue.submit("job_matching", payload, lane)
+    return _accepted(job_id, "job_matching", lane)
+
+
+@router.post("/project_generator")
+async def submit_project_generator(request: SkillsRequest, lane: str = LANE_QUERY):
+    job_id = await job_queue.submit("project_generator", {"skills": request.skills}, lane)
+    return _accepted(job_id, "project_generator", lane)
+
+
+async def _load(job_id: str) -> dict:
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, wait: float = Query(0, ge=0, le=30, description="Long-poll up to this many seconds")):
+    job = await _load(job_id)
+    if wait and job["status"] not in FINISHED:
+        await job_queue.wait(job_id, wait)
+        job = await _load(job_id)
+    return _public(job)
+
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: str):
+    """Server-Sent Events: a "status" event on every change, then the finished job as "result" """
+    job = await _load(job_id)
+
+    async def events():
+        current = job
+        last_status = None
+        while True:
+            if current["status"] != last_status:
+                last_status = current["status"]
+                yield f"event: status\ndata: {json.dumps({'job_id': job_id, 'status': last_status})}\n\n"
+            if last_status in FINISHED:
+                yield f"event: result\ndata: {json.dumps(_public(current))}\n\n"
+                return
+            await job_queue.wait(job_id, job_queue.poll_interval)
+            current = await job_queue.get(job_id)
+            if current is None:
+                yield f"event: error\ndata: {json.dumps({'detail': 'Job expired'})}\n\n"
+                return
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
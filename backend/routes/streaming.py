@@ -0,0 +1,188 @@
+import logging
+from typing import AsyncIterator, Callable
+
+import orjson
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from models.schemas import (
+    SkillsRequest,
+    SkillGapOutput,
+    JobMatchingOutput,
+    ProjectIdeasOutput,
+    RESUME_UPLOAD_OPENAPI
+)
+from utils import gemini_client
+from utils.gemini_client import GeminiResult, GeminiStreamError
+from utils.pdf_pool import pdf_pool
+from utils.uploads import stream_multipart
+from utils.semantic_cache import semantic_cache
+from utils.text_normalizer import StreamNormalizer
+from config.settings import JOB_MATCHING_MODE
+from routes.analysis import (
+    resume_cache,
+    resume_cache_key,
+    cacheable_analysis,
+    first_pass_skill_gap,
+    validate_resume_upload,
+    structured_prompt,
+    build_skill_gap_prompt,
+    skill_gap_vector,
+    semantic_kind,
+    skill_gap_payload,
+    job_matching_inputs,
+    build_job_matching_prompt,
+    job_matching_vector,
+    job_matching_kind,
+    local_job_matches,
+    local_job_matching_payload,
+    job_matching_payload,
+    build_project_prompt,
+    project_payload
+)
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Stop proxies (nginx in particular) from buffering the stream into one late response
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"
+}
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+
+async def _replay(text: str) -> AsyncIterator[str]:
+    yield text
+
+
+async def stream_gemini(prompt_text: str, build_payload: Callable[[GeminiResult], dict],
+                        on_result: Callable = None, semantic: tuple = None,
+                        output_model=None) -> AsyncIterator[str]:
+    """Relay Gemini's answer as "chunk" events, then the full payload as a "result" event.
+
+    Gemini is asked in the same output mode as by the non-streaming route and the result
+    is built by the same payload builder, so a client that only reads the last event gets
+    exactly what the plain endpoint returns. Text answers are cleaned as they stream; in
+    JSON output mode the chunks are the raw JSON. ``semantic`` is a (route, vector) pair
+    for the similarity cache; a hit is replayed as one chunk.
+    """
+    prompt_text, schema = structured_prompt(prompt_text, output_model)
+    route, vector = semantic or (None, None)
+    kind = semantic_kind(route, structured=schema is not None) if route else None
+    cached = await semantic_cache.lookup(kind, vector)
+    cleaner = StreamNormalizer() if schema is None else None
+    chunks = []
+    try:
+        if cached is not None:
+            texts = _replay(cached)
+        else:
+            texts = gemini_client.stream_generate_content(prompt_text, schema)
+        async for text in texts:
+            chunks.append(text)
+            delta = cleaner.feed(text) if cleaner else text
+            if delta:
+                yield sse_event("chunk", {"text": delta})
+        delta = cleaner.finish() if cleaner else ""
+        if delta:
+            yield sse_event("chunk", {"text": delta})
+        raw = "".join(chunks)
+        result = GeminiResult(status_code=200, text=raw or None)
+        if cached is None and raw:
+            await semantic_cache.store(kind, vector, raw)
+    except GeminiStreamError as e:
+        result = e.result
+    except Exception as e:
+        # Headers are already sent, so the failure has to travel in-band
+        logger.error(f"Gemini stream error: {str(e)}")
+        yield sse_event("error", {"detail": "AI service stream interrupted. Please try again."})
+        return
+
+    payload = build_payload(result)
+    if on_result is not None:
+        await on_result(payload)
+    yield sse_event("result", payload)
+
+
+@router.post("/analyze_resume/stream", openapi_extra=RESUME_UPLOAD_OPENAPI)
+async def analyze_resume_stream(request: Request):
+    upload = await stream_multipart(request)
+    try:
+        file = upload.files[0] if upload.files else None
+        job_title = upload.fields.get("job_title", "")
+        validate_resume_upload(file, job_title)
+
+        cache_key = resume_cache_key(file, job_title)
+        cached = await resume_cache.get(cache_key)
+        if cached is not None:
+            async def replay():
+                yield sse_event("result", {**cached, "job_title": job_title})
+            return StreamingResponse(replay(), media_type="text/event-stream",
+                                     headers={**SSE_HEADERS, "X-Cache": "HIT"})
+
+        # Extract before the stream opens so upload and PDF errors still get a proper status code
+        extracted_text = await pdf_pool.extract(file.path)
+        if not extracted_text.strip():
+            raise HTTPException(status_code=400, detail="Could not extract text from PDF")
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Resume analysis error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to analyze resume")
+    finally:
+        upload.cleanup()
+
+    async def cache_result(payload: dict):
+        if cacheable_analysis(payload):
+            await resume_cache.set(cache_key, payload)
+
+    local = first_pass_skill_gap(extracted_text, job_title)
+    if local is not None:
+        await cache_result(local)
+
+        async def answer_locally():
+            yield sse_event("result", local)
+        return StreamingResponse(answer_locally(), media_type="text/event-stream",
+                                 headers={**SSE_HEADERS, "X-Cache": "MISS"})
+
+    events = stream_gemini(
+        build_skill_gap_prompt(extracted_text, job_title),
+        lambda result: skill_gap_payload(result, extracted_text, job_title),
+        on_result=cache_result,
+        semantic=("skill_gap", skill_gap_vector(extracted_text, job_title)),
+        output_model=SkillGapOutput
+    )
+    return StreamingResponse(events, media_type="text/event-stream",
+                             headers={**SSE_HEADERS, "X-Cache": "MISS"})
+
+
+@router.post("/job_matching/stream")
+async def job_matching_stream(request: dict):
+    skills, job_title, extracted_text = job_matching_inputs(request)
+    matches = local_job_matches(skills, job_title, extracted_text)
+    if matches and JOB_MATCHING_MODE == "local":
+        async def answer_locally():
+            yield sse_event("result", local_job_matching_payload(matches, skills, job_title, degraded=False))
+        return StreamingResponse(answer_locally(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+    events = stream_gemini(
+        build_job_matching_prompt(skills, job_title, extracted_text, matches),
+        lambda result: job_matching_payload(result, skills, job_title, matches),
+        semantic=(job_matching_kind(matches), job_matching_vector(skills, job_title, extracted_text)),
+        output_model=JobMatchingOutput
+    )
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.post("/project_generator/stream")
+async def project_generator_stream(request: SkillsRequest):
+    events = stream_gemini(
+        build_project_prompt(request.skills),
+        lambda result: project_payload(result, request.skills),
+        semantic=("projects", semantic_cache.vector(skills=request.skills)),
+        output_model=ProjectIdeasOutput
+    )
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,106 @@
+"""Production entry point: several uvicorn workers, uvloop/httptools when installed, graceful shutdown.
+
+Run from backend/:  python serve.py    (tuned by HOST, PORT, WEB_WORKERS and SHUTDOWN_* in config/settings.py)
+
+Each worker is a separate process with its own event loop, upstream connection pools,
+PDF pool and in-memory caches. Workers serve as soon as they boot and warm up in the
+background (utils.warmup); /ready answers 200 once that is done. On SIGTERM each
+worker stops accepting, lets open requests finish for SHUTDOWN_GRACE_PERIOD seconds,
+then gives background jobs and Gemini calls SHUTDOWN_DRAIN_TIMEOUT before closing
+its connections.
+
+What is and is not shared between workers:
+- Jobs and batch results live in the SQLite job store, so any worker can answer a poll.
+- Google API quotas (GEMINI_*_QUOTA, CUSTOM_SEARCH_*_QUOTA, YOUTUBE_*_QUOTA) are split
+  evenly, since each worker budgets its share on its own.
+- /health and /metrics describe the one worker that answered; scrape each worker or
+  aggregate in Prometheus.
+- The semantic cache files are owned by whichever worker locks them first; the others
+  keep a private in-memory cache.
+"""
+import importlib.util
+import logging
+import os
+
+import uvicorn
+
+from config.settings import (
+    HOST,
+    PORT,
+    WEB_WORKERS,
+    WEB_BACKLOG,
+    WEB_KEEPALIVE_TIMEOUT,
+    SHUTDOWN_GRACE_PERIOD,
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_BACKEND,
+    JOB_QUEUE_BACKEND,
+    GEMINI_DAILY_QUOTA,
+    GEMINI_MINUTE_QUOTA,
+    CUSTOM_SEARCH_DAILY_QUOTA,
+    CUSTOM_SEARCH_MINUTE_QUOTA,
+    YOUTUBE_DAILY_QUOTA,
+    YOUTUBE_MINUTE_QUOTA
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def worker_count() -> int:
+    return WEB_WORKERS if WEB_WORKERS > 0 else os.cpu_count() or 1
+
+
+def split_quotas(workers: int):
+    """Give each worker an even share of every upstream quota (0 stays unlimited) through its environment"""
+    quotas = {
+        "GEMINI_DAILY_QUOTA": GEMINI_DAILY_QUOTA,
+        "GEMINI_MINUTE_QUOTA": GEMINI_MINUTE_QUOTA,
+        "CUSTOM_SEARCH_DAILY_QUOTA": CUSTOM_SEARCH_DAILY_QUOTA,
+        "CUSTOM_SEARCH_MINUTE_QUOTA": CUSTOM_SEARCH_MINUTE_QUOTA,
+        "YOUTUBE_DAILY_QUOTA": YOUTUBE_DAILY_QUOTA,
+        "YOUTUBE_MINUTE_QUOTA": YOUTUBE_MINUTE_QUOTA
+    }
+    for name, quota in quotas.items():
+        if quota > 0:
+            os.environ[name] = str(max(1, quota // workers))
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main():
+    workers = worker_count()
+    if workers > 1 and JOB_QUEUE_BACKEND != "sqlite":
+        raise SystemExit(f"JOB_QUEUE_BACKEND={JOB_QUEUE_BACKEND} keeps jobs and batches inside one worker; "
+                         f"use sqlite or set WEB_WORKERS=1")
+    if workers > 1:
+        split_quotas(workers)
+    # PDF_WORKERS defaults to the core count per process; with several web workers, split the cores instead
+    if workers > 1 and "PDF_WORKERS" not in os.environ:
+        os.environ["PDF_WORKERS"] = str(max(1, (os.cpu_count() or 1) // workers))
+    if workers > 1 and RATE_LIMIT_ENABLED and RATE_LIMIT_BACKEND == "memory":
+        logger.warning(f"Rate limits are per worker with RATE_LIMIT_BACKEND=memory, so clients get {workers}x the limit; "
+                       f"use redis to share them")
+
+    # Both ship with uvicorn[standard]; plain asyncio and h11 work, just slower
+    loop = "uvloop" if _installed("uvloop") else "asyncio"
+    http = "httptools" if _installed("httptools") else "h11"
+    logger.info(f"Starting {workers} workers on {HOST}:{PORT} (loop={loop}, http={http})")
+
+    uvicorn.run(
+        "main:app",
+        host=HOST,
+        port=PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=WEB_BACKLOG,
+        timeout_keep_alive=WEB_KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=SHUTDOWN_GRACE_PERIOD,
+        log_level="info"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import pytest
+
+
+class FakeClock:
+    """Stand-in for a module's ``time`` import: monotonic() and time() advance only when told to"""
+
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
@@ -0,0 +1,51 @@
+import asyncio
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import exceptions.handlers
+import main
+import routes.batch
+from utils.rate_limit import MemoryBucketStore, RateLimiter, RateLimitRule
+
+
+@pytest.fixture
+def limiter(monkeypatch) -> RateLimiter:
+    # Two LLM tokens of burst, refilled every 50 ms
+    limiter = RateLimiter(MemoryBucketStore(), {
+        "llm": RateLimitRule(2, period=0.1),
+        "search": RateLimitRule(60),
+        "default": RateLimitRule(120)
+    })
+    monkeypatch.setattr(exceptions.handlers, "rate_limiter", limiter)
+    monkeypatch.setattr(routes.batch, "rate_limiter", limiter)
+    return limiter
+
+
+@pytest.fixture
+def analyzed(monkeypatch) -> list:
+    calls = []
+
+    async def analyze(file, job_title, extract_slot=None, llm_slot=None):
+        calls.append(file.filename)
+        await asyncio.sleep(0)
+        return {"missing_skills": "- Docker: containers"}, "MISS"
+
+    monkeypatch.setattr(routes.batch, "analyze_spooled_resume", analyze)
+    return calls
+
+
+def test_batch_larger_than_the_llm_bucket_completes(limiter, analyzed):
+    files = [("files", (f"resume{i}.pdf", b"%PDF-1.4 fake", "application/pdf")) for i in range(7)]
+    with TestClient(main.app) as client:
+        response = client.post("/analyze/batch", data={"job_title": "Data Engineer"}, files=files)
+    assert response.status_code == 200
+    events = [orjson.loads(line) for line in response.text.splitlines()]
+    assert events[-1]["type"] == "done"
+    assert events[-1]["completed"] == 7
+    assert events[-1]["failed"] == 0
+    assert len(analyzed) == 7
+    # One token from the middleware, then one per further resume, none refused
+    assert limiter.allowed == 7
+    assert limiter.limited == 0
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+
+from utils import cache
+from utils.cache import SingleFlight, StaleWhileRevalidateCache, TTLCache
+
+
+def test_single_flight_shares_one_call():
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "answer"
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+        return flight, calls, results
+
+    flight, calls, results = asyncio.run(scenario())
+    assert results == ["answer"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"upstream_calls": 1, "deduplicated": 4, "in_flight": 0}
+
+
+def test_single_flight_shares_errors_then_forgets_the_key():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        async def succeed():
+            return "ok"
+
+        results = await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+        return results, await flight.do("key", succeed)
+
+    results, retried = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert retried == "ok"
+
+
+def test_single_flight_survives_a_cancelled_caller():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "answer"
+
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        second = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == "answer"
+
+
+@pytest.fixture
+def swr(clock, monkeypatch) -> StaleWhileRevalidateCache:
+    monkeypatch.setattr(cache, "time", clock)
+    return StaleWhileRevalidateCache(max_size=2, ttl=60, stale_ttl=30)
+
+
+class Upstream:
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return f"v{self.calls}"
+
+
+def test_swr_miss_hit_stale_then_refreshed(swr, clock):
+    upstream = Upstream()
+
+    async def scenario():
+        statuses = [await swr.get_or_fetch("k", upstream.fetch)]
+        clock.advance(10)
+        statuses.append(await swr.get_or_fetch("k", upstream.fetch))
+        clock.advance(60)
+        statuses.append(await swr.get_or_fetch("k", upstream.fetch))
+        await asyncio.sleep(0.01)  # let the background refresh land
+        statuses.append(await swr.get_or_fetch("k", upstream.fetch))
+        return statuses
+
+    statuses = asyncio.run(scenario())
+    assert [(value, status) for value, status, _ in statuses] == [
+        ("v1", "MISS"), ("v1", "HIT"), ("v1", "STALE"), ("v2", "HIT")
+    ]
+    assert statuses[2][2] == 70
+    assert upstream.calls == 2
+
+
+def test_swr_holds_background_refreshes_until_done(swr, clock):
+    upstream = Upstream()
+
+    async def scenario():
+        await swr.get_or_fetch("k", upstream.fetch)
+        clock.advance(70)
+        await swr.get_or_fetch("k", upstream.fetch)
+        pending = len(swr._refreshing)
+        await asyncio.sleep(0.01)
+        return pending, len(swr._refreshing)
+
+    assert asyncio.run(scenario()) == (1, 0)
+
+
+def test_swr_expired_entry_is_a_miss(swr, clock):
+    upstream = Upstream()
+
+    async def scenario():
+        await swr.get_or_fetch("k", upstream.fetch)
+        clock.advance(91)
+        return await swr.get_or_fetch("k", upstream.fetch)
+
+    assert asyncio.run(scenario())[:2] == ("v2", "MISS")
+
+
+def test_swr_concurrent_misses_fetch_once(swr):
+    upstream = Upstream()
+
+    async def scenario():
+        return await asyncio.gather(*(swr.get_or_fetch("k", upstream.fetch) for _ in range(10)))
+
+    results = asyncio.run(scenario())
+    assert {value for value, _, _ in results} == {"v1"}
+    assert upstream.calls == 1
+    assert swr.stats()["deduplicated"] == 9
+
+
+def test_swr_skips_uncacheable_values_and_evicts_lru(swr):
+    upstream = Upstream()
+
+    async def scenario():
+        await swr.get_or_fetch("bad", upstream.fetch, cacheable=lambda value: False)
+        for key in ("a", "b", "a", "c"):
+            await swr.get_or_fetch(key, upstream.fetch)
+
+    asyncio.run(scenario())
+    assert list(swr._data) == ["a", "c"]
+
+
+def test_ttl_cache_expires_and_caps_size(clock, monkeypatch):
+    monkeypatch.setattr(cache, "time", clock)
+    ttl_cache = TTLCache(max_size=2, ttl=10)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    ttl_cache.set("c", 3)
+    assert ttl_cache.get("a") is None
+    assert ttl_cache.get("c") == 3
+    clock.advance(11)
+    assert ttl_cache.get("b") is None
+    assert ttl_cache.get("c") is None
@@ -0,0 +1,167 @@
+import asyncio
+
+import pytest
+
+from utils import circuit_breaker
+from utils.circuit_breaker import CircuitOpenError, UpstreamGuard
+
+
+@pytest.fixture
+def guard(clock, monkeypatch) -> UpstreamGuard:
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return UpstreamGuard("test", base_backoff=10, max_backoff=60)
+
+
+def test_closed_until_an_overload(guard):
+    guard.record_success()
+    started = guard.acquire()
+    guard.record_failure(500, "internal error", started)
+    assert guard.state == "closed"
+    guard.record_failure(503, "overloaded", guard.acquire())
+    assert guard.state == "open"
+    assert guard.trips == 1
+
+
+def test_open_rejects_without_calling(guard, clock):
+    guard.record_failure(503, "overloaded", guard.acquire())
+    with pytest.raises(CircuitOpenError) as error:
+        guard.acquire()
+    assert error.value.reason == "busy"
+    assert error.value.retry_after == pytest.approx(10)
+    assert guard.rejected == 1
+
+
+def test_half_open_lets_one_probe_through(guard, clock):
+    guard.record_failure(503, "overloaded", guard.acquire())
+    clock.advance(10)
+    assert guard.state == "half_open"
+    guard.acquire()
+    with pytest.raises(CircuitOpenError):
+        guard.acquire()
+    guard.record_success()
+    assert guard.state == "closed"
+    guard.acquire()
+
+
+def test_failed_probe_doubles_the_backoff(guard, clock):
+    guard.record_failure(503, "overloaded", guard.acquire())
+    for backoff in (20, 40, 60, 60):
+        clock.advance(guard.open_until - clock.now)
+        guard.record_failure(503, "still overloaded", guard.acquire())
+        assert guard.open_until - clock.now == pytest.approx(backoff)
+    assert guard.trips == 5
+
+
+def test_failure_while_closed_restarts_the_backoff(guard, clock):
+    guard.record_failure(503, "overloaded", guard.acquire())
+    clock.advance(10)
+    guard.record_failure(503, "overloaded", guard.acquire())
+    clock.advance(20)
+    guard.record_success()
+    guard.record_failure(503, "overloaded", guard.acquire())
+    assert guard.open_until - clock.now == pytest.approx(10)
+
+
+def test_calls_in_flight_when_it_opened_are_ignored(guard, clock):
+    in_flight = [guard.acquire() for _ in range(5)]
+    clock.advance(1)
+    guard.record_failure(503, "overloaded", in_flight[0])
+    opened_until = guard.open_until
+    for started in in_flight[1:]:
+        guard.record_failure(503, "overloaded", started)
+    clock.advance(10)
+    # Still ignored once half-open: they are not the probe
+    guard.record_failure(503, "overloaded", in_flight[-1])
+    assert guard.open_until == opened_until
+    assert guard.trips == 1
+    assert guard.state == "half_open"
+
+
+def test_transport_errors_need_a_run(guard):
+    for _ in range(UpstreamGuard.TRANSPORT_ERROR_THRESHOLD - 1):
+        guard.record_transport_error(guard.acquire())
+    assert guard.state == "closed"
+    guard.record_success()
+    for _ in range(UpstreamGuard.TRANSPORT_ERROR_THRESHOLD - 1):
+        guard.record_transport_error(guard.acquire())
+    assert guard.state == "closed"
+    guard.record_transport_error(guard.acquire())
+    assert guard.state == "open"
+
+
+def test_transport_error_on_the_probe_frees_the_slot(guard, clock):
+    guard.record_failure(503, "overloaded", guard.acquire())
+    clock.advance(10)
+    guard.record_transport_error(guard.acquire())
+    assert guard.state == "half_open"
+    guard.acquire()
+
+
+def test_retry_delay_from_google_stretches_the_backoff(guard):
+    guard.record_failure(429, '{"retryDelay": "37s"}', guard.acquire())
+    assert guard.open_reason == "quota"
+    assert guard.stats()["retry_after"] == 37
+
+
+def test_minute_quota(clock, monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    guard = UpstreamGuard("test", minute_limit=2)
+    guard.acquire()
+    guard.acquire()
+    with pytest.raises(CircuitOpenError) as error:
+        guard.acquire()
+    assert error.value.reason == "quota"
+    clock.advance(60)
+    guard.acquire()
+    assert guard.stats()["minute_used"] == 1
+
+
+def test_daily_quota_counts_cost(clock, monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    guard = UpstreamGuard("test", daily_limit=250)
+    guard.acquire(100)
+    guard.acquire(100)
+    with pytest.raises(CircuitOpenError):
+        guard.acquire(100)
+    assert guard.stats()["daily_used"] == 200
+
+
+def test_cancelled_probe_frees_the_slot(guard, clock):
+    guard.record_failure(503, "overloaded", guard.acquire())
+    clock.advance(10)
+    probe = guard.acquire()
+    guard.release(probe)
+    assert guard.state == "half_open"
+    guard.acquire()
+
+
+def test_release_of_an_older_call_keeps_the_probe(guard, clock):
+    earlier = guard.acquire()
+    guard.record_failure(503, "overloaded", guard.acquire())
+    clock.advance(10)
+    guard.acquire()
+    guard.release(earlier)
+    with pytest.raises(CircuitOpenError):
+        guard.acquire()
+
+
+def test_search_call_cancelled_past_its_deadline_releases_the_probe(guard, clock, monkeypatch):
+    from utils import search_client
+
+    class SlowClient:
+        async def get(self, path, **kwargs):
+            await asyncio.sleep(10)
+
+    monkeypatch.setattr(search_client, "get_client", lambda: SlowClient())
+    guard.record_failure(503, "overloaded", guard.acquire())
+    clock.advance(10)
+
+    async def scenario():
+        call = asyncio.ensure_future(search_client._guarded_get(guard, 1, "/customsearch/v1"))
+        await asyncio.sleep(0.01)
+        call.cancel()
+        await asyncio.gather(call, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert guard.probe_started == 0
+    guard.acquire()
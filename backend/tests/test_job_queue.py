@@ -0,0 +1,61 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from utils.job_queue import JobQueue, MemoryJobStore, SQLiteJobStore
+
+
+class FlakyStore(MemoryJobStore):
+    """Memory store whose first claims fail, like a locked database"""
+
+    def __init__(self, failures: int = 3):
+        super().__init__()
+        self.failures = failures
+
+    def claim(self):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return super().claim()
+
+
+def run_job(store_factory, payload: dict) -> dict:
+    async def scenario():
+        queue = JobQueue(store_factory, workers=1, max_queued_per_lane=10, poll_interval=0.01)
+
+        async def handler(job_payload: dict) -> dict:
+            return {"echo": job_payload}
+
+        queue.register("echo", handler)
+        await queue.start()
+        try:
+            job_id = await queue.submit("echo", payload)
+            for _ in range(200):
+                job = await queue.get(job_id)
+                if job["status"] in ("succeeded", "failed"):
+                    return job
+                await asyncio.sleep(0.01)
+            raise AssertionError("job did not finish")
+        finally:
+            await queue.stop()
+
+    return asyncio.run(scenario())
+
+
+def test_worker_survives_store_errors():
+    job = run_job(FlakyStore, {"n": 1})
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"echo": {"n": 1}}
+
+
+def test_sqlite_store_round_trip(tmp_path):
+    job = run_job(lambda: SQLiteJobStore(str(tmp_path / "jobs.db")), {"n": 2})
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"echo": {"n": 2}}
+
+
+def test_sqlite_store_refuses_old_sqlite(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite3, "sqlite_version_info", (3, 31, 1))
+    with pytest.raises(sqlite3.NotSupportedError):
+        SQLiteJobStore(str(tmp_path / "jobs.db"))
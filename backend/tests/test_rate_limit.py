@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from utils import rate_limit
+from utils.rate_limit import MemoryBucketStore, RateLimiter, RateLimitRule
+
+
+@pytest.fixture(autouse=True)
+def fake_time(clock, monkeypatch):
+    monkeypatch.setattr(rate_limit, "time", clock)
+
+
+def take(store: MemoryBucketStore, key: str = "llm:1.2.3.4", capacity: int = 10, rate: float = 1.0, cost: int = 1):
+    return asyncio.run(store.take(key, capacity, rate, cost))
+
+
+def test_bucket_starts_full_and_empties():
+    store = MemoryBucketStore()
+    for left in range(9, -1, -1):
+        assert take(store) == (True, left)
+    allowed, tokens = take(store)
+    assert not allowed
+    assert tokens == 0
+
+
+def test_bucket_refills_at_rate_up_to_capacity(clock):
+    store = MemoryBucketStore()
+    take(store, cost=10)
+    clock.advance(2.5)
+    assert take(store, cost=3) == (False, 2.5)
+    assert take(store, cost=2) == (True, 0.5)
+    clock.advance(3600)
+    assert take(store) == (True, 9)
+
+
+def test_rejected_take_spends_nothing():
+    store = MemoryBucketStore()
+    take(store, cost=8)
+    assert take(store, cost=5) == (False, 2)
+    assert take(store, cost=2) == (True, 0)
+
+
+def test_keys_are_independent_and_evicted_lru():
+    store = MemoryBucketStore(max_keys=2)
+    take(store, key="a", cost=10)
+    take(store, key="b", cost=10)
+    take(store, key="a", cost=0)  # touch "a" so "b" is the oldest
+    take(store, key="c")
+    assert take(store, key="a") == (False, 0)
+    assert take(store, key="b") == (True, 9)
+
+
+def request(path: str, method: str = "POST", client: str = "1.2.3.4") -> Request:
+    return Request({"type": "http", "method": method, "path": path, "headers": [],
+                    "query_string": b"", "client": (client, 1234)})
+
+
+@pytest.fixture
+def limiter() -> RateLimiter:
+    return RateLimiter(MemoryBucketStore(), {
+        "llm": RateLimitRule(2),
+        "search": RateLimitRule(60),
+        "default": RateLimitRule(120)
+    })
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/analyze/full", ("llm", 3)),
+    ("/analyze_resume/", ("llm", 1)),
+    ("/analyze/batch", ("llm", 1)),
+    ("/analyze/batch/abc/stream", ("default", 1)),
+    ("/fetch_courses", ("search", 1)),
+    ("/", ("default", 1))
+])
+def test_classify(path, expected):
+    assert RateLimiter.classify(path) == expected
+
+
+def test_check_limits_per_client_and_class(limiter, clock):
+    assert asyncio.run(limiter.check(request("/analyze_resume/"))).allowed
+    assert asyncio.run(limiter.check(request("/analyze_resume/"))).allowed
+    decision = asyncio.run(limiter.check(request("/analyze_resume/")))
+    assert not decision.allowed
+    assert decision.headers()["Retry-After"] == "30"
+    assert asyncio.run(limiter.check(request("/analyze_resume/", client="5.6.7.8"))).allowed
+    assert asyncio.run(limiter.check(request("/fetch_courses"))).allowed
+    clock.advance(30)
+    assert asyncio.run(limiter.check(request("/analyze_resume/"))).allowed
+    assert limiter.stats()["limited"] == 1
+
+
+@pytest.mark.parametrize("path", ["/health", "/ready", "/metrics"])
+def test_probes_are_not_limited(limiter, path):
+    assert asyncio.run(limiter.check(request(path, method="GET"))) is None
+
+
+def test_preflight_is_not_limited(limiter):
+    assert asyncio.run(limiter.check(request("/analyze_resume/", method="OPTIONS"))) is None
@@ -0,0 +1,98 @@
+"""RedisBucketStore against fakeredis, which runs the token-bucket Lua script in a real Lua interpreter"""
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # Lua scripting in fakeredis
+
+from starlette.requests import Request
+
+from utils.rate_limit import RateLimiter, RateLimitRule, RedisBucketStore
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def with_store(scenario):
+    store = RedisBucketStore(fakeredis.FakeAsyncRedis())
+    try:
+        return await scenario(store)
+    finally:
+        await store.close()
+
+
+def test_bucket_denies_when_empty_without_spending():
+    async def scenario(store):
+        takes = [await store.take("llm:a", 3, 0.001, 1) for _ in range(3)]
+        denied = await store.take("llm:a", 3, 0.001, 1)
+        expensive = await store.take("llm:b", 3, 0.001, 5)
+        return takes, denied, expensive
+
+    takes, denied, expensive = run(with_store(scenario))
+    assert [allowed for allowed, _ in takes] == [True, True, True]
+    assert [round(tokens) for _, tokens in takes] == [2, 1, 0]
+    assert not denied[0]
+    assert denied[1] == pytest.approx(0, abs=0.01)
+    assert expensive == (False, 3.0)
+
+
+def test_bucket_refills_at_rate_up_to_capacity():
+    async def scenario(store):
+        await store.take("llm:a", 2, 20, 2)  # empty, refills one token per 50 ms
+        await asyncio.sleep(0.06)
+        refilled = await store.take("llm:a", 2, 20, 1)
+        await asyncio.sleep(0.5)
+        capped = await store.take("llm:a", 2, 20, 0)
+        return refilled, capped
+
+    refilled, capped = run(with_store(scenario))
+    assert refilled[0]
+    assert 0 <= refilled[1] < 1
+    assert capped == (True, 2.0)
+
+
+def test_bucket_key_expires_once_full():
+    async def scenario(store):
+        await store.take("llm:a", 2, 20, 1)
+        return await store.client.ttl(store.prefix + "llm:a")
+
+    assert 0 < run(with_store(scenario)) <= 2
+
+
+def request(path: str) -> Request:
+    return Request({"type": "http", "method": "POST", "path": path, "headers": [],
+                    "query_string": b"", "client": ("1.2.3.4", 1234)})
+
+
+def test_limiter_reports_retry_after_from_redis():
+    async def scenario(store):
+        limiter = RateLimiter(store, {
+            "llm": RateLimitRule(2),
+            "search": RateLimitRule(60),
+            "default": RateLimitRule(120)
+        })
+        decisions = [await limiter.check(request("/analyze_resume/")) for _ in range(3)]
+        return limiter, decisions
+
+    limiter, decisions = run(with_store(scenario))
+    assert [decision.allowed for decision in decisions] == [True, True, False]
+    assert decisions[0].headers()["X-RateLimit-Remaining"] == "1"
+    # Two per minute refills one token every 30 seconds
+    assert decisions[2].headers()["Retry-After"] == "30"
+    assert limiter.stats()["limited"] == 1
+
+
+def test_limiter_fails_open_when_redis_is_down():
+    class BrokenScript:
+        async def __call__(self, keys, args):
+            raise ConnectionError("redis unavailable")
+
+    class BrokenClient:
+        def register_script(self, script):
+            return BrokenScript()
+
+    limiter = RateLimiter(RedisBucketStore(BrokenClient()), {"llm": RateLimitRule(2)})
+    assert run(limiter.check(request("/analyze_resume/"))) is None
+    assert limiter.store_errors == 1
@@ -0,0 +1,40 @@
+import numpy as np
+
+from utils.semantic_cache import SemanticCache
+
+
+def make_cache(path) -> SemanticCache:
+    return SemanticCache(dim=64, capacity=32, threshold=0.9, ttl=3600, path=str(path))
+
+
+def test_opens_files_and_reloads_entries(tmp_path):
+    cache = make_cache(tmp_path / "cache")
+    cache.open()
+    assert cache.stats()["persistent"]
+    assert isinstance(cache.vectors, np.memmap)
+    vector = cache.vector(job_title="Data Engineer", skills=["python", "sql"])
+    cache._store("analysis", vector, "cached answer")
+    cache.close()
+
+    reopened = make_cache(tmp_path / "cache")
+    reopened.open()
+    try:
+        assert reopened.stats()["persistent"]
+        assert reopened.live_entries() == 1
+        assert reopened._lookup("analysis", vector) == "cached answer"
+    finally:
+        reopened.close()
+
+
+def test_second_owner_falls_back_to_memory(tmp_path):
+    owner = make_cache(tmp_path / "cache")
+    owner.open()
+    other = make_cache(tmp_path / "cache")
+    try:
+        other.open()
+        assert other.enabled
+        assert not other.stats()["persistent"]
+        assert other._lock_file is None
+    finally:
+        other.close()
+        owner.close()
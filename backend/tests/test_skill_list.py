@@ -0,0 +1,22 @@
+import pytest
+
+from models.schemas import MissingSkill
+from routes.analysis import format_skill_gap
+from utils.helpers import parse_skill_list
+
+
+def test_structured_names_survive_the_text_format():
+    skills = [MissingSkill(skill=name, reason="Needed for the role")
+              for name in ("scikit-learn", "CI/CD", "Node.js", "Front-end testing")]
+    text = format_skill_gap(skills)
+    assert "scikit-learn" in text
+    assert parse_skill_list(text) == ["scikit-learn", "CI/CD", "Node.js", "Front-end testing"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Missing Skills: - Docker: containers - Kubernetes: orchestration", ["Docker", "Kubernetes"]),
+    ("• Python • SQL.", ["Python", "SQL"]),
+    ("* Airflow: scheduling, e.g. DAGs\n* dbt", ["Airflow", "dbt"]),
+])
+def test_bullet_styles(text, expected):
+    assert parse_skill_list(text) == expected
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from utils.text_normalizer import StreamNormalizer, normalize_chunks, normalize_response
+
+SAMPLES = [
+    "**Python** and *SQL* are the main gaps.\n\n- **Docker**: containers\n- *Kubernetes*",
+    "1. **Senior Data Engineer** - builds *pipelines*\n   2. ML Engineer ** unmatched",
+    "a * b ** c *** d **** e",
+    "***bold italic*** then **bold *nested* bold** and *it**al*ic*",
+    "   leading and trailing   \t\n",
+    "no markup at all, just words  and   spaces",
+    "*",
+    ""
+]
+
+
+def random_chunks(text: str, rng: random.Random) -> list:
+    cuts = sorted(rng.sample(range(1, len(text)), k=min(len(text) - 1, rng.randint(0, 12)))) if len(text) > 1 else []
+    bounds = [0] + cuts + [len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def streamed(chunks: list) -> str:
+    return "".join(normalize_chunks(chunks))
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_random_chunking_matches_whole_text(text):
+    rng = random.Random(text)
+    for _ in range(200):
+        assert streamed(random_chunks(text, rng)) == normalize_response(text)
+
+
+def test_random_text_matches_whole_text():
+    rng = random.Random(7)
+    for _ in range(2000):
+        text = "".join(rng.choice("ab **  \n\t*") for _ in range(rng.randint(0, 40)))
+        assert streamed(random_chunks(text, rng)) == normalize_response(text), repr(text)
+
+
+def test_single_character_chunks():
+    text = SAMPLES[0]
+    assert streamed(list(text)) == normalize_response(text)
+
+
+def test_raw_keeps_the_original_chunks():
+    normalizer = StreamNormalizer()
+    for chunk in ("**Py", "thon**", " rocks"):
+        normalizer.feed(chunk)
+    normalizer.finish()
+    assert "".join(normalizer.raw) == "**Python** rocks"
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """In-process LRU cache with a per-entry time-to-live and a hard size cap"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any):
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCache:
+    """On-disk JSON cache that survives restarts; entries expire after ttl seconds"""
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + self.ttl)
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ResultCache:
+    """Two-tier result cache: in-process LRU/TTL in front of an optional SQLite tier"""
+
+    def __init__(self, max_size: int, ttl: float, db_path: Optional[str] = None):
+        self.memory = TTLCache(max_size, ttl)
+        self.disk = None
+        if db_path:
+            try:
+                self.disk = SQLiteCache(db_path, ttl)
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache disabled, could not open {db_path}: {str(e)}")
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = await asyncio.to_thread(self.disk.get, key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, value)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, value)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self.memory),
+            "disk_enabled": self.disk is not None
+        }
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one in-flight task shared by every caller"""
+
+    def __init__(self):
+        self._inflight: "dict[str, asyncio.Task]" = {}
+        self.calls = 0
+        self.deduplicated = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: str, fn):
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.deduplicated += 1
+        # Shield so one caller disconnecting does not cancel the call for everyone else
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark as retrieved even if every waiter went away
+
+    def stats(self) -> dict:
+        return {
+            "upstream_calls": self.calls,
+            "deduplicated": self.deduplicated,
+            "in_flight": len(self._inflight)
+        }
+
+
+class StaleWhileRevalidateCache:
+    """Bounded response cache that serves stale entries while refreshing them in the background.
+
+    Misses and refreshes for the same key go through a SingleFlight, so N concurrent
+    requests for one key trigger a single upstream fetch.
+    """
+
+    def __init__(self, max_size: int, ttl: float, stale_ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.flight = SingleFlight()
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._refreshing = set()  # strong references so background refreshes are not garbage collected
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def get_or_fetch(self, key: str, fetch, cacheable=lambda value: True) -> tuple:
+        """Return (value, status, age_seconds) where status is HIT, STALE or MISS"""
+        entry = self._data.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age < self.ttl:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return value, "HIT", age
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._data.move_to_end(key)
+                self._revalidate(key, fetch, cacheable)
+                return value, "STALE", age
+            del self._data[key]
+
+        self.misses += 1
+        value = await self.flight.do(key, lambda: self._fetch_and_store(key, fetch, cacheable))
+        return value, "MISS", 0.0
+
+    async def _fetch_and_store(self, key: str, fetch, cacheable):
+        value = await fetch()
+        if cacheable(value):
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+        return value
+
+    def _revalidate(self, key: str, fetch, cacheable):
+        if key in self.flight:
+            return
+
+        async def refresh():
+            try:
+                await self.flight.do(key, lambda: self._fetch_and_store(key, fetch, cacheable))
+            except Exception as e:
+                logger.warning(f"Background refresh failed for {key}: {str(e)}")
+
+        task = asyncio.ensure_future(refresh())
+        self._refreshing.add(task)
+        task.add_done_callback(self._refreshing.discard)
+
+    def cache_headers(self, status: str, age: float) -> dict:
+        """HTTP headers describing how fresh a served value is"""
+        return {
+            "X-Cache": status,
+            "Age": str(int(age)),
+            "Cache-Control": f"public, max-age={max(int(self.ttl - age), 0)}, stale-while-revalidate={int(self.stale_ttl)}"
+        }
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "entries": len(self._data),
+            **self.flight.stats()
+        }
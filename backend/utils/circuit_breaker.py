@@ -0,0 +1,218 @@
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from config.settings import (
+    GEMINI_DAILY_QUOTA,
+    GEMINI_MINUTE_QUOTA,
+    CUSTOM_SEARCH_DAILY_QUOTA,
+    CUSTOM_SEARCH_MINUTE_QUOTA,
+    YOUTUBE_DAILY_QUOTA,
+    YOUTUBE_MINUTE_QUOTA,
+    CIRCUIT_BASE_BACKOFF,
+    CIRCUIT_MAX_BACKOFF,
+    QUOTA_RESET_TIMEZONE
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    _reset_tz = ZoneInfo(QUOTA_RESET_TIMEZONE)
+except ZoneInfoNotFoundError:
+    _reset_tz = None  # no tz database; fall back to UTC midnight
+
+# Seconds Google asks us to wait, e.g. "retryDelay": "37s" in Gemini 429 bodies
+_RETRY_DELAY = re.compile(r'"retryDelay":\s*"(\d+)s"')
+
+
+def seconds_until_daily_reset() -> float:
+    now = datetime.now(_reset_tz or timezone.utc)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight - now).total_seconds()
+
+
+def _quota_day() -> str:
+    now = datetime.now(_reset_tz or timezone.utc)
+    return now.date().isoformat()
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream that is out of quota or backing off"""
+
+    def __init__(self, upstream: str, reason: str, retry_after: float):
+        super().__init__(f"{upstream} circuit open ({reason}), retry in {int(retry_after)}s")
+        self.upstream = upstream
+        self.reason = reason  # "quota" or "busy"
+        self.retry_after = retry_after
+
+
+class UpstreamGuard:
+    """Quota budget plus circuit breaker for one upstream API.
+
+    ``acquire`` spends budget before a call and raises CircuitOpenError without any
+    network I/O once the daily or per-minute budget is gone or the circuit is open.
+    A 429/quota error or a 503 opens the circuit with exponential back-off; after the
+    back-off a single probe call is let through, and its outcome closes or re-opens it.
+    Only a failure while closed or a failed probe opens it: calls that were already in
+    flight when it opened report the same outage and are ignored, so a burst of them
+    neither stretches the back-off nor counts as several trips.
+    """
+
+    PROBE_TIMEOUT = 60  # a probe that never reports back stops blocking others after this
+    TRANSPORT_ERROR_THRESHOLD = 3  # connection errors in a row before they count as an outage
+
+    def __init__(self, name: str, daily_limit: int = 0, minute_limit: int = 0,
+                 base_backoff: float = CIRCUIT_BASE_BACKOFF, max_backoff: float = CIRCUIT_MAX_BACKOFF):
+        self.name = name
+        self.daily_limit = daily_limit
+        self.minute_limit = minute_limit
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.day = _quota_day()
+        self.day_used = 0
+        self.minute = int(time.time() // 60)
+        self.minute_used = 0
+        self.open_until = 0.0
+        self.opened_at = 0.0
+        self.open_reason = ""
+        self.consecutive_failures = 0
+        self.transport_errors = 0
+        self.probe_started = 0.0
+        self.calls = 0
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self.open_until == 0:
+            return "closed"
+        return "open" if time.monotonic() < self.open_until else "half_open"
+
+    def _roll_windows(self):
+        day = _quota_day()
+        if day != self.day:
+            self.day, self.day_used = day, 0
+        minute = int(time.time() // 60)
+        if minute != self.minute:
+            self.minute, self.minute_used = minute, 0
+
+    def _reject(self, reason: str, retry_after: float):
+        self.rejected += 1
+        raise CircuitOpenError(self.name, reason, retry_after)
+
+    def acquire(self, cost: int = 1) -> float:
+        """Reserve budget for one upstream call or raise CircuitOpenError.
+
+        Returns the call's start time, to pass back to ``record_failure``.
+        """
+        now = time.monotonic()
+        state = self.state
+        if state == "open":
+            self._reject(self.open_reason, self.open_until - now)
+        if state == "half_open" and now - self.probe_started < self.PROBE_TIMEOUT:
+            self._reject(self.open_reason, 1)
+
+        self._roll_windows()
+        if self.daily_limit and self.day_used + cost > self.daily_limit:
+            self._reject("quota", seconds_until_daily_reset())
+        if self.minute_limit and self.minute_used + cost > self.minute_limit:
+            self._reject("quota", 60 - time.time() % 60)
+        if state == "half_open":
+            self.probe_started = now
+        self.day_used += cost
+        self.minute_used += cost
+        self.calls += 1
+        return now
+
+    def record_success(self):
+        if self.open_until:
+            logger.info(f"{self.name} circuit closed")
+        self.open_until = 0.0
+        self.open_reason = ""
+        self.consecutive_failures = 0
+        self.transport_errors = 0
+        self.probe_started = 0.0
+
+    def release(self, started: float):
+        """Call when a call ends, however it ends; a half-open probe that never reported
+        back (cancelled by a caller's deadline) frees the slot for the next call"""
+        if started == self.probe_started:
+            self.probe_started = 0.0
+
+    def record_transport_error(self, started: Optional[float] = None):
+        """Feed back a connection error or timeout; only a run of them is treated as a 503.
+
+        A single reset connection is usually the pool or the network, not Gemini being down.
+        """
+        self.transport_errors += 1
+        if self.transport_errors >= self.TRANSPORT_ERROR_THRESHOLD:
+            self.record_failure(503, "transport errors", started)
+        elif started is not None and started == self.probe_started:
+            self.probe_started = 0.0  # let the next call probe instead
+
+    def record_failure(self, status_code: int, detail: str = "", started: Optional[float] = None):
+        """Feed back an upstream error; quota errors and 503s open the circuit.
+
+        ``started`` is what ``acquire`` returned; failures from calls that began before
+        the circuit last opened are ignored.
+        """
+        if started is not None and started < self.opened_at:
+            return
+        state = self.state
+        if state == "open":
+            return
+        lowered = detail.lower()
+        if status_code == 429 or "quota" in lowered or "ratelimitexceeded" in lowered:
+            reason = "quota"
+        elif status_code == 503:
+            reason = "busy"
+        else:
+            # Other errors say nothing about upstream health; let the probe (if any) go again
+            self.probe_started = 0.0
+            return
+
+        # Back-off doubles each time the probe fails; a failure while closed starts over at the base
+        self.consecutive_failures = self.consecutive_failures + 1 if state == "half_open" else 1
+        backoff = min(self.base_backoff * 2 ** (self.consecutive_failures - 1), self.max_backoff)
+        retry_delay = _RETRY_DELAY.search(detail)
+        if retry_delay:
+            backoff = max(backoff, float(retry_delay.group(1)))
+        if reason == "quota" and "perday" in lowered.replace(" ", ""):
+            # Daily quota is gone; nothing will succeed before the reset
+            backoff = seconds_until_daily_reset()
+            self.day_used = max(self.day_used, self.daily_limit)
+
+        self.opened_at = time.monotonic()
+        self.open_until = self.opened_at + backoff
+        self.open_reason = reason
+        self.probe_started = 0.0
+        self.trips += 1
+        logger.warning(f"{self.name} circuit opened ({reason}) for {int(backoff)}s after status {status_code}")
+
+    def stats(self) -> dict:
+        self._roll_windows()
+        state = self.state
+        return {
+            "state": state,
+            "reason": self.open_reason or None,
+            "retry_after": max(int(self.open_until - time.monotonic()), 0) if state == "open" else 0,
+            "daily_used": self.day_used,
+            "daily_limit": self.daily_limit or None,
+            "minute_used": self.minute_used,
+            "minute_limit": self.minute_limit or None,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "trips": self.trips
+        }
+
+
+gemini_guard = UpstreamGuard("gemini", GEMINI_DAILY_QUOTA, GEMINI_MINUTE_QUOTA)
+custom_search_guard = UpstreamGuard("custom_search", CUSTOM_SEARCH_DAILY_QUOTA, CUSTOM_SEARCH_MINUTE_QUOTA)
+youtube_guard = UpstreamGuard("youtube", YOUTUBE_DAILY_QUOTA, YOUTUBE_MINUTE_QUOTA)
+
+
+def upstream_stats() -> dict:
+    return {guard.name: guard.stats() for guard in (gemini_guard, custom_search_guard, youtube_guard)}
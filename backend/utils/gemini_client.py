@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import AsyncIterator, Optional, Type
+
+from pydantic import BaseModel
+
+from config.settings import (
+    GEMINI_API_KEY,
+    GEMINI_API_BASE,
+    GEMINI_MODEL,
+    GEMINI_TIMEOUT,
+    GEMINI_CONNECT_TIMEOUT,
+    GEMINI_MAX_CONCURRENCY,
+    GEMINI_MAX_CONNECTIONS,
+    GEMINI_MAX_KEEPALIVE
+)
+from utils.cache import SingleFlight
+from utils.circuit_breaker import CircuitOpenError, gemini_guard
+from utils.lazy import lazy_module
+from utils.metrics import record_upstream, upstream_requests
+
+logger = logging.getLogger(__name__)
+
+httpx = lazy_module("httpx")
+
+
+@dataclass(frozen=True)
+class GeminiResult:
+    """Outcome of one Gemini call: the first candidate's text on success, the raw error body otherwise"""
+    status_code: int
+    text: Optional[str] = None
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200
+
+
+class GeminiStreamError(Exception):
+    def __init__(self, result: GeminiResult):
+        super().__init__(f"Gemini stream failed with status {result.status_code}")
+        self.result = result
+
+
+def _candidate_text(payload: dict) -> Optional[str]:
+    candidates = payload.get("candidates") or []
+    if not candidates:
+        return None
+    parts = candidates[0].get("content", {}).get("parts") or []
+    return "".join(part.get("text", "") for part in parts)
+
+
+@lru_cache(maxsize=None)
+def response_schema(model: Type[BaseModel]) -> dict:
+    """Gemini responseSchema (an OpenAPI subset) for a Pydantic model: refs inlined, unsupported keys dropped"""
+    schema = model.model_json_schema()
+    defs = schema.get("$defs", {})
+
+    def convert(node: dict) -> dict:
+        if "$ref" in node:
+            node = defs[node["$ref"].rsplit("/", 1)[-1]]
+        converted = {}
+        for key, value in node.items():
+            if key == "type":
+                converted["type"] = value.upper()
+            elif key == "properties":
+                converted["properties"] = {name: convert(prop) for name, prop in value.items()}
+                # Keep fields in model order; Gemini otherwise sorts them alphabetically
+                converted["propertyOrdering"] = list(value)
+            elif key == "items":
+                converted["items"] = convert(value)
+            elif key in ("description", "enum", "required"):
+                converted[key] = value
+        return converted
+
+    return convert(schema)
+
+
+def _request_body(prompt_text: str, schema: Optional[dict]) -> dict:
+    payload = {"contents": [{"parts": [{"text": prompt_text}]}]}
+    if schema is not None:
+        payload["generationConfig"] = {"responseMimeType": "application/json", "responseSchema": schema}
+    return payload
+
+
+def _circuit_result(error: CircuitOpenError) -> GeminiResult:
+    """Stand-in result for a call the circuit breaker refused, worded so routes map it like the real error"""
+    if error.reason == "quota":
+        return GeminiResult(status_code=429, error=f"Quota exhausted: {error}")
+    return GeminiResult(status_code=503, error=f"Service unavailable: {error}")
+
+
+# One pooled client per worker process, created on first use so it binds to the running event loop
+_client: Optional[httpx.AsyncClient] = None
+_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+# Identical in-flight prompts share one upstream call
+_flight = SingleFlight()
+# Callers waiting on Gemini in this process, so shutdown can let them finish
+_active = 0
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared Gemini HTTP client (keep-alive pool, HTTP/2)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=GEMINI_API_BASE,
+            http2=True,
+            # Key goes in a header so it never shows up in httpx's request logs
+            headers={"Content-Type": "application/json", "x-goog-api-key": GEMINI_API_KEY or ""},
+            timeout=httpx.Timeout(GEMINI_TIMEOUT, connect=GEMINI_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=GEMINI_MAX_CONNECTIONS,
+                max_keepalive_connections=GEMINI_MAX_KEEPALIVE
+            )
+        )
+    return _client
+
+
+async def close_client():
+    """Close the shared client and release pooled connections"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def warm_up():
+    """Open the pooled connection (TLS and HTTP/2 setup) before the first real call needs it"""
+    try:
+        # Model metadata: authenticated like a real call but costs no generation quota
+        await get_client().get(f"/models/{GEMINI_MODEL}")
+    except httpx.HTTPError as e:
+        logger.warning(f"Gemini connection warm-up failed: {str(e)}")
+
+
+async def drain(timeout: float) -> int:
+    """Wait up to ``timeout`` seconds for in-flight Gemini calls to finish; returns how many are left"""
+    deadline = time.monotonic() + timeout
+    while _active and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    return _active
+
+
+async def generate_content(prompt_text: str, dedupe_key: Optional[str] = None,
+                           schema: Optional[dict] = None) -> GeminiResult:
+    """Send a single-turn prompt to Gemini generateContent without blocking the event loop.
+
+    Concurrent calls with the same ``dedupe_key`` are merged into one upstream request
+    and every caller gets its result. With a ``schema`` (see ``response_schema``) Gemini
+    answers in JSON that matches it.
+    """
+    global _active
+    _active += 1
+    try:
+        if dedupe_key is None:
+            return await _generate_content(prompt_text, schema)
+        return await _flight.do(dedupe_key, lambda: _generate_content(prompt_text, schema))
+    finally:
+        _active -= 1
+
+
+def coalescing_stats() -> dict:
+    return _flight.stats()
+
+
+async def _generate_content(prompt_text: str, schema: Optional[dict] = None) -> GeminiResult:
+    payload = _request_body(prompt_text, schema)
+
+    # Fail fast without any network I/O while out of quota or backing off
+    try:
+        started = gemini_guard.acquire()
+    except CircuitOpenError as e:
+        upstream_requests.inc("gemini", "circuit_open")
+        return _circuit_result(e)
+
+    # Cap in-flight upstream calls per worker; excess callers wait here instead of piling onto the pool
+    try:
+        async with _semaphore:
+            start = time.perf_counter()
+            try:
+                response = await get_client().post(f"/models/{GEMINI_MODEL}:generateContent", json=payload)
+            except httpx.TransportError:
+                record_upstream("gemini", "generate", "transport_error", time.perf_counter() - start)
+                gemini_guard.record_transport_error(started)
+                raise
+            record_upstream("gemini", "generate", response.status_code, time.perf_counter() - start)
+    finally:
+        # A cancelled probe must not hold the circuit half-open
+        gemini_guard.release(started)
+
+    if response.status_code != 200:
+        gemini_guard.record_failure(response.status_code, response.text, started)
+        return GeminiResult(status_code=response.status_code, error=response.text)
+    gemini_guard.record_success()
+    return GeminiResult(status_code=200, text=_candidate_text(response.json()))
+
+
+async def stream_generate_content(prompt_text: str, schema: Optional[dict] = None) -> AsyncIterator[str]:
+    """Yield text chunks from Gemini streamGenerateContent (SSE) as they arrive.
+
+    Raises GeminiStreamError with the error body if the call is rejected up front.
+    """
+    global _active
+    payload = _request_body(prompt_text, schema)
+
+    try:
+        started = gemini_guard.acquire()
+    except CircuitOpenError as e:
+        upstream_requests.inc("gemini", "circuit_open")
+        raise GeminiStreamError(_circuit_result(e))
+
+    _active += 1
+    try:
+        async with _semaphore:
+            start = time.perf_counter()
+            try:
+                async with get_client().stream(
+                    "POST",
+                    f"/models/{GEMINI_MODEL}:streamGenerateContent",
+                    params={"alt": "sse"},
+                    json=payload
+                ) as response:
+                    # Time to response headers; the body streams for as long as Gemini keeps writing
+                    record_upstream("gemini", "stream", response.status_code, time.perf_counter() - start)
+                    if response.status_code != 200:
+                        await response.aread()
+                        gemini_guard.record_failure(response.status_code, response.text, started)
+                        raise GeminiStreamError(GeminiResult(status_code=response.status_code, error=response.text))
+                    gemini_guard.record_success()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        text = _candidate_text(json.loads(line[5:]))
+                        if text:
+                            yield text
+            except httpx.TransportError:
+                record_upstream("gemini", "stream", "transport_error", time.perf_counter() - start)
+                gemini_guard.record_transport_error(started)
+                raise
+    finally:
+        _active -= 1
+        gemini_guard.release(started)
@@ -1,43 +1,158 @@
 import re
-import fitz
+import mmap
 import logging
-from fastapi import HTTPException
-from typing import List
+import orjson
+from pydantic import BaseModel, ValidationError
+from typing import List, Optional, Tuple, Type, TypeVar
+
+from utils.lazy import lazy_module
+
+# Imported on first extraction; the app only needs it in PDF workers (or the fallback thread)
+fitz = lazy_module("fitz")
 
 logger = logging.getLogger(__name__)
 
+Model = TypeVar("Model", bound=BaseModel)
+
+# Resume text budget: only the first pages matter and prompts take at most this many chars
+PDF_MAX_PAGES = 3
+PDF_TEXT_BUDGET = 4000
+
 # Enhanced PDF text extraction
-def extract_text_from_pdf(file_content):
+def read_pdf(file_content) -> Tuple[str, int]:
+    """Extract up to PDF_TEXT_BUDGET chars of whitespace-normalized text, page by page, plus the page count; raises on bad input.
+
+    Pages are normalized as they are read and extraction stops as soon as the budget
+    is filled, so later pages of a dense resume are never decoded.
+    """
+    with fitz.open(stream=file_content, filetype="pdf") as pdf:
+        parts = []
+        length = 0
+        for page_num in range(min(pdf.page_count, PDF_MAX_PAGES)):
+            page = pdf.load_page(page_num)
+            # Scanned pages reference no fonts, so there is no text layer worth building
+            if not page.get_fonts():
+                continue
+            words = page.get_text("text", flags=fitz.TEXT_MEDIABOX_CLIP).split()
+            if not words:
+                continue
+            page_text = " ".join(words)
+            parts.append(page_text)
+            length += len(page_text) + 1
+            if length >= PDF_TEXT_BUDGET:
+                break
+        
+        return " ".join(parts)[:PDF_TEXT_BUDGET], pdf.page_count
+
+def extract_pdf_text(file_content) -> str:
+    return read_pdf(file_content)[0]
+
+def read_pdf_file(path: str) -> Tuple[str, int]:
+    """read_pdf on a spooled PDF through a read-only mmap, so its bytes are never copied into Python"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            return read_pdf(view)
+        finally:
+            view.release()
+
+def extract_pdf_file(path: str) -> str:
+    return read_pdf_file(path)[0]
+
+def parse_json_model(text: Optional[str], model: Type[Model]) -> Optional[Model]:
+    """Validate a JSON-mode Gemini answer against ``model``; None when it is not JSON of that shape"""
+    if not text:
+        return None
     try:
-        with fitz.open(stream=file_content, filetype="pdf") as pdf:
-            text_parts = []
-            for page_num, page in enumerate(pdf):
-                if page_num >= 3:  # Limit to first 3 pages
-                    break
-                page_text = page.get_text("text")
-                if page_text.strip():
-                    text_parts.append(page_text)
-            
-            full_text = "\n".join(text_parts)
-            # Clean up the text
-            full_text = re.sub(r'\n+', '\n', full_text)
-            full_text = re.sub(r'\s+', ' ', full_text)
-            
-            return full_text[:4000]  # Increased limit for better analysis
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing PDF: {str(e)}")
-
-def clean_gemini_response(text):
-    """Clean and format Gemini API response"""
-    # Remove markdown formatting
-    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-    text = re.sub(r'\*([^*]+)\*', r'\1', text)
+        return model.model_validate(orjson.loads(text))
+    except (orjson.JSONDecodeError, ValidationError):
+        return None
+
+# Common abbreviations and spellings folded together when normalizing job titles
+JOB_TITLE_SYNONYMS = {
+    "sr": "senior",
+    "snr": "senior",
+    "jr": "junior",
+    "jnr": "junior",
+    "mgr": "manager",
+    "eng": "engineer",
+    "engr": "engineer",
+    "dev": "developer",
+    "devs": "developer",
+    "swe": "software engineer",
+    "sde": "software engineer",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "ui/ux": "ux",
+    "front-end": "frontend",
+    "back-end": "backend",
+    "full-stack": "fullstack",
+    "fullstack": "full stack",
+    "frontend": "front end",
+    "backend": "back end",
+    "qa": "quality assurance",
+    "pm": "product manager",
+}
+
+_BULLET_RE = re.compile(r'(?:^|\s)[•*-]\s+')
+
+def parse_skill_list(text: str) -> List[str]:
+    """Split a skill-gap bullet list into skill names, mirroring parseSkillsResponse in the frontend"""
+    if not text or not isinstance(text, str):
+        return []
+    
+    cleaned = re.sub(r'Missing Skills:', '', text, count=1, flags=re.IGNORECASE)
+    cleaned = re.sub(r'^\s*\n', '', cleaned).strip()
+    
+    skills = []
+    if any(marker in cleaned for marker in ("•", "*", "-")):
+        # Only a marker standing alone starts a bullet, so "scikit-learn" stays one skill
+        for part in _BULLET_RE.split(cleaned):
+            skill = part.strip().split(": ", 1)[0]
+            skill = re.sub(r'\.$', '', skill).strip()
+            if skill:
+                skills.append(skill)
     
-    # Clean up extra whitespace
-    text = re.sub(r'\n+', '\n', text)
-    text = re.sub(r'\s+', ' ', text)
+    if not skills:
+        for part in re.split(r'[.\n]', cleaned):
+            part = part.strip()
+            if 0 < len(part) < 100:
+                match = re.match(r'^([^(:]+)', part)
+                skill = match.group(1).strip() if match else part
+                if skill:
+                    skills.append(skill)
     
-    return text.strip()
+    if not skills:
+        skills = [re.sub(r'^-\s*', '', line).strip() for line in cleaned.split("\n") if line.strip()]
+    
+    return skills
+
+def canonical_skills(skills: List[str]) -> List[str]:
+    """De-duplicate skills case-insensitively and sort them, so reordered lists compare equal"""
+    seen = {}
+    for skill in skills:
+        cleaned = " ".join(str(skill).split())
+        if cleaned:
+            seen.setdefault(cleaned.casefold(), cleaned)
+    return [seen[key] for key in sorted(seen)]
+
+def text_excerpt(text: str, limit: int) -> str:
+    """First ``limit`` chars of ``text``, cut back to a word boundary"""
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + " ..."
+
+def normalize_job_title(job_title: str) -> str:
+    """Case-fold, collapse whitespace and merge common synonyms so equivalent titles share cache entries"""
+    words = []
+    for word in job_title.casefold().replace(",", " ").split():
+        word = word.strip(".")
+        # Follow chains like "full-stack" -> "fullstack" -> "full stack"
+        while word in JOB_TITLE_SYNONYMS:
+            word = JOB_TITLE_SYNONYMS[word]
+        if word:
+            words.append(word)
+    return " ".join(" ".join(words).split())
 
 def get_fallback_courses(job_title: str) -> List[dict]:
     """Provide curated fallback courses based on job title"""
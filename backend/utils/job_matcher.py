@@ -0,0 +1,167 @@
+"""Rank every role in the catalog against a candidate's skills with vectorized NumPy passes."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.helpers import normalize_job_title
+from utils.lazy import lazy_module
+from utils.skill_gap_engine import SENIORITY_WORDS, RoleIndex, get_role_index
+
+np = lazy_module("numpy")
+
+logger = logging.getLogger(__name__)
+
+TITLE_WEIGHT = 0.15  # share of the score that comes from the requested job title
+
+
+@dataclass(frozen=True)
+class RoleMatch:
+    role: str
+    score: float  # 0-1 ranking score: skill cosine blended with job-title affinity
+    coverage: float  # share of the role's weighted requirements the resume covers
+    matched: List[str]
+    missing: List[Tuple[List[str], int]]  # (skill and its alternatives, weight), most important first
+    adjacent: List[str]  # catalog roles whose requirements overlap this one the most
+
+
+def _top(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores, best first, without sorting the whole array"""
+    best = np.argpartition(-scores, k)[:k] if k < len(scores) else np.arange(len(scores))
+    return best[np.argsort(-scores[best], kind="stable")]
+
+
+class RoleMatcher:
+    """TF-IDF cosine between a candidate and each role, computed over the role index's CSR arrays.
+
+    Every requirement group of role ``r`` contributes one entry per alternative skill,
+    worth ``weight / len(alternatives) * idf(skill)``; skills most roles ask for (Git,
+    SQL) count for less than distinctive ones. Entries of a role are contiguous, so
+    scoring any number of candidates against all roles is a gather and one
+    ``np.add.reduceat`` per candidate matrix, linear in catalog size.
+    """
+
+    def __init__(self, index: RoleIndex):
+        self.index = index
+        role_offsets = np.array(index.role_offsets, dtype=np.intp)
+        group_offsets = np.array(index.group_offsets, dtype=np.intp)
+        self.entry_skills = np.array(index.group_skills, dtype=np.intp)
+        group_sizes = np.diff(group_offsets)
+        entry_groups = np.repeat(np.arange(len(group_sizes)), group_sizes)
+        entry_roles = np.repeat(np.arange(len(index.roles)), np.diff(group_offsets[role_offsets]))
+
+        # Document frequency: how many roles mention each skill at all
+        pairs = np.unique(entry_roles * len(index.skills) + self.entry_skills)
+        df = np.bincount(pairs % len(index.skills), minlength=len(index.skills))
+        self.idf = (np.log((1 + len(index.roles)) / (1 + df)) + 1).astype(np.float32)
+
+        weights = np.array(index.group_weights, dtype=np.float32)
+        self.entry_values = weights[entry_groups] / group_sizes[entry_groups] * self.idf[self.entry_skills]
+        self.role_starts = group_offsets[role_offsets[:-1]]
+        self.role_ends = group_offsets[role_offsets[1:]]
+        self.has_entries = self.role_ends > self.role_starts
+        self.role_norms = np.sqrt(self._per_role(self.entry_values ** 2))
+
+        # Word -> ids of the titles and aliases using it; a title id maps to its role and word count
+        self.title_roles, self.title_sizes = [], []
+        self.title_words: Dict[str, List[int]] = {}
+        for title, role_id in index.titles.items():
+            words = set(title.split())
+            for word in words:
+                self.title_words.setdefault(word, []).append(len(self.title_roles))
+            self.title_roles.append(role_id)
+            self.title_sizes.append(len(words))
+
+    def _per_role(self, values: np.ndarray) -> np.ndarray:
+        """Sum entry values (last axis) per role; roles without requirements get 0"""
+        # A trailing zero keeps every start a valid index, even for empty roles at the end
+        padded = np.concatenate([values, np.zeros(values.shape[:-1] + (1,), dtype=values.dtype)], axis=-1)
+        return np.where(self.has_entries, np.add.reduceat(padded, self.role_starts, axis=-1), 0)
+
+    def skill_vector(self, skills: Iterable[str]) -> np.ndarray:
+        """IDF-weighted candidate vector; implied skills (PostgreSQL -> SQL) are switched on too"""
+        vector = np.zeros(len(self.index.skills), dtype=np.float32)
+        for skill in skills:
+            if skill in self.index.skill_ids:
+                vector[self.index.skill_ids[skill]] = 1
+            vector[self.index.implies.get(skill, [])] = 1
+        return vector * self.idf
+
+    def cosine(self, vectors: np.ndarray) -> np.ndarray:
+        """Cosine of each candidate row against every role: (candidates, skills) -> (candidates, roles)"""
+        dots = self._per_role(vectors[:, self.entry_skills] * self.entry_values)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True) * self.role_norms
+        return np.divide(dots, norms, out=np.zeros_like(dots, dtype=np.float32), where=norms > 0)
+
+    def title_affinity(self, job_title: str) -> np.ndarray:
+        """1 for the role the title resolves to, otherwise the best word overlap with any of a role's titles"""
+        affinity = np.zeros(len(self.index.roles), dtype=np.float32)
+        key = normalize_job_title(job_title)
+        words = {word for word in key.split() if word not in SENIORITY_WORDS}
+        # Only titles sharing a word can score, so walk those instead of the whole catalog
+        shared: Dict[int, int] = {}
+        for word in words:
+            for title_id in self.title_words.get(word, ()):
+                shared[title_id] = shared.get(title_id, 0) + 1
+        for title_id, count in shared.items():
+            role_id = self.title_roles[title_id]
+            overlap = count / (len(words) + self.title_sizes[title_id] - count)
+            affinity[role_id] = max(affinity[role_id], overlap)
+        # Exact title or alias, with or without seniority words; fuzzy matches are already covered above
+        stripped = " ".join(word for word in key.split() if word in words)
+        for title in (key, stripped):
+            if title in self.index.titles:
+                affinity[self.index.titles[title]] = 1.0
+                break
+        return affinity
+
+    def adjacent_roles(self, role_ids: Sequence[int], limit: int = 2) -> List[List[str]]:
+        """For each role, the other roles whose requirement vectors are closest to its own"""
+        vectors = np.zeros((len(role_ids), len(self.index.skills)), dtype=np.float32)
+        for row, role_id in enumerate(role_ids):
+            entries = slice(self.role_starts[role_id], self.role_ends[role_id])
+            np.add.at(vectors[row], self.entry_skills[entries], self.entry_values[entries])
+        similarity = self.cosine(vectors)
+        adjacent = []
+        for row, role_id in enumerate(role_ids):
+            similarity[row, role_id] = -1
+            adjacent.append([self.index.roles[i] for i in _top(similarity[row], limit) if similarity[row, i] > 0])
+        return adjacent
+
+    def rank(self, skill_sets: Sequence[Iterable[str]], job_title: str = "") -> np.ndarray:
+        """Scores of every role for each candidate, shape (candidates, roles)"""
+        vectors = np.stack([self.skill_vector(skills) for skills in skill_sets])
+        scores = self.cosine(vectors)
+        if job_title:
+            scores = (1 - TITLE_WEIGHT) * scores + TITLE_WEIGHT * self.title_affinity(job_title)
+        return scores
+
+    def top_matches(self, skills: Iterable[str], job_title: str = "", k: int = 5,
+                    resume_skills: Optional[Iterable[str]] = None) -> List[RoleMatch]:
+        """Best ``k`` roles for one candidate, with what the resume covers and lacks for each.
+
+        ``skills`` drive the ranking; the breakdown is against ``resume_skills`` when given,
+        so skills a client merely asks about are not reported as already held.
+        """
+        skills = list(skills)
+        scores = self.rank([skills], job_title)[0]
+        present = list(resume_skills) if resume_skills is not None else skills
+        top = [int(role_id) for role_id in _top(scores, k) if scores[role_id] > 0]
+        matches = []
+        for role_id, adjacent in zip(top, self.adjacent_roles(top) if top else []):
+            gap = self.index.skill_gap(role_id, present)
+            matches.append(RoleMatch(gap.role, round(float(scores[role_id]), 4), gap.coverage, gap.matched,
+                                     gap.missing, adjacent))
+        return matches
+
+
+_matcher: Optional[RoleMatcher] = None
+
+
+def get_role_matcher() -> RoleMatcher:
+    """Return the shared matcher, built from the role index on first use"""
+    global _matcher
+    if _matcher is None:
+        _matcher = RoleMatcher(get_role_index())
+    return _matcher
@@ -0,0 +1,377 @@
+import asyncio
+import itertools
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+from config.settings import (
+    JOB_QUEUE_BACKEND,
+    JOB_QUEUE_DB,
+    JOB_WORKERS,
+    JOB_MAX_QUEUED_PER_LANE,
+    JOB_POLL_INTERVAL,
+    JOB_RESULT_TTL,
+    JOB_STALE_AFTER,
+    PDF_RETRY_AFTER
+)
+
+logger = logging.getLogger(__name__)
+
+# Lower value is served first; interactive users go in "high", scripted bulk work in "low"
+LANES = {"high": 0, "normal": 1, "low": 2}
+
+FINISHED = ("succeeded", "failed")
+# Work run outside the queue (batches) but recorded in the store so every worker can read it; never claimed
+IN_PROGRESS = "in_progress"
+
+
+class SQLiteJobStore:
+    """Persistent job table; claiming is a single UPDATE, so several processes can share one file"""
+
+    MIN_SQLITE_VERSION = (3, 35, 0)  # UPDATE ... RETURNING
+
+    def __init__(self, path: str):
+        if sqlite3.sqlite_version_info < self.MIN_SQLITE_VERSION:
+            raise sqlite3.NotSupportedError(
+                f"SQLite {sqlite3.sqlite_version} is too old for the job store, it needs 3.35 or newer"
+            )
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, priority INTEGER NOT NULL, status TEXT NOT NULL, "
+            "payload TEXT NOT NULL, result TEXT, error TEXT, status_code INTEGER, "
+            "created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority, created_at)")
+
+    def _row(self, row) -> Optional[dict]:
+        if row is None:
+            return None
+        keys = ("id", "kind", "priority", "status", "payload", "result", "error", "status_code",
+                "created_at", "started_at", "finished_at")
+        job = dict(zip(keys, row))
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def enqueue(self, job_id: str, kind: str, priority: int, payload: dict):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, priority, status, payload, created_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, kind, priority, json.dumps(payload), time.time())
+            )
+
+    def claim(self) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ("
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY priority, created_at LIMIT 1"
+                ") AND status = 'queued' RETURNING *",
+                (time.time(),)
+            ).fetchone()
+        return self._row(row)
+
+    def finish(self, job_id: str, status: str, result: Optional[dict] = None,
+               error: Optional[str] = None, status_code: Optional[int] = None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, status_code = ?, finished_at = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, status_code, time.time(), job_id)
+            )
+
+    def save(self, job_id: str, kind: str, status: str, result: dict):
+        """Create or update a record of work run outside the queue"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, priority, status, payload, result, created_at, started_at, finished_at) "
+                "VALUES (?, ?, ?, ?, '{}', ?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET "
+                "status = excluded.status, result = excluded.result, finished_at = excluded.finished_at",
+                (job_id, kind, LANES["normal"], status, json.dumps(result), now, now,
+                 now if status in FINISHED else None)
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row(row)
+
+    def queued(self, priority: int) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND priority = ?", (priority,)
+            ).fetchone()[0]
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def recover(self, stale_after: float) -> int:
+        """Requeue jobs left running by a process that died; returns how many"""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running' AND started_at < ?",
+                (time.time() - stale_after,)
+            ).rowcount
+
+    def prune(self, ttl: float) -> int:
+        """Drop finished jobs older than ttl; returns how many"""
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM jobs WHERE (status IN ('succeeded', 'failed') AND finished_at < ?) "
+                "OR (status = ? AND created_at < ?)",
+                (time.time() - ttl, IN_PROGRESS, time.time() - ttl)
+            ).rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class MemoryJobStore:
+    """Process-local job store with the SQLiteJobStore interface; jobs do not survive a restart"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, dict] = {}
+        self._lanes = {priority: deque() for priority in LANES.values()}
+
+    def enqueue(self, job_id: str, kind: str, priority: int, payload: dict):
+        with self._lock:
+            self._jobs[job_id] = {
+                "id": job_id, "kind": kind, "priority": priority, "status": "queued", "payload": payload,
+                "result": None, "error": None, "status_code": None,
+                "created_at": time.time(), "started_at": None, "finished_at": None
+            }
+            self._lanes[priority].append(job_id)
+
+    def claim(self) -> Optional[dict]:
+        with self._lock:
+            for priority in sorted(self._lanes):
+                if self._lanes[priority]:
+                    job = self._jobs[self._lanes[priority].popleft()]
+                    job.update(status="running", started_at=time.time())
+                    return dict(job)
+        return None
+
+    def finish(self, job_id: str, status: str, result: Optional[dict] = None,
+               error: Optional[str] = None, status_code: Optional[int] = None):
+        with self._lock:
+            self._jobs[job_id].update(
+                status=status, result=result, error=error, status_code=status_code, finished_at=time.time()
+            )
+
+    def save(self, job_id: str, kind: str, status: str, result: dict):
+        now = time.time()
+        with self._lock:
+            job = self._jobs.setdefault(job_id, {
+                "id": job_id, "kind": kind, "priority": LANES["normal"], "payload": {},
+                "error": None, "status_code": None, "created_at": now, "started_at": now
+            })
+            job.update(status=status, result=result, finished_at=now if status in FINISHED else None)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def queued(self, priority: int) -> int:
+        return len(self._lanes[priority])
+
+    def counts(self) -> dict:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+            return counts
+
+    def recover(self, stale_after: float) -> int:
+        return 0
+
+    def prune(self, ttl: float) -> int:
+        cutoff = time.time() - ttl
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if (job["status"] in FINISHED and job["finished_at"] < cutoff)
+                       or (job["status"] == IN_PROGRESS and job["created_at"] < cutoff)]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+    def close(self):
+        pass
+
+
+Handler = Callable[[dict], Awaitable[dict]]
+
+
+class JobQueue:
+    """In-process worker pool draining a persistent, prioritized job store.
+
+    ``submit`` returns a job ID straight away; ``JOB_WORKERS`` tasks per process claim jobs
+    highest lane first and run the registered handler. Each lane holds at most
+    ``max_queued_per_lane`` jobs, beyond which submitters get a 503 with Retry-After.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, store_factory: Callable[[], object], workers: int, max_queued_per_lane: int,
+                 poll_interval: float):
+        # The store opens in start(), so processes that merely import this module (PDF workers) never touch it
+        self.store_factory = store_factory
+        self.store = None
+        self.workers = workers
+        self.max_queued_per_lane = max_queued_per_lane
+        self.poll_interval = poll_interval
+        self.handlers: Dict[str, Handler] = {}
+        self._tasks = []
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._waiters: "weakref.WeakValueDictionary[str, asyncio.Event]" = weakref.WeakValueDictionary()
+        self._finished_count = itertools.count(1)
+        self.submitted = 0
+        self.rejected = 0
+        self.running = 0
+
+    def register(self, kind: str, handler: Handler):
+        """Attach the coroutine that runs jobs of ``kind``; it returns the result dict or raises HTTPException"""
+        self.handlers[kind] = handler
+
+    async def submit(self, kind: str, payload: dict, lane: str = "normal") -> str:
+        priority = LANES[lane]
+        if await asyncio.to_thread(self.store.queued, priority) >= self.max_queued_per_lane:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail=f"Job queue is full for the {lane} lane, please retry shortly",
+                headers={"Retry-After": str(PDF_RETRY_AFTER)}
+            )
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(self.store.enqueue, job_id, kind, priority, payload)
+        self.submitted += 1
+        self._wakeup.set()
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def save(self, job_id: str, kind: str, status: str, result: dict):
+        """Record work this process runs itself (IN_PROGRESS, then succeeded/failed) for other workers to read"""
+        await asyncio.to_thread(self.store.save, job_id, kind, status, result)
+
+    async def wait(self, job_id: str, timeout: float):
+        """Return when ``job_id`` finishes in this process or after ``timeout``, whichever is first"""
+        event = self._waiters.get(job_id)
+        if event is None:
+            event = asyncio.Event()
+            self._waiters[job_id] = event
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self, job: dict):
+        handler = self.handlers.get(job["kind"])
+        try:
+            if handler is None:
+                raise HTTPException(status_code=400, detail=f"Unknown job kind {job['kind']}")
+            result = await handler(job["payload"])
+            await asyncio.to_thread(self.store.finish, job["id"], "succeeded", result)
+        except HTTPException as e:
+            await asyncio.to_thread(self.store.finish, job["id"], "failed", None, str(e.detail), e.status_code)
+        except Exception as e:
+            logger.error(f"Job {job['id']} ({job['kind']}) failed: {str(e)}")
+            await asyncio.to_thread(self.store.finish, job["id"], "failed", None, "Job failed unexpectedly", 500)
+        event = self._waiters.get(job["id"])
+        if event is not None:
+            event.set()
+
+    async def _worker(self):
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                job = await asyncio.to_thread(self.store.claim)
+            except Exception as e:
+                # A locked or briefly unavailable database must not kill the worker
+                logger.error(f"Job store claim failed: {str(e)}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            if job is None:
+                # Other processes may enqueue into a shared store, so also wake up periodically
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.running += 1
+            try:
+                await self._run(job)
+            finally:
+                self.running -= 1
+            if next(self._finished_count) % self.PRUNE_EVERY == 0:
+                try:
+                    await asyncio.to_thread(self.store.prune, JOB_RESULT_TTL)
+                except Exception as e:
+                    logger.warning(f"Job store prune failed: {str(e)}")
+
+    async def start(self):
+        self._stopping = False
+        self.store = self.store_factory()
+        recovered = await asyncio.to_thread(self.store.recover, JOB_STALE_AFTER)
+        if recovered:
+            logger.warning(f"Requeued {recovered} jobs orphaned by a previous process")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 0):
+        """Stop claiming jobs, give running ones ``timeout`` seconds to finish, then cancel the rest.
+
+        A cancelled job stays "running" in a persistent store until a later process requeues it.
+        """
+        self._stopping = True
+        self._wakeup.set()
+        if self._tasks and timeout > 0:
+            await asyncio.wait(self._tasks, timeout=timeout)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    def stats(self) -> dict:
+        if self.store is None:
+            return {"started": False}
+        return {
+            "backend": type(self.store).__name__,
+            "workers": self.workers,
+            "running": self.running,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "queued_per_lane": {lane: self.store.queued(priority) for lane, priority in LANES.items()},
+            "jobs_by_status": self.store.counts()
+        }
+
+
+def open_job_store():
+    if JOB_QUEUE_BACKEND == "sqlite":
+        try:
+            return SQLiteJobStore(JOB_QUEUE_DB)
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent job store disabled, could not open {JOB_QUEUE_DB}: {str(e)}")
+    return MemoryJobStore()
+
+
+job_queue = JobQueue(open_job_store, JOB_WORKERS, JOB_MAX_QUEUED_PER_LANE, JOB_POLL_INTERVAL)
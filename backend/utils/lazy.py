@@ -0,0 +1,59 @@
+"""Deferred imports for heavy dependencies (PyMuPDF, NumPy, httpx) so importing the app stays fast.
+
+``np = lazy_module("numpy")`` binds a stand-in that imports NumPy on its first
+attribute access. Modules using one need ``from __future__ import annotations`` so
+signatures like ``-> np.ndarray`` are not evaluated at definition time. The app's
+startup warm-up (utils.warmup) loads the ones a process needs in a background thread
+before traffic would otherwise pay for it.
+"""
+import importlib
+import sys
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional
+
+
+class LazyModule:
+    """Stand-in for a module, imported on first attribute access.
+
+    The real import goes through ``importlib.import_module``, whose per-module lock
+    makes a race between the warm-up thread and a request safe.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    # Underscored so they cannot shadow the wrapped module's own attributes (numpy.load)
+    def _lazy_load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def _lazy_loaded(self) -> bool:
+        return self._module is not None or self._name in sys.modules
+
+    def __getattr__(self, attr: str):
+        return getattr(self._lazy_load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r} ({'loaded' if self._lazy_loaded else 'not loaded'})>"
+
+
+_registry: Dict[str, LazyModule] = {}
+
+
+def lazy_module(name: str) -> LazyModule:
+    """Shared stand-in for ``name``; every module deferring the same import gets the same one"""
+    module = _registry.get(name)
+    if module is None:
+        module = _registry[name] = LazyModule(name)
+    return module
+
+
+def load_all(exclude: Iterable[str] = ()) -> List[str]:
+    """Import every deferred module not in ``exclude`` now; returns the names that were not loaded yet"""
+    pending = [name for name, module in _registry.items() if not module._lazy_loaded and name not in exclude]
+    for name in pending:
+        _registry[name]._lazy_load()
+    return pending
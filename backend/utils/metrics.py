@@ -0,0 +1,234 @@
+"""In-process metrics exposed at /metrics in the Prometheus text format.
+
+Recording is a dict lookup plus an add (a bisect too for histograms), cheap enough
+to leave on in production. Stats other modules already keep (caches, pools, the job
+queue) are copied in at scrape time instead of being counted twice.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.profiling import active_trace
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans a cache hit (sub-millisecond) up to a slow Gemini call
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40)
+BYTE_BUCKETS = tuple(1024 * 2 ** i for i in range(0, 14, 2))  # 1KB .. 4MB
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+# ASGI scope of the request being served; the router fills in its "route" as it dispatches
+_scope: ContextVar[Optional[dict]] = ContextVar("metrics_scope", default=None)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.values: Dict[tuple, float] = {}
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in self.values.items()]
+
+    def render(self) -> str:
+        return "\n".join([f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self.samples()])
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def set(self, value: float, *labels):
+        """Mirror a running total another module already keeps"""
+        self.values[labels] = value
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *labels):
+        self.values[labels] = value
+
+    def inc(self, *labels, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.bounds = tuple(sorted(buckets))
+        self.series: Dict[tuple, list] = {}  # labels -> [count per bucket (last is +Inf), sum]
+
+    def observe(self, value: float, *labels):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.bounds) + 1), 0.0]
+        series[0][bisect_left(self.bounds, value)] += 1
+        series[1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total) in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Metrics owned by this app, rendered in registration order"""
+
+    def __init__(self, namespace: str = ""):
+        self.prefix = f"{namespace}_" if namespace else ""
+        self.metrics: Dict[str, Metric] = {}
+
+    def _add(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Iterable[str] = ()) -> Counter:
+        return self._add(Counter(self.prefix + name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Iterable[str] = ()) -> Gauge:
+        return self._add(Gauge(self.prefix + name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Iterable[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(self.prefix + name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self.metrics.values()) + "\n"
+
+
+registry = Registry("skillup")
+
+http_requests = registry.counter("http_requests_total", "HTTP requests served", ("route", "method", "status"))
+http_request_seconds = registry.histogram("http_request_seconds", "Time to serve a request, body included",
+                                          ("route", "method"))
+http_in_flight = registry.gauge("http_requests_in_flight", "Requests being served")
+stage_seconds = registry.histogram("stage_seconds", "Time spent in one stage of the request pipeline",
+                                   ("route", "stage"))
+upstream_seconds = registry.histogram("upstream_request_seconds", "Upstream API call latency",
+                                      ("provider", "operation"))
+upstream_requests = registry.counter("upstream_requests_total", "Upstream API calls by outcome",
+                                     ("provider", "status"))
+pdf_bytes = registry.histogram("pdf_upload_bytes", "Size of uploaded resume PDFs", buckets=BYTE_BUCKETS)
+pdf_pages = registry.histogram("pdf_pages", "Pages in extracted resume PDFs", buckets=PAGE_BUCKETS)
+cache_hits = registry.counter("cache_hits_total", "Cache lookups answered from the cache", ("cache",))
+cache_misses = registry.counter("cache_misses_total", "Cache lookups that missed", ("cache",))
+cache_hit_ratio = registry.gauge("cache_hit_ratio", "Share of lookups answered from the cache", ("cache",))
+in_flight = registry.gauge("in_flight", "Work in progress per component", ("component",))
+
+
+def current_route() -> str:
+    """Route template of the request being served ("background" outside one, e.g. in job workers)"""
+    scope = _scope.get()
+    if scope is None:
+        return "background"
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage of the current request into skillup_stage_seconds, and its trace when profiling"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        stage_seconds.observe(end - start, current_route(), name)
+        trace = active_trace.get()
+        if trace is not None:
+            trace.add_span(name, start, end)
+
+
+def record_upstream(provider: str, operation: str, status, seconds: float):
+    upstream_seconds.observe(seconds, provider, operation)
+    upstream_requests.inc(provider, str(status))
+
+
+def record_cache(name: str, hits: int, misses: int):
+    """Copy a cache's running hit/miss totals in at scrape time"""
+    cache_hits.set(hits, name)
+    cache_misses.set(misses, name)
+    lookups = hits + misses
+    cache_hit_ratio.set(hits / lookups if lookups else 0.0, name)
+
+
+class MetricsMiddleware:
+    """Plain ASGI middleware timing every HTTP request by route template, method and status.
+
+    Route templates rather than raw paths keep label cardinality bounded; requests no
+    route matched are counted as "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        status = 500
+        token = _scope.set(scope)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_in_flight.dec()
+            route = current_route()
+            http_request_seconds.observe(time.perf_counter() - start, route, scope["method"])
+            http_requests.inc(route, scope["method"], str(status))
+            _scope.reset(token)
@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from fastapi import HTTPException
+
+from config.settings import (
+    PDF_WORKERS,
+    PDF_QUEUE_SIZE,
+    PDF_JOB_TIMEOUT,
+    PDF_CPU_LIMIT,
+    PDF_MAX_TASKS_PER_CHILD,
+    PDF_RETRY_AFTER,
+    PDF_WORKER_MEMORY_MB
+)
+from utils.helpers import read_pdf_file
+from utils.lazy import load_all
+from utils.metrics import pdf_pages, stage
+
+logger = logging.getLogger(__name__)
+
+if os.name == "posix":
+    import resource
+    import signal
+else:
+    # No rlimits on Windows; the per-job wall-clock timeout still bounds each extraction
+    resource = None
+
+
+class CPULimitExceeded(Exception):
+    pass
+
+
+def _on_cpu_limit(signum, frame):
+    raise CPULimitExceeded("PDF extraction exceeded its CPU budget")
+
+
+def _init_worker(memory_limit_mb: int):
+    if resource is None:
+        return
+    # The soft RLIMIT_CPU delivers SIGXCPU; turn it into an exception so the worker survives the job
+    signal.signal(signal.SIGXCPU, _on_cpu_limit)
+    # Cap the worker's address space so a hostile PDF fails with MemoryError instead of swapping the box
+    if memory_limit_mb > 0:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _run_extraction(path: str, cpu_limit: int) -> tuple:
+    """Worker-side entry point: extract (text, page count) under a per-job CPU budget, reporting peak RSS in KB"""
+    if resource is None:
+        text, pages = read_pdf_file(path)
+        return text, pages, 0
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    resource.setrlimit(resource.RLIMIT_CPU, (used + cpu_limit, hard))
+    try:
+        text, pages = read_pdf_file(path)
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+    return text, pages, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _warm_worker() -> int:
+    # PyMuPDF is imported lazily, so load it here rather than in the worker's first extraction
+    load_all()
+    # Brief, so concurrent warm-up jobs land on different processes
+    time.sleep(0.05)
+    return os.getpid()
+
+
+class PDFExtractionPool:
+    """Process pool for PyMuPDF extraction with bounded admission and worker recycling.
+
+    At most ``workers + queue_size`` extractions are admitted at once; beyond that callers
+    get a 503 with Retry-After instead of queueing without bound. Workers are replaced
+    after ``max_tasks_per_child`` jobs to contain leaks in the native library, and a job
+    that blows its wall-clock timeout takes its pool down with it so the stuck process dies.
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float, cpu_limit: int,
+                 max_tasks_per_child: int, memory_limit_mb: int = 0):
+        self.workers = workers
+        self.capacity = max(workers, 1) + queue_size
+        self.timeout = timeout
+        self.cpu_limit = cpu_limit
+        self.max_tasks_per_child = max_tasks_per_child
+        self.memory_limit_mb = memory_limit_mb
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.admitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.peak_worker_rss_kb = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.memory_limit_mb,),
+                max_tasks_per_child=self.max_tasks_per_child
+            )
+        return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor, kill: bool = False):
+        """Retire a broken or wedged executor; the next job starts a fresh one"""
+        if self._executor is executor:
+            self._executor = None
+        if kill:
+            for process in list(getattr(executor, "_processes", {}).values()):
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, path: str) -> tuple:
+        if self.workers <= 0:
+            return await asyncio.wait_for(asyncio.to_thread(read_pdf_file, path), self.timeout)
+
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                future = loop.run_in_executor(executor, _run_extraction, path, self.cpu_limit)
+                text, pages, peak_rss_kb = await asyncio.wait_for(future, self.timeout)
+                self.peak_worker_rss_kb = max(self.peak_worker_rss_kb, peak_rss_kb)
+                return text, pages
+            except asyncio.TimeoutError:
+                self._discard(executor, kill=True)
+                raise
+            except BrokenProcessPool:
+                # Another job crashed or was killed; retry once on a fresh pool
+                self._discard(executor)
+                if attempt:
+                    raise
+
+    async def extract(self, path: str) -> str:
+        """Extract resume text from a spooled PDF off the event loop, raising HTTPException on overload or bad input"""
+        if self.admitted >= self.capacity:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy processing resumes, please retry shortly",
+                headers={"Retry-After": str(PDF_RETRY_AFTER)}
+            )
+
+        self.admitted += 1
+        try:
+            with stage("extract"):
+                text, pages = await self._submit(path)
+            self.completed += 1
+            pdf_pages.observe(pages)
+            return text
+        except asyncio.TimeoutError:
+            self.failed += 1
+            raise HTTPException(status_code=422, detail="PDF took too long to process")
+        except (CPULimitExceeded, MemoryError):
+            self.failed += 1
+            raise HTTPException(status_code=422, detail="PDF is too complex to process")
+        except Exception as e:
+            self.failed += 1
+            raise HTTPException(status_code=500, detail=f"Error processing PDF: {str(e)}")
+        finally:
+            self.admitted -= 1
+
+    async def warm(self):
+        """Start the worker processes (and their PyMuPDF import) now instead of on the first uploads"""
+        if self.workers <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            pids = await asyncio.wait_for(asyncio.gather(
+                *(loop.run_in_executor(executor, _warm_worker) for _ in range(self.workers))
+            ), self.timeout)
+            logger.info(f"PDF pool warmed: {len(set(pids))} of {self.workers} workers started")
+        except (asyncio.TimeoutError, BrokenProcessPool) as e:
+            logger.warning(f"PDF pool warm-up failed: {type(e).__name__}")
+            self._discard(executor, kill=True)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self.admitted,
+            "capacity": self.capacity,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "peak_worker_rss_kb": self.peak_worker_rss_kb
+        }
+
+
+pdf_pool = PDFExtractionPool(
+    workers=PDF_WORKERS,
+    queue_size=PDF_QUEUE_SIZE,
+    timeout=PDF_JOB_TIMEOUT,
+    cpu_limit=PDF_CPU_LIMIT,
+    max_tasks_per_child=PDF_MAX_TASKS_PER_CHILD,
+    memory_limit_mb=PDF_WORKER_MEMORY_MB
+)
@@ -0,0 +1,239 @@
+"""Opt-in request profiler: stage spans for every request, stack samples for a sampled few.
+
+With PROFILING_ENABLED off the middleware is never installed, so requests pay nothing.
+When on, each request records the pipeline stages it went through (see
+``metrics.stage``); a PROFILING_SAMPLE_RATE share of requests, and any request an
+allow-listed client sends with the profiling header, also has the event loop thread's
+stack sampled every PROFILING_INTERVAL_MS while it runs. Requests slower than
+PROFILING_SLOW_MS (and every forced one) are kept in a ring buffer that
+/admin/profiles serves, stacks as collapsed-stack text for flamegraph.pl or speedscope.
+
+Samples cover the whole loop thread while the request is in flight, so other
+requests' CPU work shows up too; under asyncio that contention is usually what made
+the request slow. Time spent waiting on I/O shows up as the event loop's select call.
+"""
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import (
+    PROFILING_SAMPLE_RATE,
+    PROFILING_SLOW_MS,
+    PROFILING_INTERVAL_MS,
+    PROFILING_BUFFER_SIZE,
+    PROFILING_HEADER,
+    PROFILING_ALLOWED_CLIENTS,
+    PROFILING_MAX_DEPTH,
+    RATE_LIMIT_TRUST_PROXY
+)
+
+
+@dataclass
+class RequestTrace:
+    """Spans and stack samples of one request"""
+    id: int
+    method: str
+    path: str
+    route: str = ""
+    status: int = 0
+    forced: bool = False
+    started_at: float = field(default_factory=time.time)
+    duration_ms: float = 0.0
+    spans: List[Tuple[str, float, float]] = field(default_factory=list)  # (stage, start ms, end ms) from request start
+    stacks: Counter = field(default_factory=Counter)  # collapsed stack -> samples
+    profiled: bool = False
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    def add_span(self, name: str, start: float, end: float):
+        self.spans.append((name, round((start - self._start) * 1000, 3), round((end - self._start) * 1000, 3)))
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "forced": self.forced,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "samples": sum(self.stacks.values()),
+            "spans": [{"stage": name, "start_ms": start, "end_ms": end} for name, start, end in self.spans]
+        }
+
+
+# Trace of the request being served; None outside one or with profiling off
+active_trace: ContextVar[Optional[RequestTrace]] = ContextVar("active_trace", default=None)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame, max_depth: int) -> str:
+    """Root-first, ';'-separated frame labels, the format flamegraph.pl reads"""
+    labels = []
+    while frame is not None and len(labels) < max_depth:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """Daemon thread that samples one thread's stack into every trace registered with it.
+
+    The thread only runs while at least one trace is registered.
+    """
+
+    def __init__(self, interval: float, max_depth: int):
+        self.interval = interval
+        self.max_depth = max_depth
+        self._traces: Dict[int, RequestTrace] = {}
+        self._target: Optional[int] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, trace: RequestTrace, thread_id: int):
+        with self._lock:
+            self._traces[trace.id] = trace
+            self._target = thread_id
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def remove(self, trace: RequestTrace):
+        with self._lock:
+            self._traces.pop(trace.id, None)
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                traces = list(self._traces.values())
+                if not traces:
+                    self._wake.clear()
+                    continue
+            frame = sys._current_frames().get(self._target)
+            if frame is not None:
+                stack = collapse_stack(frame, self.max_depth)
+                for trace in traces:
+                    trace.stacks[stack] += 1
+            del frame
+            time.sleep(self.interval)
+
+
+class Profiler:
+    """Decides which requests to profile and keeps the slow ones in a ring buffer"""
+
+    def __init__(self, sample_rate: float, slow_ms: float, interval_ms: float, buffer_size: int,
+                 header: str, allowed_clients: List[str], max_depth: int):
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.header = header.lower().encode("latin-1")
+        self.allowed_clients = set(allowed_clients)
+        self.records: "deque[RequestTrace]" = deque(maxlen=buffer_size)
+        self.sampler = StackSampler(interval_ms / 1000, max_depth)
+        self._ids = itertools.count(1)
+        self.traced = 0
+        self.profiled = 0
+
+    def client_allowed(self, scope: dict) -> bool:
+        headers = dict(scope.get("headers") or [])
+        client = scope.get("client")[0] if scope.get("client") else "unknown"
+        if RATE_LIMIT_TRUST_PROXY and b"x-forwarded-for" in headers:
+            client = headers[b"x-forwarded-for"].decode("latin-1").split(",", 1)[0].strip()
+        return client in self.allowed_clients
+
+    def wants_profile(self, scope: dict) -> bool:
+        """Forced by an allow-listed client's header, for this one request"""
+        return any(name == self.header for name, _ in scope.get("headers") or []) and self.client_allowed(scope)
+
+    def start(self, scope: dict) -> RequestTrace:
+        trace = RequestTrace(next(self._ids), scope["method"], scope["path"], forced=self.wants_profile(scope))
+        self.traced += 1
+        if trace.forced or random.random() < self.sample_rate:
+            trace.profiled = True
+            self.profiled += 1
+            self.sampler.add(trace, threading.get_ident())
+        return trace
+
+    def finish(self, trace: RequestTrace, scope: dict, status: int):
+        if trace.profiled:
+            self.sampler.remove(trace)
+        trace.duration_ms = (time.perf_counter() - trace._start) * 1000
+        trace.status = status
+        route = scope.get("route")
+        trace.route = getattr(route, "path", None) or "unmatched"
+        if trace.forced or trace.duration_ms >= self.slow_ms:
+            self.records.append(trace)
+
+    def get(self, trace_id: int) -> Optional[RequestTrace]:
+        return next((trace for trace in self.records if trace.id == trace_id), None)
+
+    def collapsed(self, traces: List[RequestTrace]) -> str:
+        """Merged collapsed-stack profile; each stack is prefixed with the request's route"""
+        merged: Counter = Counter()
+        for trace in traces:
+            # list() snapshots in one step; the sampler thread may still be adding a last sample
+            for stack, count in list(trace.stacks.items()):
+                merged[f"{trace.method} {trace.route};{stack}"] += count
+        return "".join(f"{stack} {count}\n" for stack, count in merged.most_common())
+
+    def stats(self) -> dict:
+        return {
+            "sample_rate": self.sample_rate,
+            "slow_ms": self.slow_ms,
+            "traced": self.traced,
+            "profiled": self.profiled,
+            "kept": len(self.records),
+            "capacity": self.records.maxlen
+        }
+
+
+profiler = Profiler(
+    sample_rate=PROFILING_SAMPLE_RATE,
+    slow_ms=PROFILING_SLOW_MS,
+    interval_ms=PROFILING_INTERVAL_MS,
+    buffer_size=PROFILING_BUFFER_SIZE,
+    header=PROFILING_HEADER,
+    allowed_clients=PROFILING_ALLOWED_CLIENTS,
+    max_depth=PROFILING_MAX_DEPTH
+)
+
+
+class ProfilingMiddleware:
+    """Plain ASGI middleware that traces each HTTP request into ``profiler``"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        status = 500
+        trace = profiler.start(scope)
+        token = active_trace.set(trace)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if trace.profiled:
+                    message["headers"] = [*message.get("headers", []), (b"x-profile-id", str(trace.id).encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            active_trace.reset(token)
+            profiler.finish(trace, scope, status)
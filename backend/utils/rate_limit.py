@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request
+
+from config.settings import (
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_REDIS_URL,
+    RATE_LIMIT_LLM_PER_MINUTE,
+    RATE_LIMIT_SEARCH_PER_MINUTE,
+    RATE_LIMIT_DEFAULT_PER_MINUTE,
+    RATE_LIMIT_TRUST_PROXY,
+    RATE_LIMIT_MAX_KEYS
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimitRule:
+    """Token bucket: ``capacity`` requests of burst, refilled evenly over ``period`` seconds"""
+    capacity: int
+    period: float = 60.0
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: int  # seconds until the bucket is full again
+    retry_after: int = 0
+
+    def headers(self) -> dict:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset_after)
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+class MemoryBucketStore:
+    """Per-process token buckets; O(1) per check, idle buckets evicted LRU past ``max_keys``"""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def take(self, key: str, capacity: int, rate: float, cost: int) -> tuple:
+        """Refill then try to spend ``cost`` tokens; returns (allowed, tokens_left)"""
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, tokens
+
+    async def close(self):
+        pass
+
+
+# Same bucket arithmetic as MemoryBucketStore, run atomically inside Redis on the server's clock
+# so every uvicorn worker sees one bucket per key
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBucketStore:
+    """Token buckets shared by every worker through any Redis-compatible server.
+
+    ``client`` is a ``redis.asyncio`` client, or anything exposing the same
+    ``register_script`` / ``aclose`` interface.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(TOKEN_BUCKET_LUA)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBucketStore":
+        import redis.asyncio as redis  # optional dependency, only needed for the shared backend
+        return cls(redis.from_url(url))
+
+    async def take(self, key: str, capacity: int, rate: float, cost: int) -> tuple:
+        allowed, tokens = await self._script(keys=[self.prefix + key], args=[capacity, rate, cost])
+        return bool(int(allowed)), float(tokens)
+
+    async def close(self):
+        await self.client.aclose()
+
+
+# Route classes by path prefix; LLM routes burn Gemini quota, search routes are mostly cache hits
+ROUTE_CLASSES = [
+    ("/analyze/full", "llm", 3),  # skill gap, job matching and projects in one request
+    ("/analyze/batch/", "default", 1),  # polling and resuming a batch already paid for
+    ("/analyze/batch", "llm", 1),  # the first resume; the rest take a token each as the batch runs
+    ("/analyze_resume", "llm", 1),
+    ("/job_matching", "llm", 1),
+    ("/project_generator", "llm", 1),
+    ("/jobs/analyze_resume", "llm", 1),
+    ("/jobs/job_matching", "llm", 1),
+    ("/jobs/project_generator", "llm", 1),
+    ("/fetch_courses", "search", 1),
+    ("/youtube-courses", "search", 1)
+]
+
+# Probes and scrapes must keep answering even when a client is over its limit
+EXEMPT_PATHS = {"/health", "/ready", "/metrics"}
+
+
+class RateLimiter:
+    """Per-client, per-route-class token bucket limiter over a pluggable bucket store"""
+
+    def __init__(self, store, rules: dict):
+        self.store = store
+        self.rules = rules
+        self.allowed = 0
+        self.limited = 0
+        self.store_errors = 0
+
+    @staticmethod
+    def classify(path: str) -> tuple:
+        """Return (route_class, cost) for a request path"""
+        for prefix, route_class, cost in ROUTE_CLASSES:
+            if path.startswith(prefix):
+                return route_class, cost
+        return "default", 1
+
+    @staticmethod
+    def client_id(request: Request) -> str:
+        if RATE_LIMIT_TRUST_PROXY:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",", 1)[0].strip()
+        return request.client.host if request.client else "unknown"
+
+    async def check(self, request: Request) -> Optional[RateLimitDecision]:
+        """Spend tokens for this request; None when the request is not rate limited at all"""
+        if request.method == "OPTIONS" or request.url.path in EXEMPT_PATHS:
+            return None
+
+        route_class, cost = self.classify(request.url.path)
+        rule = self.rules[route_class]
+        key = f"{route_class}:{self.client_id(request)}"
+        try:
+            allowed, tokens = await self.store.take(key, rule.capacity, rule.rate, cost)
+        except Exception as e:
+            # Fail open: a limiter outage should not take the API down with it
+            self.store_errors += 1
+            logger.warning(f"Rate limit store unavailable, allowing request: {str(e)}")
+            return None
+
+        if allowed:
+            self.allowed += 1
+        else:
+            self.limited += 1
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=rule.capacity,
+            remaining=max(int(tokens), 0),
+            reset_after=math.ceil((rule.capacity - tokens) / rule.rate),
+            retry_after=0 if allowed else max(math.ceil((cost - tokens) / rule.rate), 1)
+        )
+
+    async def wait(self, client: str, route_class: str, cost: int = 1):
+        """Spend tokens for work already accepted (each resume of a batch), sleeping until the bucket refills"""
+        rule = self.rules[route_class]
+        key = f"{route_class}:{client}"
+        while True:
+            try:
+                allowed, tokens = await self.store.take(key, rule.capacity, rule.rate, cost)
+            except Exception as e:
+                self.store_errors += 1
+                logger.warning(f"Rate limit store unavailable, not pacing: {str(e)}")
+                return
+            if allowed:
+                self.allowed += 1
+                return
+            await asyncio.sleep((cost - tokens) / rule.rate)
+
+    async def close(self):
+        await self.store.close()
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.store).__name__,
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "store_errors": self.store_errors,
+            "limits_per_minute": {name: rule.capacity for name, rule in self.rules.items()}
+        }
+
+
+def create_rate_limiter() -> Optional[RateLimiter]:
+    if not RATE_LIMIT_ENABLED:
+        return None
+    store = MemoryBucketStore()
+    if RATE_LIMIT_BACKEND == "redis":
+        try:
+            store = RedisBucketStore.from_url(RATE_LIMIT_REDIS_URL)
+        except ImportError:
+            logger.warning("RATE_LIMIT_BACKEND=redis but the redis package is not installed, using in-memory buckets")
+    return RateLimiter(store, {
+        "llm": RateLimitRule(RATE_LIMIT_LLM_PER_MINUTE),
+        "search": RateLimitRule(RATE_LIMIT_SEARCH_PER_MINUTE),
+        "default": RateLimitRule(RATE_LIMIT_DEFAULT_PER_MINUTE)
+    })
+
+
+rate_limiter = create_rate_limiter()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Optional
+
+from config.settings import (
+    GOOGLE_API_KEY,
+    YOUTUBE_API_KEY,
+    SEARCH_ENGINE_ID,
+    GOOGLE_API_BASE,
+    SEARCH_TIMEOUT,
+    SEARCH_MAX_CONNECTIONS
+)
+from utils.circuit_breaker import CircuitOpenError, UpstreamGuard, custom_search_guard, youtube_guard
+from utils.lazy import lazy_module
+from utils.metrics import record_upstream, upstream_requests
+
+logger = logging.getLogger(__name__)
+
+httpx = lazy_module("httpx")
+
+# Shared pool for googleapis.com (Custom Search and YouTube Data API)
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared googleapis.com HTTP client"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=GOOGLE_API_BASE,
+            http2=True,
+            timeout=httpx.Timeout(SEARCH_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=SEARCH_MAX_CONNECTIONS,
+                max_keepalive_connections=SEARCH_MAX_CONNECTIONS
+            )
+        )
+    return _client
+
+
+async def close_client():
+    """Close the shared client and release pooled connections"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def warm_up():
+    """Open the pooled googleapis.com connection before the first search needs it"""
+    try:
+        # Unauthenticated, so it costs neither Custom Search nor YouTube quota
+        await get_client().head("/")
+    except httpx.HTTPError as e:
+        logger.warning(f"Search connection warm-up failed: {str(e)}")
+
+
+async def _guarded_get(guard: UpstreamGuard, cost: int, path: str, **kwargs) -> httpx.Response:
+    """GET through an upstream guard; raises CircuitOpenError instead of calling an exhausted API"""
+    try:
+        started = guard.acquire(cost)
+    except CircuitOpenError:
+        upstream_requests.inc(guard.name, "circuit_open")
+        raise
+    start = time.perf_counter()
+    try:
+        response = await get_client().get(path, **kwargs)
+    except httpx.TransportError:
+        record_upstream(guard.name, "search", "transport_error", time.perf_counter() - start)
+        guard.record_transport_error(started)
+        raise
+    finally:
+        # search_courses cancels calls past its deadline; a cancelled probe must not hold the circuit half-open
+        guard.release(started)
+    record_upstream(guard.name, "search", response.status_code, time.perf_counter() - start)
+    if response.status_code == 200:
+        guard.record_success()
+    else:
+        guard.record_failure(response.status_code, response.text, started)
+    return response
+
+
+async def custom_search(query: str, num: int = 3) -> httpx.Response:
+    """Run one Google Custom Search query (raises CircuitOpenError while the API is unavailable)"""
+    params = {
+        "cx": SEARCH_ENGINE_ID,
+        "q": query,
+        "num": num,
+        "safe": "active"
+    }
+    # Key goes in a header so it never shows up in httpx's request logs
+    return await _guarded_get(
+        custom_search_guard,
+        1,
+        "/customsearch/v1",
+        params=params,
+        headers={"x-goog-api-key": GOOGLE_API_KEY or ""}
+    )
+
+
+async def youtube_search(query: str, max_results: int = 12) -> httpx.Response:
+    """Run one YouTube Data API video search (raises CircuitOpenError while the API is unavailable)"""
+    params = {
+        "part": "snippet",
+        "q": query,
+        "type": "video",
+        "maxResults": max_results,
+        "order": "relevance",
+        "videoDuration": "medium",  # Filter for substantial content
+        "safeSearch": "strict"
+    }
+    # search.list costs 100 quota units
+    return await _guarded_get(
+        youtube_guard,
+        100,
+        "/youtube/v3/search",
+        params=params,
+        headers={"x-goog-api-key": YOUTUBE_API_KEY or ""}
+    )
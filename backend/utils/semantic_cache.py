@@ -0,0 +1,320 @@
+"""Similarity cache for Gemini answers: near-duplicate requests reuse an earlier answer.
+
+Requests are embedded with a hashing vectorizer over their canonicalized job title,
+skills and resume words, and looked up in an in-process vector index. Vectors live in
+a fixed-size ``.npy`` ring buffer that is memory-mapped at startup; answers and entry
+metadata live next to it in SQLite.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+from config.settings import (
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_PATH,
+    SEMANTIC_CACHE_CAPACITY,
+    SEMANTIC_CACHE_DIM,
+    SEMANTIC_CACHE_TTL,
+    SEMANTIC_CACHE_IVF_MIN_ROWS,
+    SEMANTIC_CACHE_NPROBE
+)
+from utils.helpers import normalize_job_title
+from utils.lazy import lazy_module
+from utils.skill_extractor import canonical_skill_names
+
+logger = logging.getLogger(__name__)
+
+np = lazy_module("numpy")
+
+if os.name == "posix":
+    import fcntl
+else:
+    import msvcrt
+
+
+def _try_lock(lock_file) -> bool:
+    """Take a non-blocking exclusive lock held until the file closes; False when another process has it"""
+    try:
+        if os.name == "posix":
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+# Share of the squared vector norm each field gets; the title decides most of the match
+FIELD_WEIGHTS = {"title": 0.45, "skills": 0.35, "resume": 0.2}
+
+# Contact details and numbers say nothing about the answer, so they never reach the vector
+_NOISE_RE = re.compile(r"\S+@\S+|https?://\S+|www\.\S+|\S*\d\S*")
+_WORD_RE = re.compile(r"[a-z][a-z+#.]*[a-z+#]|[a-z]")
+
+
+def _hashed(tokens: Iterable[str], field: str, dim: int) -> np.ndarray:
+    """Signed feature hashing of a token set into a unit vector (zero when there are no tokens)"""
+    vector = np.zeros(dim, dtype=np.float32)
+    for token in set(tokens):
+        h = zlib.crc32(f"{field}:{token}".encode("utf-8"))
+        vector[h % dim] += 1.0 if h & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def resume_words(text: str) -> List[str]:
+    return _WORD_RE.findall(_NOISE_RE.sub(" ", text.casefold()))
+
+
+def embed(dim: int, job_title: str = "", skills: Iterable[str] = (), resume_text: str = "") -> np.ndarray:
+    """Unit vector for a request; fields left empty drop out and the rest are re-weighted"""
+    fields = {
+        "title": normalize_job_title(job_title).split(),
+        "skills": list(skills),
+        "resume": resume_words(resume_text)
+    }
+    present = {field: tokens for field, tokens in fields.items() if tokens}
+    total = sum(FIELD_WEIGHTS[field] for field in present)
+    vector = np.zeros(dim, dtype=np.float32)
+    for field, tokens in present.items():
+        vector += math.sqrt(FIELD_WEIGHTS[field] / total) * _hashed(tokens, field, dim)
+    return vector
+
+
+class SemanticCache:
+    """Nearest-neighbour answer cache over a fixed-capacity ring of unit vectors.
+
+    Search is exact (one matrix-vector product) until the index holds ``ivf_min_rows``
+    live entries; after that k-means centroids are trained and only the ``nprobe``
+    closest inverted lists are scanned. Centroids are retrained whenever the live count
+    has doubled since the last training, and are rebuilt after a restart.
+    """
+
+    def __init__(self, dim: int, capacity: int, threshold: float, ttl: float,
+                 path: Optional[str] = None, ivf_min_rows: int = 4096, nprobe: int = 8):
+        self.dim = dim
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl = ttl
+        self.path = path
+        self.ivf_min_rows = ivf_min_rows
+        self.nprobe = nprobe
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._conn = None
+        self._lock_file = None
+        self._answers: Dict[int, str] = {}  # memory-only mode
+        self._kinds: Dict[str, int] = {}
+        self._seq = 0
+        self.vectors = None
+        self.centroids = None
+        self._trained_at = 0
+        self.hits = 0
+        self.misses = 0
+        self.kind_hits: Dict[str, int] = {}
+        self.best_scores: List[float] = []
+
+    def open(self):
+        """Map the vector file and load entry metadata; call once per process before serving"""
+        if self.enabled:
+            return
+        self.row_kind = np.full(self.capacity, -1, dtype=np.int16)
+        self.row_expires = np.zeros(self.capacity, dtype=np.float64)
+        self.row_list = np.full(self.capacity, -1, dtype=np.int32)
+        if self.path:
+            try:
+                self._open_files()
+            except Exception as e:
+                logger.warning(f"Semantic cache kept in memory, could not open {self.path}: {str(e)}")
+                self._close_files()
+                self.row_kind[:] = -1
+        if self.vectors is None:
+            self.vectors = np.zeros((self.capacity, self.dim), dtype=np.float32)
+        self.enabled = True
+        self._maybe_train()
+
+    def _open_files(self):
+        # One process owns the files; other workers fall back to a private in-memory index
+        self._lock_file = open(f"{self.path}.lock", "w")
+        if not _try_lock(self._lock_file):
+            raise OSError("locked by another process")
+        self._conn = sqlite3.connect(f"{self.path}.db", check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (row INTEGER PRIMARY KEY, seq INTEGER NOT NULL, "
+            "kind TEXT NOT NULL, expires_at REAL NOT NULL, answer TEXT NOT NULL)"
+        )
+        vectors_path = f"{self.path}.npy"
+        try:
+            vectors = np.load(vectors_path, mmap_mode="r+")
+            if vectors.shape != (self.capacity, self.dim) or vectors.dtype != np.float32:
+                logger.warning(f"Semantic cache shape changed to {self.capacity}x{self.dim}, starting empty")
+                vectors = None
+        except FileNotFoundError:
+            vectors = None
+        if vectors is None:
+            self._conn.execute("DELETE FROM entries")
+            vectors = np.lib.format.open_memmap(vectors_path, mode="w+", dtype=np.float32,
+                                                shape=(self.capacity, self.dim))
+        self.vectors = vectors
+        now = time.time()
+        self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        for row, seq, kind, expires_at in self._conn.execute("SELECT row, seq, kind, expires_at FROM entries"):
+            if row < self.capacity:
+                self.row_kind[row] = self._kind_id(kind)
+                self.row_expires[row] = expires_at
+                self._seq = max(self._seq, seq + 1)
+        logger.info(f"Semantic cache: {self.live_entries()} entries mapped from {vectors_path}")
+
+    def _close_files(self):
+        if isinstance(self.vectors, np.memmap):
+            self.vectors.flush()
+        self.vectors = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def close(self):
+        with self._lock:
+            self.enabled = False
+            self._close_files()
+
+    def _kind_id(self, kind: str) -> int:
+        return self._kinds.setdefault(kind, len(self._kinds))
+
+    def live_entries(self) -> int:
+        return int(np.count_nonzero((self.row_kind >= 0) & (self.row_expires > time.time())))
+
+    def _maybe_train(self):
+        live = np.flatnonzero((self.row_kind >= 0) & (self.row_expires > time.time()))
+        if len(live) < self.ivf_min_rows or len(live) < 2 * self._trained_at:
+            return
+        nlist = min(256, int(math.sqrt(len(live))))
+        rng = np.random.default_rng(0)
+        sample = self.vectors[rng.choice(live, min(len(live), 32 * nlist), replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(10):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            for i in range(nlist):
+                members = sample[assign == i]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[i] = centroid / (np.linalg.norm(centroid) or 1.0)
+        self.centroids = centroids
+        self.row_list[:] = -1
+        self.row_list[live] = np.argmax(self.vectors[live] @ centroids.T, axis=1)
+        self._trained_at = len(live)
+        logger.info(f"Semantic cache index trained: {nlist} lists over {len(live)} entries")
+
+    def _search(self, kind: str, vector: np.ndarray) -> tuple:
+        """(row, score) of the most similar live entry of this kind, or (None, 0.0)"""
+        kind_id = self._kinds.get(kind)
+        if kind_id is None:
+            return None, 0.0
+        candidates = (self.row_kind == kind_id) & (self.row_expires > time.time())
+        if self.centroids is not None:
+            probe = np.argsort(self.centroids @ vector)[-self.nprobe:]
+            candidates &= np.isin(self.row_list, probe)
+        rows = np.flatnonzero(candidates)
+        if not len(rows):
+            return None, 0.0
+        scores = self.vectors[rows] @ vector
+        best = int(np.argmax(scores))
+        return int(rows[best]), float(scores[best])
+
+    def _lookup(self, kind: str, vector: np.ndarray) -> Optional[str]:
+        with self._lock:
+            if not self.enabled:
+                return None
+            row, score = self._search(kind, vector)
+            self.best_scores.append(score)
+            del self.best_scores[:-1000]
+            if row is None or score < self.threshold:
+                self.misses += 1
+                return None
+            if self._conn is not None:
+                found = self._conn.execute("SELECT answer FROM entries WHERE row = ?", (row,)).fetchone()
+                answer = found[0] if found else None
+            else:
+                answer = self._answers.get(row)
+            if answer is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.kind_hits[kind] = self.kind_hits.get(kind, 0) + 1
+            return answer
+
+    def _store(self, kind: str, vector: np.ndarray, answer: str):
+        with self._lock:
+            if not self.enabled:
+                return
+            # Oldest entry is overwritten once the ring is full
+            row = self._seq % self.capacity
+            kind_id = self._kind_id(kind)
+            expires_at = time.time() + self.ttl
+            self.vectors[row] = vector
+            if self._conn is not None:
+                # Vector first: a crash in between leaves a row with no metadata, which is ignored
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (row, seq, kind, expires_at, answer) VALUES (?, ?, ?, ?, ?)",
+                    (row, self._seq, kind, expires_at, answer)
+                )
+            else:
+                self._answers[row] = answer
+            self.row_kind[row] = kind_id
+            self.row_expires[row] = expires_at
+            if self.centroids is not None:
+                self.row_list[row] = int(np.argmax(self.centroids @ vector))
+            self._seq += 1
+            self._maybe_train()
+
+    def vector(self, job_title: str = "", skills: Iterable[str] = (), resume_text: str = "") -> Optional[np.ndarray]:
+        """Embedding for a request, or None when the cache is not open"""
+        if not self.enabled:
+            return None
+        return embed(self.dim, job_title, canonical_skill_names(skills), resume_text)
+
+    async def lookup(self, kind: str, vector: Optional[np.ndarray]) -> Optional[str]:
+        """Cached answer for the most similar earlier request of this kind, if it is close enough"""
+        if not self.enabled or vector is None:
+            return None
+        return await asyncio.to_thread(self._lookup, kind, vector)
+
+    async def store(self, kind: str, vector: Optional[np.ndarray], answer: str):
+        if self.enabled and vector is not None and answer:
+            await asyncio.to_thread(self._store, kind, vector, answer)
+
+    def stats(self) -> dict:
+        if not self.enabled:
+            return {"enabled": False}
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "hits_by_kind": dict(self.kind_hits),
+            "threshold": self.threshold,
+            # Where recent best matches land relative to the threshold, for tuning it
+            "median_best_score": round(float(np.median(self.best_scores)), 4) if self.best_scores else None,
+            "entries": self.live_entries(),
+            "capacity": self.capacity,
+            "index": "ivf" if self.centroids is not None else "flat",
+            "persistent": self._conn is not None
+        }
+
+
+# Opened from the app lifespan, so spawned PDF workers importing this module never touch the files
+semantic_cache = SemanticCache(SEMANTIC_CACHE_DIM, SEMANTIC_CACHE_CAPACITY, SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_TTL,
+                               SEMANTIC_CACHE_PATH or None, SEMANTIC_CACHE_IVF_MIN_ROWS, SEMANTIC_CACHE_NPROBE)
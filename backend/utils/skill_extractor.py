@@ -0,0 +1,141 @@
+import json
+import logging
+import re
+from typing import Dict, Iterable, List, Optional
+
+from config.settings import SKILLS_TAXONOMY_PATH
+
+logger = logging.getLogger(__name__)
+
+# Words keep the punctuation that is part of skill names: C++, C#, .NET, Node.js, CI/CD splits on "/"
+TOKEN_RE = re.compile(r"\.?[a-z0-9][a-z0-9+#&]*(?:\.[a-z0-9+#&]+)*", re.IGNORECASE)
+
+_TERMINAL = ""  # trie key marking the end of a term; never produced by TOKEN_RE
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text)
+
+
+class SkillExtractor:
+    """Longest-match skill finder over a token trie built from the skills taxonomy.
+
+    Taxonomy entries map a canonical name to its aliases. A leading ``=`` on a name or
+    alias makes it case-sensitive (``=Go``, ``=Rails``); a leading ``~`` on a canonical
+    name means only its aliases match, for names that are also common words.
+    Matching is one pass over the resume's tokens with a dict lookup per token.
+    """
+
+    def __init__(self, taxonomy: dict):
+        self.trie: dict = {}
+        self.categories: Dict[str, str] = {}
+        self.vocabulary = set()
+        self.terms = 0
+        for category, entries in taxonomy["categories"].items():
+            for name, aliases in entries.items():
+                terms = list(aliases)
+                if name.startswith("~"):
+                    name = name[1:]
+                else:
+                    terms.append(name)
+                canonical = name.lstrip("=")
+                self.categories[canonical] = category
+                for term in terms:
+                    self._add(term, canonical)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillExtractor":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _add(self, term: str, canonical: str):
+        case_sensitive = term.startswith("=")
+        tokens = tokenize(term.lstrip("="))
+        if not tokens:
+            return
+        node = self.trie
+        for token in tokens:
+            token = token.lower()
+            self.vocabulary.add(token)
+            node = node.setdefault(token, {})
+        # Several spellings may end on the same node; case-sensitive ones are checked first
+        exact = tuple(tokens) if case_sensitive else None
+        node.setdefault(_TERMINAL, []).append((exact, canonical))
+        node[_TERMINAL].sort(key=lambda entry: entry[0] is None)
+        self.terms += 1
+
+    def _tokens(self, text: str) -> List[str]:
+        tokens = []
+        for token in tokenize(text):
+            # PDF text often loses the space after a full stop ("Python.Led"); split unknown dotted words
+            if "." in token[1:] and token.lower() not in self.vocabulary:
+                tokens += [part for part in token.split(".") if part]
+            else:
+                tokens.append(token)
+        return tokens
+
+    def _matches(self, text: str):
+        """Yield canonical names for every longest match, in text order"""
+        tokens = self._tokens(text)
+        lowered = [token.lower() for token in tokens]
+        i = 0
+        count = len(tokens)
+        while i < count:
+            node = self.trie
+            match = None
+            j = i
+            while j < count:
+                node = node.get(lowered[j])
+                if node is None:
+                    break
+                j += 1
+                for exact, canonical in node.get(_TERMINAL, ()):
+                    if exact is None or exact == tuple(tokens[i:j]):
+                        match = (j, canonical)
+                        break
+            if match is None:
+                i += 1
+                continue
+            i, canonical = match
+            yield canonical
+
+    def extract(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """Canonical skill names found in ``text``, de-duplicated, in order of first mention"""
+        seen = {}
+        for canonical in self._matches(text):
+            seen.setdefault(canonical, None)
+            if limit is not None and len(seen) >= limit:
+                break
+        return list(seen)
+
+    def extract_by_category(self, text: str) -> Dict[str, List[str]]:
+        grouped: Dict[str, List[str]] = {}
+        for canonical in self.extract(text):
+            grouped.setdefault(self.categories[canonical], []).append(canonical)
+        return grouped
+
+
+_extractor: Optional[SkillExtractor] = None
+
+
+def get_extractor() -> SkillExtractor:
+    """Return the shared extractor, loading the taxonomy on first use"""
+    global _extractor
+    if _extractor is None:
+        _extractor = SkillExtractor.from_file(SKILLS_TAXONOMY_PATH)
+        logger.info(f"Loaded skills taxonomy: {len(_extractor.categories)} skills, {_extractor.terms} terms")
+    return _extractor
+
+
+def extract_skills(text: str, limit: Optional[int] = None) -> List[str]:
+    return get_extractor().extract(text, limit)
+
+
+def canonical_skill_names(skills: Iterable[str]) -> List[str]:
+    """Map free-form skill names onto taxonomy names ("ReactJS" -> "React"); unknown ones are case-folded"""
+    extractor = get_extractor()
+    names = set()
+    for skill in skills:
+        found = extractor.extract(str(skill), limit=1)
+        names.add(found[0] if found else " ".join(str(skill).casefold().split()))
+    return sorted(name for name in names if name)
@@ -0,0 +1,230 @@
+"""Local skill-gap analysis against a precomputed role -> required skills index.
+
+Rebuild the index after editing data/role_skills.json, from backend/:
+    python -m utils.skill_gap_engine
+"""
+import hashlib
+import json
+import logging
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.settings import ROLE_DATASET_PATH, ROLE_INDEX_PATH, SKILLS_TAXONOMY_PATH
+from utils.helpers import normalize_job_title
+from utils.skill_extractor import get_extractor
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC = b"SKLGAP01"
+_HEADER = struct.Struct("<8sIIII")  # magic, names blob, role offsets, group offsets, group skills
+
+# Title words that say how senior the role is, not which role it is
+SENIORITY_WORDS = {
+    "senior", "junior", "lead", "principal", "staff", "associate", "intern", "trainee", "entry", "level",
+    "mid", "head", "chief", "i", "ii", "iii", "iv", "1", "2", "3", "graduate", "experienced", "remote"
+}
+
+
+@dataclass(frozen=True)
+class SkillGap:
+    role: str
+    missing: List[Tuple[List[str], int]]  # (skill and its alternatives, weight 1-10), most important first
+    matched: List[str]
+    coverage: float  # share of the role's weighted requirements the resume already covers
+
+
+class RoleIndex:
+    """Weighted skill requirements per role, stored CSR-style in flat typed arrays.
+
+    Role ``r`` owns requirement groups ``role_offsets[r]:role_offsets[r + 1]``; group ``g``
+    is satisfied by any skill id in ``group_skills[group_offsets[g]:group_offsets[g + 1]]``
+    and weighs ``group_weights[g]``. The whole index is a few tens of KB and loads with
+    one read and four ``frombytes`` calls.
+    """
+
+    def __init__(self, roles: List[str], skills: List[str], titles: Dict[str, int], implies: Dict[str, List[int]],
+                 role_offsets: array, group_offsets: array, group_skills: array, group_weights: array,
+                 source_digest: str = ""):
+        self.source_digest = source_digest  # sha256 of the dataset the index was built from
+        self.roles = roles
+        self.skills = skills
+        self.titles = titles
+        self.implies = implies  # skill name -> ids of every skill it implies, transitively
+        self.role_offsets = role_offsets
+        self.group_offsets = group_offsets
+        self.group_skills = group_skills
+        self.group_weights = group_weights
+        self.skill_ids = {skill: i for i, skill in enumerate(skills)}
+        self._title_words = [(set(title.split()), role_id) for title, role_id in titles.items()]
+
+    @classmethod
+    def build(cls, dataset: dict, known_skills: Iterable[str], source_digest: str = "") -> "RoleIndex":
+        """Compile the role dataset; every skill must be a canonical taxonomy name"""
+        known = set(known_skills)
+        for name in [*dataset.get("implies", {}), *(skill for targets in dataset.get("implies", {}).values() for skill in targets)]:
+            if name not in known:
+                raise ValueError(f"implies: '{name}' is not a canonical skill in the taxonomy")
+        roles, skills, titles = [], [], {}
+        skill_ids: Dict[str, int] = {}
+        role_offsets, group_offsets = array("I", [0]), array("I", [0])
+        group_skills, group_weights = array("H"), array("B")
+        for role in dataset["roles"]:
+            role_id = len(roles)
+            roles.append(role["title"])
+            for title in [role["title"], *role.get("aliases", [])]:
+                key = normalize_job_title(title)
+                if titles.get(key, role_id) != role_id:
+                    raise ValueError(f"Title '{title}' is used by both {roles[titles[key]]} and {role['title']}")
+                titles[key] = role_id
+            for alternatives, weight in role["skills"]:
+                for skill in alternatives.split("|"):
+                    if skill not in known:
+                        raise ValueError(f"{role['title']}: '{skill}' is not a canonical skill in the taxonomy")
+                    if skill not in skill_ids:
+                        skill_ids[skill] = len(skills)
+                        skills.append(skill)
+                    group_skills.append(skill_ids[skill])
+                group_offsets.append(len(group_skills))
+                group_weights.append(weight)
+            role_offsets.append(len(group_weights))
+        implies = {}
+        for name in dataset.get("implies", {}):
+            closure, pending = set(), list(dataset["implies"][name])
+            while pending:
+                skill = pending.pop()
+                if skill not in closure:
+                    closure.add(skill)
+                    pending += dataset["implies"].get(skill, [])
+            # Only skills some role asks for matter at query time
+            ids = sorted(skill_ids[skill] for skill in closure if skill in skill_ids)
+            if ids:
+                implies[name] = ids
+        return cls(roles, skills, titles, implies, role_offsets, group_offsets, group_skills, group_weights, source_digest)
+
+    def to_bytes(self) -> bytes:
+        names = json.dumps({
+            "roles": self.roles, "skills": self.skills, "titles": self.titles, "implies": self.implies,
+            "source_digest": self.source_digest
+        }).encode("utf-8")
+        arrays = [self.role_offsets, self.group_offsets, self.group_skills, self.group_weights]
+        if sys.byteorder == "big":
+            arrays = [array(a.typecode, a) for a in arrays]
+            for a in arrays:
+                a.byteswap()
+        header = _HEADER.pack(INDEX_MAGIC, len(names), len(self.role_offsets), len(self.group_offsets), len(self.group_skills))
+        return header + names + b"".join(a.tobytes() for a in arrays)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RoleIndex":
+        magic, names_len, roles_len, groups_len, skills_len = _HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC:
+            raise ValueError("Not a role index file")
+        pos = _HEADER.size
+        names = json.loads(data[pos:pos + names_len])
+        pos += names_len
+        arrays = []
+        for typecode, length in (("I", roles_len), ("I", groups_len), ("H", skills_len), ("B", groups_len - 1)):
+            a = array(typecode)
+            end = pos + length * a.itemsize
+            a.frombytes(data[pos:end])
+            if sys.byteorder == "big":
+                a.byteswap()
+            arrays.append(a)
+            pos = end
+        return cls(names["roles"], names["skills"], names["titles"], names["implies"], *arrays, names["source_digest"])
+
+    def match_role(self, job_title: str) -> Optional[int]:
+        """Role id for a job title: exact title or alias, then without seniority words, then best word overlap"""
+        key = normalize_job_title(job_title)
+        if key in self.titles:
+            return self.titles[key]
+        words = {word for word in key.split() if word not in SENIORITY_WORDS}
+        stripped = " ".join(word for word in key.split() if word in words)
+        if stripped in self.titles:
+            return self.titles[stripped]
+        best, best_score = None, 0.49  # need at least half the words in common
+        for title_words, role_id in self._title_words:
+            score = len(words & title_words) / len(words | title_words) if words else 0
+            if score > best_score:
+                best, best_score = role_id, score
+        return best
+
+    def skill_gap(self, role_id: int, present: Iterable[str]) -> SkillGap:
+        present_ids = set()
+        for skill in present:
+            if skill in self.skill_ids:
+                present_ids.add(self.skill_ids[skill])
+            # Listing Django covers a Python requirement, PostgreSQL covers SQL
+            present_ids.update(self.implies.get(skill, ()))
+        missing, matched = [], []
+        covered = total = 0
+        for group in range(self.role_offsets[role_id], self.role_offsets[role_id + 1]):
+            ids = self.group_skills[self.group_offsets[group]:self.group_offsets[group + 1]]
+            weight = self.group_weights[group]
+            total += weight
+            hits = [skill_id for skill_id in ids if skill_id in present_ids]
+            if hits:
+                covered += weight
+                matched.append(self.skills[hits[0]])
+            else:
+                missing.append(([self.skills[skill_id] for skill_id in ids], weight))
+        # Stable sort keeps dataset order among equal weights
+        missing.sort(key=lambda entry: -entry[1])
+        return SkillGap(self.roles[role_id], missing, matched, covered / total if total else 1.0)
+
+
+def dataset_digest(dataset_path: str = ROLE_DATASET_PATH) -> str:
+    with open(dataset_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_index(dataset_path: str = ROLE_DATASET_PATH, taxonomy_path: str = SKILLS_TAXONOMY_PATH) -> RoleIndex:
+    with open(dataset_path, encoding="utf-8") as f:
+        dataset = json.load(f)
+    with open(taxonomy_path, encoding="utf-8") as f:
+        taxonomy = json.load(f)
+    known = {name.lstrip("~=") for entries in taxonomy["categories"].values() for name in entries}
+    return RoleIndex.build(dataset, known, dataset_digest(dataset_path))
+
+
+_index: Optional[RoleIndex] = None
+
+
+def get_role_index() -> RoleIndex:
+    """Return the shared index, loading the prebuilt file on first use"""
+    global _index
+    if _index is None:
+        try:
+            with open(ROLE_INDEX_PATH, "rb") as f:
+                index = RoleIndex.from_bytes(f.read())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read role index {ROLE_INDEX_PATH}: {str(e)}")
+            index = None
+        if index is None or index.source_digest != dataset_digest():
+            # Still answer, but the file should be rebuilt and committed with the dataset
+            logger.warning("Role index is missing or out of date with the dataset, building it in memory")
+            index = build_index()
+        _index = index
+        logger.info(f"Loaded role index: {len(_index.roles)} roles, {len(_index.skills)} skills")
+    return _index
+
+
+def local_skill_gap(extracted_text: str, job_title: str) -> Optional[SkillGap]:
+    """Skill gap from the role index, or None when the job title matches no known role"""
+    index = get_role_index()
+    role_id = index.match_role(job_title)
+    if role_id is None:
+        return None
+    return index.skill_gap(role_id, get_extractor().extract(extracted_text))
+
+
+if __name__ == "__main__":
+    index = build_index()
+    data = index.to_bytes()
+    with open(ROLE_INDEX_PATH, "wb") as f:
+        f.write(data)
+    print(f"Wrote {ROLE_INDEX_PATH}: {len(index.roles)} roles, {len(index.skills)} skills, "
+          f"{len(index.group_weights)} requirements, {len(data)} bytes")
@@ -0,0 +1,143 @@
+"""Normalize Gemini text answers: strip markdown emphasis and collapse whitespace.
+
+Output matches the old ``clean_gemini_response`` exactly, which the frontend's parsers
+rely on: bold pairs are removed first, then italic pairs in what is left.
+
+Benchmark against the old regex chain, from backend/:
+    python -m benchmarks.text_normalization
+"""
+import re
+from typing import Iterable, Iterator, List, Tuple
+
+_BOLD = re.compile(r"\*\*([^*]+)\*\*")
+_ITALIC = re.compile(r"\*([^*]+)\*")
+_STARS = re.compile(r"\*+")
+
+
+def collapse_whitespace(text: str) -> str:
+    """Runs of any whitespace, newlines included, become one space; ends are trimmed"""
+    return " ".join(text.split())
+
+
+def normalize_response(text: str) -> str:
+    """Clean a Gemini answer for display: emphasis markers removed, whitespace collapsed.
+
+    Two precompiled passes, skipped when the text has no '*', and one split/join
+    instead of four ``re.sub`` calls that each rescanned and copied the whole string.
+    """
+    if "*" in text:
+        text = _ITALIC.sub(r"\1", _BOLD.sub(r"\1", text))
+    return " ".join(text.split())
+
+
+def _plan(lengths: List[int], open_bold: bool, open_italic: bool, final: bool,
+          last_complete: bool) -> Tuple[List[int], int, bool, bool]:
+    """Stars each '*' run keeps after the bold then the italic pass, for the runs that can no longer change.
+
+    Runs are maximal stretches of '*', so a pair can only open on the last stars of one
+    run and close on the first stars of the next. ``open_bold``/``open_italic`` carry a
+    pair opened before the first run. Unless ``final``, a run's bold pass depends on the
+    length of the run after it, and its italic opener on some later run surviving the
+    bold pass, so the tail that still depends on unseen text is left unsettled.
+    Returns (kept stars of the settled runs, settled count, pair state entering the first unsettled run).
+    """
+    n = len(lengths)
+    kept, bold_state = [], []
+    for i, length in enumerate(lengths):
+        bold_state.append(open_bold)
+        if open_bold:
+            length -= 2
+        open_bold = length >= 2 and i + 1 < n and lengths[i + 1] >= 2
+        kept.append(length - 2 if open_bold else length)
+    bold_state.append(open_bold)
+
+    # Runs whose bold pass is final: the next run's length must be known too
+    fixed = n if final else max(0, n - 1 if last_complete else n - 2)
+    survivor_after, fixed_survivor_after = [False] * n, [False] * n
+    seen = seen_fixed = False
+    for i in range(n - 1, -1, -1):
+        survivor_after[i], fixed_survivor_after[i] = seen, seen_fixed
+        seen = seen or kept[i] > 0
+        seen_fixed = seen_fixed or (kept[i] > 0 and i < fixed)
+
+    for i in range(n):
+        if i >= fixed:
+            return kept[:i], i, bold_state[i], open_italic
+        if not kept[i]:
+            continue
+        stars = kept[i] - 1 if open_italic else kept[i]
+        if stars and not fixed_survivor_after[i] and not final:
+            return kept[:i], i, bold_state[i], open_italic
+        open_italic = stars >= 1 and survivor_after[i]
+        kept[i] = stars - 1 if open_italic else stars
+    return kept, n, bold_state[n], open_italic
+
+
+class StreamNormalizer:
+    """``normalize_response`` for text that arrives in chunks, emitting only settled output.
+
+    Text is held back from the first '*' run whose fate still depends on unseen text;
+    everything before it is cleaned once, so the work per chunk is proportional to the
+    chunk plus the held tail, not to the whole answer. The deltas add up to
+    ``normalize_response`` of the joined chunks.
+    """
+
+    def __init__(self):
+        self.raw: List[str] = []
+        self.pending = ""  # raw text from the first unsettled '*' run onward
+        self.open_bold = self.open_italic = False  # pairs opened in the settled text
+        self.started = False  # anything emitted yet
+        self.gap = False  # settled text ended in whitespace not emitted yet
+
+    def _collapse(self, text: str) -> str:
+        words = text.split()
+        if not words:
+            self.gap = self.gap or bool(text)
+            return ""
+        out = " ".join(words)
+        # Whitespace across a chunk boundary still collapses to one space, and never leads the output
+        if self.started and (self.gap or text[0].isspace()):
+            out = " " + out
+        self.started = True
+        self.gap = text[-1].isspace()
+        return out
+
+    def _settle(self, text: str, final: bool) -> str:
+        runs = [match.span() for match in _STARS.finditer(text)]
+        kept, settled, self.open_bold, self.open_italic = _plan(
+            [end - start for start, end in runs], self.open_bold, self.open_italic, final,
+            not text.endswith("*"))
+        boundary = runs[settled][0] if settled < len(runs) else len(text)
+        parts, pos = [], 0
+        for (start, end), stars in zip(runs, kept):
+            parts.append(text[pos:start + stars])
+            pos = end
+        parts.append(text[pos:boundary])
+        self.pending = text[boundary:]
+        return self._collapse("".join(parts))
+
+    def feed(self, chunk: str) -> str:
+        self.raw.append(chunk)
+        if "*" not in chunk:
+            if not self.pending:
+                return self._collapse(chunk)
+            if not self.pending.endswith("*"):
+                # No new run and no run completed, so nothing held can settle yet
+                self.pending += chunk
+                return ""
+        return self._settle(self.pending + chunk, final=False)
+
+    def finish(self) -> str:
+        return self._settle(self.pending, final=True) if self.pending else ""
+
+
+def normalize_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    """Generator form of ``StreamNormalizer``: yields each non-empty delta"""
+    normalizer = StreamNormalizer()
+    for chunk in chunks:
+        delta = normalizer.feed(chunk)
+        if delta:
+            yield delta
+    delta = normalizer.finish()
+    if delta:
+        yield delta
@@ -0,0 +1,265 @@
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import zipfile
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from fastapi import HTTPException, Request
+from python_multipart.multipart import MultipartParser, MultipartParseError, parse_options_header
+
+from config.settings import (
+    MAX_UPLOAD_BYTES,
+    MAX_CONCURRENT_UPLOADS,
+    UPLOAD_SPOOL_DIR,
+    PDF_RETRY_AFTER
+)
+from utils.metrics import pdf_bytes, stage
+
+logger = logging.getLogger(__name__)
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+@dataclass
+class SpooledFile:
+    """An uploaded file written straight to disk while it streamed in"""
+    filename: str
+    path: str
+    size: int = 0
+    sha256: str = ""
+
+    def cleanup(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+@dataclass
+class MultipartUpload:
+    fields: dict = field(default_factory=dict)
+    files: List[SpooledFile] = field(default_factory=list)
+
+    def cleanup(self):
+        for spooled in self.files:
+            spooled.cleanup()
+
+
+class UploadStats:
+    """Tracks concurrent uploads so spooling memory and disk use stay bounded and visible"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.bytes_in_flight = 0
+        self.peak_bytes_in_flight = 0
+        self.rejected_too_large = 0
+        self.rejected_busy = 0
+
+    def add_bytes(self, count: int):
+        self.bytes_in_flight += count
+        self.peak_bytes_in_flight = max(self.peak_bytes_in_flight, self.bytes_in_flight)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "bytes_in_flight": self.bytes_in_flight,
+            "peak_bytes_in_flight": self.peak_bytes_in_flight,
+            "rejected_too_large": self.rejected_too_large,
+            "rejected_busy": self.rejected_busy
+        }
+
+
+upload_stats = UploadStats()
+
+
+class _SpoolingParser:
+    """Multipart callbacks that hash and spool file parts to disk chunk by chunk"""
+
+    def __init__(self, max_file_bytes: int, max_total_bytes: int, max_files: int):
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self.max_files = max_files
+        self.upload = MultipartUpload()
+        self.total = 0
+        self._headers = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._name = ""
+        self._file = None
+        self._spooled: Optional[SpooledFile] = None
+        self._hash = None
+        self._value = bytearray()
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end
+        }
+
+    def on_part_begin(self):
+        self._headers = {}
+        self._value = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition"))
+        self._name = options.get(b"name", b"").decode("latin-1")
+        filename = options.get(b"filename")
+        if filename is None:
+            return
+        if len(self.upload.files) >= self.max_files:
+            raise UploadTooLarge(f"Too many files (max {self.max_files})")
+        fd, path = tempfile.mkstemp(prefix="upload-", suffix=".pdf", dir=UPLOAD_SPOOL_DIR or None)
+        self._file = os.fdopen(fd, "wb")
+        self._spooled = SpooledFile(filename=filename.decode("utf-8", "replace"), path=path)
+        self._hash = hashlib.sha256()
+        self.upload.files.append(self._spooled)
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        # A view avoids copying each chunk again before it is hashed and written
+        chunk = memoryview(data)[start:end]
+        self.total += len(chunk)
+        if self.total > self.max_total_bytes:
+            raise UploadTooLarge(f"Upload too large (max {self.max_total_bytes // (1024 * 1024)}MB)")
+        if self._file is None:
+            self._value += chunk
+            return
+        self._spooled.size += len(chunk)
+        if self._spooled.size > self.max_file_bytes:
+            raise UploadTooLarge(f"File size too large (max {self.max_file_bytes // (1024 * 1024)}MB)")
+        self._hash.update(chunk)
+        self._file.write(chunk)
+
+    def on_part_end(self):
+        if self._file is not None:
+            self._file.close()
+            self._spooled.sha256 = self._hash.hexdigest()
+            self._file = None
+            self._spooled = None
+        else:
+            self.upload.fields[self._name] = self._value.decode("utf-8", "replace")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+async def stream_multipart(request: Request, max_file_bytes: int = MAX_UPLOAD_BYTES,
+                           max_files: int = 1, max_total_bytes: Optional[int] = None) -> MultipartUpload:
+    """Parse a multipart body as it streams in, spooling file parts to disk.
+
+    Size limits are enforced per chunk, so an oversized upload is rejected with 413
+    as soon as it crosses the limit instead of after the whole body is buffered.
+    Chunks are parsed and written in a worker thread, one at a time.
+    The caller owns the returned upload and must call ``cleanup()``.
+    """
+    max_total_bytes = max_total_bytes or max_file_bytes + 64 * 1024
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_total_bytes:
+        upload_stats.rejected_too_large += 1
+        raise HTTPException(status_code=413, detail=f"Upload too large (max {max_total_bytes // (1024 * 1024)}MB)")
+
+    if upload_stats.in_flight >= MAX_CONCURRENT_UPLOADS:
+        upload_stats.rejected_busy += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Too many uploads in progress, please retry shortly",
+            headers={"Retry-After": str(PDF_RETRY_AFTER)}
+        )
+
+    spooler = _SpoolingParser(max_file_bytes, max_total_bytes, max_files)
+    parser = MultipartParser(options[b"boundary"], spooler.callbacks())
+    received = 0
+    upload_stats.in_flight += 1
+    try:
+        with stage("upload"):
+            async for chunk in request.stream():
+                received += len(chunk)
+                upload_stats.add_bytes(len(chunk))
+                # The callbacks hash and write to the spool file; keep that disk I/O off the event loop
+                await asyncio.to_thread(parser.write, chunk)
+            await asyncio.to_thread(parser.finalize)
+        for file in spooler.upload.files:
+            if file.filename.lower().endswith(".pdf"):
+                pdf_bytes.observe(file.size)
+        return spooler.upload
+    except UploadTooLarge as e:
+        upload_stats.rejected_too_large += 1
+        spooler.close()
+        spooler.upload.cleanup()
+        raise HTTPException(status_code=413, detail=str(e))
+    except MultipartParseError:
+        spooler.close()
+        spooler.upload.cleanup()
+        raise HTTPException(status_code=400, detail="Malformed multipart upload")
+    except Exception:
+        spooler.close()
+        spooler.upload.cleanup()
+        raise
+    finally:
+        upload_stats.in_flight -= 1
+        upload_stats.bytes_in_flight -= received
+
+
+def unpack_zip(archive: SpooledFile, max_files: int, max_total_bytes: int) -> List[SpooledFile]:
+    """Spool each PDF member of an uploaded zip to its own file.
+
+    Sizes are counted from the bytes actually inflated, not the archive headers, so a
+    zip bomb stops at ``max_total_bytes``. Blocking; run it in a thread.
+    """
+    spooled_files: List[SpooledFile] = []
+    total = 0
+    try:
+        with zipfile.ZipFile(archive.path) as bundle:
+            members = [
+                info for info in bundle.infolist()
+                if not info.is_dir()
+                and info.filename.lower().endswith(".pdf")
+                and not info.filename.startswith("__MACOSX/")
+            ]
+            if len(members) > max_files:
+                raise UploadTooLarge(f"Too many files (max {max_files})")
+            for info in members:
+                fd, path = tempfile.mkstemp(prefix="upload-", suffix=".pdf", dir=UPLOAD_SPOOL_DIR or None)
+                spooled = SpooledFile(filename=os.path.basename(info.filename), path=path)
+                spooled_files.append(spooled)
+                digest = hashlib.sha256()
+                with os.fdopen(fd, "wb") as out, bundle.open(info) as member:
+                    while chunk := member.read(64 * 1024):
+                        total += len(chunk)
+                        if total > max_total_bytes:
+                            raise UploadTooLarge(f"Upload too large (max {max_total_bytes // (1024 * 1024)}MB)")
+                        spooled.size += len(chunk)
+                        digest.update(chunk)
+                        out.write(chunk)
+                spooled.sha256 = digest.hexdigest()
+        return spooled_files
+    except Exception:
+        for spooled in spooled_files:
+            spooled.cleanup()
+        raise
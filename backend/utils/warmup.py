@@ -0,0 +1,91 @@
+"""Background startup: everything slow the app needs runs after it starts serving.
+
+The lifespan starts ``warmup.run()`` as a task and returns at once, so /health answers
+right after the process boots. Steps run in order; a failed step is logged and the
+rest still run, since each one only moves a cost from the first request to startup.
+/ready answers 503 until the steps are done, for load balancers and rolling restarts.
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from utils import gemini_client, search_client
+from utils.job_matcher import get_role_matcher
+from utils.lazy import load_all
+from utils.pdf_pool import pdf_pool
+from utils.semantic_cache import semantic_cache
+from utils.skill_extractor import get_extractor
+
+logger = logging.getLogger(__name__)
+
+Step = Tuple[str, Callable[[], Awaitable]]
+
+
+def _in_thread(fn: Callable) -> Callable[[], Awaitable]:
+    # Imports and index loads hold the GIL in bursts but leave the event loop free to serve
+    return lambda: asyncio.to_thread(fn)
+
+
+class WarmUp:
+    """Runs the startup steps once and reports their progress"""
+
+    def __init__(self):
+        self.status = "pending"
+        self.seconds: Dict[str, float] = {}
+        self.failed: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "done"
+
+    def steps(self, semantic_cache_enabled: bool, warm_up_enabled: bool) -> List[Step]:
+        steps: List[Step] = []
+        if semantic_cache_enabled:
+            steps.append(("semantic_cache", _in_thread(semantic_cache.open)))
+        if warm_up_enabled:
+            # With a process pool only the PDF workers extract, so PyMuPDF stays out of this process
+            skip = ("fitz",) if pdf_pool.workers > 0 else ()
+            steps += [
+                ("imports", _in_thread(lambda: load_all(exclude=skip))),
+                ("skill_index", _in_thread(lambda: (get_extractor(), get_role_matcher()))),
+                ("pdf_pool", pdf_pool.warm),
+                ("connections", lambda: asyncio.gather(gemini_client.warm_up(), search_client.warm_up()))
+            ]
+        return steps
+
+    async def _run(self, steps: List[Step]):
+        self.status = "running"
+        started = time.perf_counter()
+        for name, step in steps:
+            step_started = time.perf_counter()
+            try:
+                await step()
+            except Exception as e:
+                self.failed.append(name)
+                logger.warning(f"Warm-up step {name} failed: {str(e)}")
+            self.seconds[name] = round(time.perf_counter() - step_started, 3)
+        self.status = "done"
+        logger.info(f"Warm-up finished in {time.perf_counter() - started:.2f}s: {self.seconds}")
+
+    def start(self, semantic_cache_enabled: bool, warm_up_enabled: bool):
+        self._task = asyncio.create_task(self._run(self.steps(semantic_cache_enabled, warm_up_enabled)))
+
+    async def stop(self, timeout: float):
+        """Give a warm-up still running at shutdown ``timeout`` seconds, then cancel it.
+
+        Waiting first keeps a threaded step (opening the semantic cache files) from
+        racing the shutdown that closes them.
+        """
+        if self._task is None or self._task.done():
+            return
+        await asyncio.wait([self._task], timeout=timeout)
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {"status": self.status, "seconds": dict(self.seconds), "failed": list(self.failed)}
+
+
+warmup = WarmUp()
@@ -64,10 +64,58 @@ const Results = () => {
     formData.append("file", fileObj);
     formData.append("job_title", jobTitle);
 
-    // Start all API calls
-    analyzeResume(formData, jobTitle);
-    fetchCourses(jobTitle);
-    fetchVideos(jobTitle);
+    // One round trip for every section; fall back to per-section calls if it fails
+    try {
+      await analyzeFull(formData, jobTitle);
+    } catch (error) {
+      analyzeResume(formData, jobTitle);
+      fetchCourses(jobTitle);
+      fetchVideos(jobTitle);
+    }
+  };
+
+  const analyzeFull = async (formData, jobTitle) => {
+    const response = await fetch(API_ENDPOINTS.ANALYZE_FULL, {
+      method: "POST",
+      body: formData,
+    });
+
+    if (!response.ok) throw new Error(`Full analysis failed: ${response.status}`);
+
+    const { sections } = await response.json();
+    const skillsList = skillsFromAnalysis(sections.skill_gap.data);
+    const courseList = sections.courses.data?.courses || [];
+
+    setMissingSkills(skillsList);
+    setExtractedText(sections.skill_gap.data?.extracted_text || "");
+    setJobRecommendations(
+      sections.job_matching.data?.structured?.jobs ||
+        sections.job_matching.data?.job_recommendations ||
+        ""
+    );
+    setProjectIdeas(
+      sections.projects.data?.structured?.projects ||
+        sections.projects.data?.project_ideas ||
+        ""
+    );
+    setCourses(
+      courseList.length > 0
+        ? courseList
+        : generateEnhancedFallbackCourses(skillsList, jobTitle)
+    );
+    setVideos(sections.videos.data?.videos || []);
+    setErrors({
+      jobs: sections.job_matching.data ? null : "Failed to load job recommendations",
+      projects: sections.projects.data ? null : "Failed to load project ideas",
+      videos: sections.videos.data ? null : "Failed to load videos",
+    });
+    setLoadingStates({
+      skills: false,
+      courses: false,
+      videos: false,
+      jobs: false,
+      projects: false,
+    });
   };
 
   const analyzeResume = async (formData, jobTitle) => {
@@ -80,7 +128,7 @@ const Results = () => {
       if (!response.ok) throw new Error("Resume analysis failed");
 
       const data = await response.json();
-      const skillsList = parseSkillsResponse(data.missing_skills);
+      const skillsList = skillsFromAnalysis(data);
       const extractedText = data.extracted_text || "";
 
       setMissingSkills(skillsList);
@@ -96,6 +144,12 @@ const Results = () => {
     }
   };
 
+  // Structured answers need no parsing; the text fields are kept for older backends
+  const skillsFromAnalysis = (data) =>
+    data?.structured?.missing_skills
+      ? data.structured.missing_skills.map((item) => item.skill)
+      : parseSkillsResponse(data?.missing_skills);
+
   const parseSkillsResponse = (response) => {
     if (!response || typeof response !== "string") return [];
 
@@ -112,12 +166,13 @@ const Results = () => {
       cleanedResponse.includes("-")
     ) {
       skills = cleanedResponse
-        .split(/[•*-]\s*/)
+        // Only a marker standing alone starts a bullet, so "scikit-learn" stays one skill
+        .split(/(?:^|\s)[•*-]\s+/)
         .map((skill) => skill.trim())
         .filter((skill) => skill.length > 0)
         .map((skill) =>
           skill
-            .replace(/:\s*.*$/, "")
+            .split(": ")[0]
             .replace(/\.$/, "")
             .trim()
         )
@@ -201,7 +256,7 @@ const Results = () => {
         throw new Error(`Job matching failed: ${response.status}`);
 
       const data = await response.json();
-      setJobRecommendations(data.job_recommendations);
+      setJobRecommendations(data.structured?.jobs || data.job_recommendations);
       setLoadingStates((prev) => ({ ...prev, jobs: false }));
     } catch (error) {
       setErrors((prev) => ({
@@ -223,7 +278,7 @@ const Results = () => {
       if (!response.ok) throw new Error("Project generation failed");
 
       const data = await response.json();
-      setProjectIdeas(data.project_ideas);
+      setProjectIdeas(data.structured?.projects || data.project_ideas);
       setLoadingStates((prev) => ({ ...prev, projects: false }));
     } catch (error) {
       setErrors((prev) => ({
@@ -234,7 +289,18 @@ const Results = () => {
     }
   };
 
+  const truncate = (value, limit) =>
+    value.length > limit ? value.substring(0, limit) + "..." : value;
+
   const formatJobRecommendations = (text) => {
+    if (Array.isArray(text)) {
+      return text.map((job) => ({
+        title: job.title,
+        description: truncate(job.description, 300),
+        skills: truncate(job.key_skills.join(", "), 200),
+        careerPath: truncate(job.career_path, 200),
+      }));
+    }
     if (!text || typeof text !== "string") return [];
 
     // Split by numbered sections (1., 2., 3., etc.)
@@ -295,6 +361,15 @@ const Results = () => {
   };
 
   const formatProjectIdeas = (text) => {
+    if (Array.isArray(text)) {
+      return text.map((project) => ({
+        title: truncate(project.title, 80),
+        description: truncate(project.description, 250),
+        skills: truncate(project.skills.join(", "), 150),
+        impact: truncate(project.impact, 150),
+        difficulty: project.difficulty,
+      }));
+    }
     if (!text || typeof text !== "string") return [];
 
     const projectSections = text.split(/\d+\.\s+/);
@@ -57,6 +57,7 @@ if (import.meta.env.VITE_ENVIRONMENT !== "production") {
 export const API_ENDPOINTS = Object.freeze({
   // Main backend endpoints
   ANALYZE_RESUME: `${API_BASE_URL}/analyze_resume/`,
+  ANALYZE_FULL: `${API_BASE_URL}/analyze/full`,
   FETCH_COURSES: `${API_BASE_URL}/fetch_courses/`,
   YOUTUBE_COURSES: `${API_BASE_URL}/youtube-courses/`,
   JOB_MATCHING: `${API_BASE_URL}/job_matching/`,